@@ -0,0 +1,90 @@
+"""
+compares the cold read latency of plain and compressed (.gz, .bz2, .xz) MAUS files on the local disk.
+The test data are rather small, so a large MAUS is created by repeating the lines of a real one.
+Before every read, the file is dropped from the page cache (posix_fadvise(DONTNEED), Linux only), so that it is
+actually read from the disk. The MAUS s are loaded by a FileBasedMausProvider; its metrics callback reports the load
+split into reading (+decompressing), JSON parsing and schema loading.
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+import os
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from maus.edifact import EdifactFormat, EdifactFormatVersion
+from maus.maus_provider import FileBasedMausProvider, MausProviderEvent
+
+_MAUS_PATH = Path(__file__).parent.parent / "tests" / "unit_tests" / "ahbs" / "FV2204" / "IFTSTA" / "21035_maus.json"
+_REPETITIONS = 100  # of the lines of the MAUS
+_RUNS = 10
+
+_compressors: Dict[str, Callable[[bytes], bytes]] = {
+    "": lambda data: data,
+    ".gz": gzip.compress,
+    ".bz2": bz2.compress,
+    ".xz": lzma.compress,
+}
+
+
+class _SingleFileMausProvider(FileBasedMausProvider):
+    """
+    returns the same file for every MAUS
+    """
+
+    def __init__(self, file_path: Path, metrics_callback: Callable[[MausProviderEvent], None]):
+        super().__init__(base_path=file_path.parent, metrics_callback=metrics_callback)
+        self._file_name = file_path.name
+
+    def to_path(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Path:
+        return Path(self._file_name)
+
+
+def _drop_from_page_cache(file_path: Path) -> None:
+    file_descriptor = os.open(file_path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(file_descriptor, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(file_descriptor)
+
+
+def main() -> None:
+    if not sys.platform.startswith("linux"):
+        raise OSError("This benchmark requires Linux")
+    maus_dict = json.loads(_MAUS_PATH.read_text(encoding="utf-8"))
+    maus_dict["lines"] = maus_dict["lines"] * _REPETITIONS
+    plain_content = json.dumps(maus_dict).encode("utf-8")
+    print(f"MAUS with {len(maus_dict['lines'])} lines, {_RUNS} cold reads each; median in ms")
+    print(f"{'file':<22}{'size/KiB':>10}{'read':>10}{'parse':>10}{'schema':>10}{'total':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for compression_suffix, compress in _compressors.items():
+            file_path = Path(temp_dir) / f"21035_maus.json{compression_suffix}"
+            file_path.write_bytes(compress(plain_content))
+            os.sync()
+            events: List[MausProviderEvent] = []
+            provider = _SingleFileMausProvider(file_path, events.append)
+            for _ in range(_RUNS):
+                _drop_from_page_cache(file_path)
+                assert provider.get_maus(EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035") is not None
+            all_timings = [event.timings for event in events if event.timings is not None]
+            assert len(all_timings) == _RUNS
+            read_times = [timings.file_read_seconds for timings in all_timings]
+            parse_times = [timings.json_parse_seconds for timings in all_timings]
+            schema_times = [timings.schema_load_seconds for timings in all_timings]
+            medians = [1000 * statistics.median(times) for times in (read_times, parse_times, schema_times)]
+            print(
+                f"{file_path.name:<22}{file_path.stat().st_size / 1024:>10.1f}"
+                + "".join(f"{median:>10.1f}" for median in medians)
+                + f"{sum(medians):>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+compares sorting the lines of a (large) flat AHB by segment groups using a linear sg_order.index(...) lookup per line
+(as it used to be) with the cached line index of the FlatAnwendungshandbuch. Both variants include assigning the
+unsorted lines (which validates them) first.
+"""
+
+import timeit
+from pathlib import Path
+from typing import List, Optional
+
+import attrs
+
+from maus.models.anwendungshandbuch import AhbLine, FlatAnwendungshandbuch
+from maus.reader.flat_ahb_reader import FlatAhbCsvReader
+
+_CSV_PATH = Path(__file__).parent.parent / "tests" / "unit_tests" / "ahbs" / "FV2204" / "UTILMD" / "11042.csv"
+
+
+def _sort_with_list_index(lines: List[AhbLine], sg_order: List[Optional[str]]) -> List[AhbLine]:
+    result: List[AhbLine] = sorted(lines, key=lambda x: x.segment_group_key or "")
+    result.sort(key=lambda ahb_line: sg_order.index(ahb_line.segment_group_key))
+    return result
+
+
+def _get_segment_groups_with_list_membership(lines: List[AhbLine]) -> List[Optional[str]]:
+    result: List[Optional[str]] = []
+    for line in lines:
+        if line.segment_group_key not in result:
+            result.append(line.segment_group_key)
+    return result
+
+
+def main() -> None:
+    """
+    sorts flat AHBs that consist of the 11042 lines repeated multiple times (with distinct segment group keys per copy)
+    """
+    original = FlatAhbCsvReader(_CSV_PATH).to_flat_ahb()
+    for copies in [1, 10, 50]:
+        lines: List[AhbLine] = []
+        for copy_number in range(copies):
+            for line in original.lines:
+                segment_group_key = line.segment_group_key
+                if segment_group_key is not None:
+                    segment_group_key = f"SG{int(segment_group_key[2:]) + 100 * copy_number}"
+                lines.append(attrs.evolve(line, segment_group_key=segment_group_key))
+        flat_ahb = FlatAnwendungshandbuch(meta=original.meta, lines=lines)
+
+        def old() -> None:
+            flat_ahb.lines = lines
+            flat_ahb.lines = _sort_with_list_index(flat_ahb.lines, _get_segment_groups_with_list_membership(lines))
+
+        def new() -> None:
+            flat_ahb.lines = lines  # resets the cached index, so that the time to build it is included
+            flat_ahb.sort_lines_by_segment_groups()
+
+        old()
+        expected_lines = flat_ahb.lines
+        new()
+        assert flat_ahb.lines == expected_lines
+        old_seconds = min(timeit.repeat(old, number=5, repeat=3)) / 5
+        new_seconds = min(timeit.repeat(new, number=5, repeat=3)) / 5
+        print(
+            f"{len(lines):7} lines, {len(flat_ahb.get_segment_groups()):4} segment groups: "
+            f"list index: {1000 * old_seconds:8.2f}ms, line index: {1000 * new_seconds:8.2f}ms "
+            f"({old_seconds / new_seconds:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+measures the overhead of the metrics callback of the MausProviders. Both requests are made through the public API:
+- a cache hit of a CachingMausProvider (the cheapest request, so the overhead is most visible)
+- a MAUS that is loaded from the file by a FileBasedMausProvider
+Every request is measured without a callback and with a MausMetricsRegistry as callback.
+"""
+
+import timeit
+from pathlib import Path
+from typing import Optional
+
+from maus.edifact import EdifactFormat, EdifactFormatVersion
+from maus.maus_provider import CachingMausProvider, FileBasedMausProvider, MausProvider
+from maus.metrics import MausMetricsRegistry
+
+_TEST_DATA = Path(__file__).parent.parent / "tests" / "unit_tests" / "ahbs"
+_KEY = (EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035")
+_CACHE_HITS = 100_000
+_LOADS = 20
+
+
+class _TestDataMausProvider(FileBasedMausProvider):
+    """
+    returns the MAUS files of the test data (which are stored below "FV2204")
+    """
+
+    def to_path(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Path:
+        return Path(f"FV2204/{edifact_format}/{pruefidentifikator}_maus.json")
+
+
+def _measure_microseconds(provider: MausProvider, number: int) -> float:
+    """
+    returns the best time of a single get_maus call (in microseconds)
+    """
+    assert provider.get_maus(*_KEY) is not None
+    return min(timeit.repeat(lambda: provider.get_maus(*_KEY), number=number, repeat=5)) / number * 1_000_000
+
+
+def _create_caching_provider(metrics: Optional[MausMetricsRegistry]) -> MausProvider:
+    return CachingMausProvider(_TestDataMausProvider(_TEST_DATA, metrics_callback=metrics), metrics_callback=metrics)
+
+
+def _create_file_based_provider(metrics: Optional[MausMetricsRegistry]) -> MausProvider:
+    return _TestDataMausProvider(_TEST_DATA, metrics_callback=metrics)
+
+
+def main() -> None:
+    print(f"{'request':<12}{'no callback/us':>16}{'metrics/us':>14}{'overhead/us':>14}")
+    for name, create_provider, number in [
+        ("cache hit", _create_caching_provider, _CACHE_HITS),
+        ("file load", _create_file_based_provider, _LOADS),
+    ]:
+        without_callback = _measure_microseconds(create_provider(None), number)
+        with_callback = _measure_microseconds(create_provider(MausMetricsRegistry()), number)
+        print(f"{name:<12}{without_callback:>16.2f}{with_callback:>14.2f}{with_callback - without_callback:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+compares the memory that forked worker processes use privately (i.e. not shared with the master process) when the MAUS s
+are loaded in the master process before the fork
+- as regular python objects
+- as regular python objects and the garbage collector is frozen (gc.freeze) before the fork
+- in a SharedMausStore (one bytes buffer with the binary MAUS s), accessed through a reader
+- in a SharedMausStore, accessed through a SharedMausStoreProvider (with and without caching the deserialized MAUS s)
+Every worker "serves a request" for each MAUS once (it looks up a discriminator in every MAUS).
+Linux only (reads /proc/self/smaps_rollup).
+"""
+
+import gc
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict
+
+from maus.edifact import EdifactFormat, EdifactFormatVersion
+from maus.maus_provider import MausKey
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuch, DeepAnwendungshandbuchSchema
+from maus.shared_maus_store import SharedMausStore, SharedMausStoreProvider, freeze_before_fork
+
+_TEST_DATA = Path(__file__).parent.parent / "tests" / "unit_tests" / "ahbs" / "FV2204"
+_NUMBER_OF_COPIES = 50  # the test data are small, so we pretend there were many more pruefis
+_NUMBER_OF_WORKERS = 4
+
+
+def _load_maus_by_key() -> Dict[MausKey, DeepAnwendungshandbuch]:
+    result: Dict[MausKey, DeepAnwendungshandbuch] = {}
+    for edifact_format, file_name in [
+        (EdifactFormat.IFTSTA, "21035_maus.json"),
+        (EdifactFormat.REQOTE, "35001_maus.json"),
+    ]:
+        maus_dict = json.loads((_TEST_DATA / str(edifact_format) / file_name).read_text(encoding="utf-8"))
+        for copy_number in range(_NUMBER_OF_COPIES):
+            # load every copy separately, so that they do not share any objects
+            key = (edifact_format, EdifactFormatVersion.FV2210, f"{file_name[:5]}_{copy_number}")
+            result[key] = DeepAnwendungshandbuchSchema().load(maus_dict)
+    return result
+
+
+def _private_kib() -> int:
+    """returns the memory that is private to this process (Private_Clean + Private_Dirty) in KiB"""
+    private = 0
+    with open("/proc/self/smaps_rollup", "r", encoding="ascii") as smaps:
+        for line in smaps:
+            if line.startswith("Private_"):
+                private += int(line.split()[1])
+    return private
+
+
+def _run_workers(name: str, serve_request: Callable[[], None]) -> None:
+    read_end, write_end = os.pipe()
+    worker_pids = []
+    for _ in range(_NUMBER_OF_WORKERS):
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            before = _private_kib()
+            serve_request()
+            gc.collect()  # a worker runs the garbage collector sooner or later anyway
+            os.write(write_end, f"{before} {_private_kib()}\n".encode("ascii"))
+            os._exit(0)  # pylint:disable=protected-access
+        worker_pids.append(pid)
+    os.close(write_end)
+    for pid in worker_pids:
+        os.waitpid(pid, 0)
+    with os.fdopen(read_end, "r", encoding="ascii") as results:
+        increases = [int(after) - int(before) for before, after in (line.split() for line in results)]
+    print(f"{name:<40} private memory increase per worker: {sum(increases) / len(increases) / 1024:7.1f} MiB")
+
+
+def main() -> None:
+    if not sys.platform.startswith("linux"):
+        raise OSError("This benchmark requires Linux")
+    maus_by_key = _load_maus_by_key()
+    keys = list(maus_by_key.keys())
+    print(f"{len(keys)} MAUS s, {_NUMBER_OF_WORKERS} workers")
+
+    def serve_from_objects() -> None:
+        for key in keys:
+            maus_by_key[key].find_segment_groups(lambda segment_group: segment_group.discriminator == "SG4")
+
+    _run_workers("python objects", serve_from_objects)
+    freeze_before_fork()
+    _run_workers("python objects + gc.freeze", serve_from_objects)
+    gc.unfreeze()
+
+    store = SharedMausStore.build(maus_by_key)
+    print(f"size of the shared store: {len(store._buffer) / 1024 / 1024:.1f} MiB")  # pylint:disable=protected-access
+    del maus_by_key
+    gc.collect()
+
+    def serve_from_store() -> None:
+        for key in keys:
+            reader = store.get_reader(key)
+            assert reader is not None
+            reader.find_by_discriminator("SG4")
+
+    freeze_before_fork()
+    _run_workers("shared store (reader)", serve_from_store)
+
+    for cache_deserialized_maus in [False, True]:
+        provider = SharedMausStoreProvider(store, cache_deserialized_maus=cache_deserialized_maus)
+
+        def serve_from_provider() -> None:
+            for _ in range(2):  # the second request for the same MAUS is served from the cache (if any)
+                for key in keys:
+                    maus = provider.get_maus(*key)  # pylint:disable=cell-var-from-loop
+                    assert maus is not None
+                    maus.find_segment_groups(lambda segment_group: segment_group.discriminator == "SG4")
+
+        freeze_before_fork()
+        _run_workers(f"shared store (provider, cache={cache_deserialized_maus})", serve_from_provider)
+
+
+if __name__ == "__main__":
+    main()
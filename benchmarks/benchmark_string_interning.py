@@ -0,0 +1,113 @@
+"""
+measures how much memory the interning of the repetitive strings (ahb expressions, meanings, section names...) saves
+in the MAUS s and flat AHBs of the test data.
+Every file is loaded twice, each time in a fresh interpreter (so that no string has been interned before): once as
+usual and once with interning disabled (sys.intern patched to the identity while loading). For both loads it reports
+- the memory of the distinct string objects that are referenced by the loaded object (CPython shares some strings,
+  e.g. single characters, even without interning; those are counted only once in both cases)
+- the memory that the loaded object retains in total (measured with tracemalloc)
+"""
+
+import gc
+import json
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+from unittest import mock
+
+import attrs
+
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuchSchema, FlatAnwendungshandbuchSchema
+from maus.reader.flat_ahb_reader import FlatAhbCsvReader
+
+_TEST_DATA = Path(__file__).parent.parent / "tests" / "unit_tests" / "ahbs"
+
+
+def _iter_string_attributes(obj: Any) -> Iterator[str]:
+    """yields the values of all string attributes of obj and its (nested) attrs sub objects"""
+    for field in attrs.fields(obj.__class__):
+        value = getattr(obj, field.name)
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if attrs.has(item.__class__):
+                    yield from _iter_string_attributes(item)
+        elif attrs.has(value.__class__):
+            yield from _iter_string_attributes(value)
+
+
+_SCHEMAS = {"maus": DeepAnwendungshandbuchSchema, "flat": FlatAnwendungshandbuchSchema}
+
+
+def _load_and_measure(kind: str, json_path: Path, intern: bool) -> Tuple[int, int]:
+    """
+    loads the file with the schema of the given kind (in this process)
+    :return: the bytes of the distinct string objects and the total bytes retained by the loaded object
+    """
+    json_string = json_path.read_text(encoding="utf-8")
+    schema = _SCHEMAS[kind]()
+    gc.collect()
+    tracemalloc.start()
+    if intern:
+        loaded = schema.loads(json_string)
+    else:
+        with mock.patch("sys.intern", lambda value: value):
+            loaded = schema.loads(json_string)
+    gc.collect()
+    retained_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    distinct_strings = {id(value): sys.getsizeof(value) for value in _iter_string_attributes(loaded)}
+    return sum(distinct_strings.values()), retained_bytes
+
+
+def _measure_in_subprocess(kind: str, json_path: Path, intern: bool) -> Tuple[int, int]:
+    arguments = [sys.executable, __file__, kind, str(json_path), "intern" if intern else "no-intern"]
+    strings, retained = json.loads(subprocess.check_output(arguments, text=True))
+    return strings, retained
+
+
+def _report(name: str, kind: str, json_path: Path, totals: Dict[str, int]) -> None:
+    strings_without, retained_without = _measure_in_subprocess(kind, json_path, intern=False)
+    strings_with, retained_with = _measure_in_subprocess(kind, json_path, intern=True)
+    totals["strings_without"] += strings_without
+    totals["strings_with"] += strings_with
+    totals["retained_without"] += retained_without
+    totals["retained_with"] += retained_with
+    print(
+        f"{name:<30} strings: {strings_without / 1024:8.1f}KiB ➡ {strings_with / 1024:8.1f}KiB, "
+        f"total: {retained_without / 1024:8.1f}KiB ➡ {retained_with / 1024:8.1f}KiB"
+    )
+
+
+def main() -> None:
+    """
+    loads every MAUS and flat AHB of the test data with and without interning and compares the memory
+    """
+    totals = {"strings_without": 0, "strings_with": 0, "retained_without": 0, "retained_with": 0}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for maus_path in sorted(_TEST_DATA.glob("**/*_maus.json")):
+            try:
+                DeepAnwendungshandbuchSchema().loads(maus_path.read_text(encoding="utf-8"))
+            except ValueError:
+                continue  # some of the old test files are not valid anymore
+            _report(f"MAUS {maus_path.name}", "maus", maus_path, totals)
+        for csv_path in sorted(_TEST_DATA.glob("**/*.csv")):
+            flat_ahb_path = Path(temp_dir) / f"{csv_path.stem}.json"
+            flat_ahb_path.write_text(
+                FlatAnwendungshandbuchSchema().dumps(FlatAhbCsvReader(csv_path).to_flat_ahb()), encoding="utf-8"
+            )
+            _report(f"flat AHB {csv_path.name}", "flat", flat_ahb_path, totals)
+    for kind in ["strings", "retained"]:
+        without, with_ = totals[f"{kind}_without"], totals[f"{kind}_with"]
+        print(f"{kind}: {(without - with_) / 1024:.1f}KiB saved ({100 * (without - with_) / without:.1f}%)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4:
+        print(json.dumps(_load_and_measure(sys.argv[1], Path(sys.argv[2]), sys.argv[3] == "intern")))
+    else:
+        main()
@@ -0,0 +1,73 @@
+"""
+compares the Earley parser (which has been created when the module was imported) with the lazily created LALR parser
+for .tree files. It measures
+- the import time of the tree_to_sgh module (in a fresh interpreter)
+- the time it takes to create the parsers (the LALR parser with and without the opt-in grammar cache of lark)
+- the parse time for the test .tree files and for a large .tree (the lines of the test files repeated)
+It first checks that both parsers return the same tree for every input.
+"""
+
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Dict
+
+from lark import Lark
+
+from maus.reader.tree_to_sgh import GRAMMAR, get_tree_parser
+
+_TEST_DATA = Path(__file__).parent.parent / "tests" / "unit_tests"
+_REPETITIONS = 50  # of the segment group lines, for the large .tree
+
+
+def _measure_import_seconds(statement: str, runs: int = 5) -> float:
+    """
+    returns the median time it takes a fresh interpreter to run the statement (minus the interpreter start up)
+    """
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    durations = [float(subprocess.check_output([sys.executable, "-c", code], text=True)) for _ in range(runs)]
+    return statistics.median(durations)
+
+
+def main() -> None:
+    import_only = _measure_import_seconds("import maus.reader.tree_to_sgh")
+    import_and_earley = _measure_import_seconds(
+        "import maus.reader.tree_to_sgh as m; m.get_tree_parser('earley')"
+    )  # this is what the import cost before the parser construction has been made lazy
+    import_and_lalr = _measure_import_seconds("import maus.reader.tree_to_sgh as m; m.get_tree_parser('lalr')")
+    print(f"import (lazy):                  {import_only * 1000:8.1f} ms")
+    print(f"import + Earley parser (eager): {import_and_earley * 1000:8.1f} ms")
+    print(f"import + LALR parser:           {import_and_lalr * 1000:8.1f} ms")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_path = Path(temp_dir) / "tree_parser.lark_cache"
+        Lark(GRAMMAR, parser="lalr", cache=str(cache_path))  # fills the cache
+        start = time.perf_counter()
+        Lark(GRAMMAR, parser="lalr", cache=str(cache_path))
+        print(f"LALR parser from the cache:     {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    earley = get_tree_parser("earley")
+    lalr = get_tree_parser("lalr")
+    trees: Dict[str, str] = {}
+    for tree_path in sorted(_TEST_DATA.rglob("*.tree")):
+        trees[tree_path.name] = tree_path.read_text(encoding="utf-8")
+        lines = trees[tree_path.name].strip().splitlines()
+        large_tree = "\n".join(lines[:2] + lines[2:] * _REPETITIONS)
+        trees[f"{tree_path.name} x{_REPETITIONS}"] = large_tree
+    print(f"{'tree':<28}{'size/KiB':>10}{'Earley/ms':>12}{'LALR/ms':>12}{'speedup':>10}")
+    for name, tree_str in trees.items():
+        assert earley.parse(tree_str) == lalr.parse(tree_str), f"The parsers differ for {name}"
+        number = 1 if len(tree_str) > 100_000 else 10
+        earley_seconds = min(timeit.repeat(lambda: earley.parse(tree_str), number=number, repeat=3)) / number
+        lalr_seconds = min(timeit.repeat(lambda: lalr.parse(tree_str), number=number, repeat=3)) / number
+        print(
+            f"{name:<28}{len(tree_str) / 1024:>10.1f}{earley_seconds * 1000:>12.2f}{lalr_seconds * 1000:>12.2f}"
+            f"{earley_seconds / lalr_seconds:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
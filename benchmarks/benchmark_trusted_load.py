@@ -0,0 +1,64 @@
+"""
+measures what a validation-free ("trusted") load of the Deep- and FlatAnwendungshandbuchSchema could save at most:
+every file is loaded with the attrs validators enabled (as usual) and with all attrs validators disabled
+(attrs.validators.disabled()). The converters (e.g. the string interning) run in both cases.
+On the test data, disabling the validators saved only 7-18% (e.g. 64ms ➡ 57ms for the flat AHB 11042); the load time
+is dominated by the field deserialization of marshmallow. That's not worth loading unvalidated data, so the schemas
+have no trusted mode that skips the validation.
+"""
+
+import json
+import timeit
+from pathlib import Path
+
+import attrs
+
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuchSchema, FlatAnwendungshandbuchSchema
+from maus.reader.flat_ahb_reader import FlatAhbCsvReader
+
+_TEST_DATA = Path(__file__).parent.parent / "tests" / "unit_tests" / "ahbs"
+_REPETITIONS = 10
+
+
+def _measure(statement) -> float:
+    """returns the best of 5 runs of _REPETITIONS executions of the statement"""
+    return min(timeit.repeat(statement, number=_REPETITIONS, repeat=5))
+
+
+def _measure_without_validators(statement) -> float:
+    with attrs.validators.disabled():
+        return _measure(statement)
+
+
+def _report(name: str, validated_seconds: float, unvalidated_seconds: float) -> None:
+    print(
+        f"{name:<30} validated: {1000 * validated_seconds / _REPETITIONS:8.2f}ms "
+        f"without validators: {1000 * unvalidated_seconds / _REPETITIONS:8.2f}ms "
+        f"speedup: {validated_seconds / unvalidated_seconds:5.2f}x"
+    )
+
+
+def main() -> None:
+    """
+    loads every MAUS and flat AHB of the test data repeatedly with and without validators and prints the average
+    load times
+    """
+    for maus_path in sorted(_TEST_DATA.glob("**/*_maus.json")):
+        with open(maus_path, "r", encoding="utf-8") as maus_file:
+            maus_json = json.load(maus_file)
+        try:
+            DeepAnwendungshandbuchSchema().load(maus_json)
+        except ValueError:
+            continue  # some of the old test files are not valid anymore
+        validated = _measure(lambda: DeepAnwendungshandbuchSchema().load(maus_json))
+        unvalidated = _measure_without_validators(lambda: DeepAnwendungshandbuchSchema().load(maus_json))
+        _report(f"MAUS {maus_path.name}", validated, unvalidated)
+    for csv_path in sorted(_TEST_DATA.glob("**/*.csv")):
+        flat_ahb_json = FlatAnwendungshandbuchSchema().dump(FlatAhbCsvReader(csv_path).to_flat_ahb())
+        validated = _measure(lambda: FlatAnwendungshandbuchSchema().load(flat_ahb_json))
+        unvalidated = _measure_without_validators(lambda: FlatAnwendungshandbuchSchema().load(flat_ahb_json))
+        _report(f"flat AHB {csv_path.name}", validated, unvalidated)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+compares the previous classification of value pool entries (up to five regexes per call and up to four calls per row)
+with the single pass, memoized classifier of the FlatAhbCsvReader. It first checks that both return identical results
+for every cell of the test data CSVs (and some edge cases), then measures separate_value_pool_entry_and_name for all rows.
+"""
+
+import csv
+import timeit
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from maus.models.edifact_components import gabi_edifact_qualifier_pattern
+from maus.reader.flat_ahb_reader import (
+    FlatAhbCsvReader,
+    _ebd_code_pattern,
+    _is_value_pool_entry_memoized,
+    _numeric_value_pool_entry_pattern,
+    _value_pool_entry_pattern,
+)
+
+_TEST_DATA = Path(__file__).parent.parent / "tests" / "unit_tests"
+
+
+def _previous_is_value_pool_entry(candidate: Optional[str]) -> bool:
+    if not candidate:
+        return False
+    if _value_pool_entry_pattern.match(candidate) is not None:
+        return True
+    if _numeric_value_pool_entry_pattern.match(candidate) is not None:
+        return True
+    if len(candidate) == 1 and candidate.upper() == candidate:
+        return True
+    if gabi_edifact_qualifier_pattern.match(candidate) is not None:
+        return True
+    return _ebd_code_pattern.match(candidate) is not None
+
+
+def _previous_separate_value_pool_entry_and_name(
+    x: Optional[str], y: Optional[str]  # pylint:disable=invalid-name
+) -> Tuple[Optional[str], Optional[str]]:
+    if x is not None:
+        x = x.strip()
+    if y is not None:
+        y = y.strip()
+    if _previous_is_value_pool_entry(x) and not _previous_is_value_pool_entry(y):
+        return x, y or None
+    if _previous_is_value_pool_entry(x) and _previous_is_value_pool_entry(y):
+        return x, y
+    return y or None, x or None
+
+
+def main() -> None:
+    rows: List[Tuple[str, str]] = []
+    cells: List[str] = []
+    for csv_path in sorted(_TEST_DATA.rglob("*.csv")):
+        with open(csv_path, "r", encoding="utf-8") as csv_file:
+            for row in csv.DictReader(csv_file):
+                cells.extend(value for value in row.values() if isinstance(value, str))
+                if "Codes und Qualifier" in row and "Beschreibung" in row:
+                    rows.append((row["Codes und Qualifier"], row["Beschreibung"]))
+    edge_cases = ["", "X", "x", "-", "ä", "Ä", "1", "1.2", "1.2a", "MP-ID", "GABiRLMoT", "E_0401", "G_1", "AB\n", "i"]
+    candidates = cells + [cell.strip() for cell in cells] + edge_cases
+    mismatches = [c for c in candidates if FlatAhbCsvReader._is_value_pool_entry(c) != _previous_is_value_pool_entry(c)]
+    assert not mismatches, f"The classifiers differ for {mismatches}"
+    for codes, description in rows:
+        assert FlatAhbCsvReader.separate_value_pool_entry_and_name(
+            codes, description
+        ) == _previous_separate_value_pool_entry_and_name(codes, description)
+    print(f"identical results for {len(set(candidates))} distinct candidates and {len(rows)} rows")
+
+    def run_previous() -> None:
+        for codes, description in rows:
+            _previous_separate_value_pool_entry_and_name(codes, description)
+
+    def run_memoized() -> None:
+        for codes, description in rows:
+            FlatAhbCsvReader.separate_value_pool_entry_and_name(codes, description)
+
+    number = 20
+    previous = min(timeit.repeat(run_previous, number=number, repeat=5)) / number
+    _is_value_pool_entry_memoized.cache_clear()
+    cold = timeit.timeit(run_memoized, number=1)
+    memoized = min(timeit.repeat(run_memoized, number=number, repeat=5)) / number
+    print(f"previous: {previous * 1000:.2f} ms for all rows")
+    print(
+        f"memoized: {memoized * 1000:.2f} ms for all rows ({previous / memoized:.1f}x); first (cold) run {cold * 1000:.2f} ms"
+    )
+    print(_is_value_pool_entry_memoized.cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+compares the throughput of "is this entered qualifier allowed" checks using a linear scan over the value pool entries
+with the lazily built qualifier index of the DataElementValuePool
+"""
+
+import json
+import timeit
+from pathlib import Path
+from typing import List, Tuple
+
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuchSchema
+from maus.models.edifact_components import DataElementValuePool
+
+_TEST_DATA = Path(__file__).parent.parent / "tests" / "unit_tests" / "ahbs"
+_REPETITIONS = 200
+
+
+def _load_value_pools() -> List[DataElementValuePool]:
+    result: List[DataElementValuePool] = []
+    for maus_path in sorted(_TEST_DATA.glob("**/*_maus.json")):
+        with open(maus_path, "r", encoding="utf-8") as maus_file:
+            try:
+                maus = DeepAnwendungshandbuchSchema().load(json.load(maus_file))
+            except ValueError:
+                continue  # some of the old test files are not valid anymore
+        result += maus.get_all_value_pools()
+    return result
+
+
+def _linear_scan(checks: List[Tuple[DataElementValuePool, str]]) -> int:
+    return sum(1 for value_pool, qualifier in checks if any(x.qualifier == qualifier for x in value_pool.value_pool))
+
+
+def _indexed(checks: List[Tuple[DataElementValuePool, str]]) -> int:
+    return sum(1 for value_pool, qualifier in checks if value_pool.is_allowed_qualifier(qualifier))
+
+
+def main() -> None:
+    """
+    checks every qualifier of every value pool in the test MAUS s plus one unknown qualifier per value pool
+    """
+    value_pools = _load_value_pools()
+    checks: List[Tuple[DataElementValuePool, str]] = []
+    for value_pool in value_pools:
+        checks += [(value_pool, entry.qualifier) for entry in value_pool.value_pool]
+        checks.append((value_pool, "UNKNOWN"))
+    assert _linear_scan(checks) == _indexed(checks)
+    linear = min(timeit.repeat(lambda: _linear_scan(checks), number=_REPETITIONS, repeat=5))
+    indexed = min(timeit.repeat(lambda: _indexed(checks), number=_REPETITIONS, repeat=5))
+    number_of_checks = len(checks) * _REPETITIONS
+    print(f"{len(value_pools)} value pools, {len(checks)} checks per run")
+    print(f"linear scan: {number_of_checks / linear:12,.0f} checks/s")
+    print(f"indexed:     {number_of_checks / indexed:12,.0f} checks/s ({linear / indexed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
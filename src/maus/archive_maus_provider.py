@@ -0,0 +1,126 @@
+"""
+This module contains a MausProvider that reads MAUS s from a single archive (a zip file or an uncompressed tar file)
+instead of thousands of loose files. The archive is opened once and the members are indexed once, so that every
+request only costs a dictionary lookup and a read from the already open file handle.
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+import tarfile
+import threading
+import zipfile
+from abc import abstractmethod
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from maus.edifact import EdifactFormat, EdifactFormatVersion
+from maus.maus_provider import MausKey, MausProvider, _get_maus_keys_from_paths
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuch, DeepAnwendungshandbuchSchema
+
+_decompressors: Dict[str, Callable[[bytes], bytes]] = {
+    ".gz": gzip.decompress,
+    ".bz2": bz2.decompress,
+    ".xz": lzma.decompress,
+}
+"""
+maps the suffix of (individually) compressed archive members to the function that decompresses them
+"""
+
+
+class ArchiveMausProvider(MausProvider):
+    """
+    A MAUS provider that reads the MAUS s from a zip file or an uncompressed tar file.
+    Inheriting classes define where inside the archive the MAUS s are found (to_path), just like for the
+    :class:`maus.maus_provider.FileBasedMausProvider`.
+
+    Members may be compressed individually: zip members may use any compression the zipfile module supports (deflate,
+    bzip2, lzma). Additionally, members with the suffix .gz, .bz2 or .xz (e.g. '11042_maus.json.gz') are decompressed
+    transparently; to_path returns the path without the compression suffix.
+    The provider holds the archive open until :meth:`close` is called (or the with block is left).
+    """
+
+    def __init__(self, archive_path: Path, encoding: str = "utf-8"):
+        """
+        opens the archive and builds the member index
+        :param archive_path: path to a zip file or an uncompressed tar file
+        """
+        self.archive_path: Path = archive_path
+        self._encoding = encoding
+        self._lock = threading.Lock()
+        self._zip_file: Optional[zipfile.ZipFile] = None
+        self._tar_file: Optional[tarfile.TarFile] = None
+        # maps the path without compression suffix to (member, suffix of the compression or None)
+        self._index: Dict[PurePosixPath, Tuple[Union[zipfile.ZipInfo, tarfile.TarInfo], Optional[str]]] = {}
+        if zipfile.is_zipfile(archive_path):
+            self._zip_file = zipfile.ZipFile(archive_path, "r")  # pylint:disable=consider-using-with
+            for zip_info in self._zip_file.infolist():
+                if not zip_info.is_dir():
+                    self._add_to_index(zip_info.filename, zip_info)
+        else:
+            # "r:" explicitly refuses compressed tar files; seeking in compressed streams would be way too slow
+            self._tar_file = tarfile.open(archive_path, "r:")  # pylint:disable=consider-using-with
+            for tar_info in self._tar_file.getmembers():
+                if tar_info.isfile():
+                    self._add_to_index(tar_info.name, tar_info)
+
+    def _add_to_index(self, member_name: str, member: Union[zipfile.ZipInfo, tarfile.TarInfo]) -> None:
+        path = PurePosixPath(member_name)
+        compression: Optional[str] = path.suffix if path.suffix in _decompressors else None
+        if compression is not None:
+            path = path.with_suffix("")
+        self._index[path] = (member, compression)
+
+    @abstractmethod
+    def to_path(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Path:
+        """
+        returns the path of the maus file inside the archive (without a compression suffix like .gz)
+        """
+        raise NotImplementedError("Has to be implemented in inheriting class")
+
+    def _read_member(self, member: Union[zipfile.ZipInfo, tarfile.TarInfo]) -> bytes:
+        with self._lock:
+            if isinstance(member, zipfile.ZipInfo):
+                assert self._zip_file is not None
+                return self._zip_file.read(member)
+            assert self._tar_file is not None
+            member_file = self._tar_file.extractfile(member)
+            assert member_file is not None  # we only index regular files
+            return member_file.read()
+
+    def get_maus(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[DeepAnwendungshandbuch]:
+        path = PurePosixPath(self.to_path(edifact_format, edifact_format_version, pruefidentifikator).as_posix())
+        index_entry = self._index.get(path)
+        if index_entry is None:
+            return None
+        member, compression = index_entry
+        content = self._read_member(member)
+        if compression is not None:
+            content = _decompressors[compression](content)
+        return DeepAnwendungshandbuchSchema().load(json.loads(content.decode(self._encoding)))
+
+    def get_available_maus(self, edifact_format_version: Optional[EdifactFormatVersion] = None) -> List[MausKey]:
+        """
+        returns the keys of all MAUS s in the archive (see :meth:`.FileBasedMausProvider.get_available_maus`)
+        """
+        return _get_maus_keys_from_paths(self._index.keys(), self.to_path, edifact_format_version)
+
+    def close(self) -> None:
+        """
+        closes the archive
+        """
+        if self._zip_file is not None:
+            self._zip_file.close()
+        if self._tar_file is not None:
+            self._tar_file.close()
+
+    def __enter__(self) -> "ArchiveMausProvider":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,123 @@
+"""
+This module contains the asynchronous counterpart of the :class:`maus.maus_provider.MausProvider`.
+Reading a MAUS from disk and deserializing it blocks for a noticeable amount of time. The AsyncMausProviders run the
+blocking parts in an executor (a thread or process pool) so that they don't block the event loop.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Dict, Optional
+
+from maus.edifact import EdifactFormat, EdifactFormatVersion
+from maus.maus_provider import MausKey, MausProvider, load_maus_file
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuch
+
+# pylint:disable=too-few-public-methods
+
+
+class AsyncMausProvider(ABC):
+    """
+    An AsyncMausProvider is a class that asynchronously provides MAUS' (Deep Anwendungshandbuch) to calling code.
+    """
+
+    @abstractmethod
+    async def get_maus(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[DeepAnwendungshandbuch]:
+        """
+        Return a MAUS for the given parameters. returns None if the requested MAUS is not available.
+        """
+        raise NotImplementedError("Has to be implemented in inheriting class")
+
+
+class _CoalescingAsyncMausProvider(AsyncMausProvider, ABC):
+    """
+    An AsyncMausProvider that loads every MAUS only once, even if it is requested multiple times concurrently.
+    All concurrent requests for the same MAUS await the same (shielded) load. An instance must not be shared between
+    different event loops.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[MausKey, "asyncio.Future[Optional[DeepAnwendungshandbuch]]"] = {}
+
+    @abstractmethod
+    async def _load_maus(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[DeepAnwendungshandbuch]:
+        """
+        actually loads the MAUS; this is called at most once at a time per MAUS
+        """
+        raise NotImplementedError("Has to be implemented in inheriting class")
+
+    async def get_maus(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[DeepAnwendungshandbuch]:
+        key: MausKey = (edifact_format, edifact_format_version, pruefidentifikator)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load_maus(edifact_format, edifact_format_version, pruefidentifikator))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # the shield prevents that one cancelled caller cancels the load for all other callers
+        return await asyncio.shield(future)
+
+
+class SyncMausProviderAdapter(_CoalescingAsyncMausProvider):
+    """
+    Wraps a (synchronous) MausProvider and runs its get_maus in an executor.
+    """
+
+    def __init__(self, provider: MausProvider, executor: Optional[Executor] = None):
+        """
+        :param provider: the synchronous provider that actually loads the MAUS s
+        :param executor: the executor to run the provider in; defaults to the default (thread pool) executor of the
+        event loop. If you use a process pool, the provider has to be picklable.
+        """
+        super().__init__()
+        self.provider: MausProvider = provider
+        self._executor = executor
+
+    async def _load_maus(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[DeepAnwendungshandbuch]:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.provider.get_maus, edifact_format, edifact_format_version, pruefidentifikator
+        )
+
+
+class AsyncFileBasedMausProvider(_CoalescingAsyncMausProvider):
+    """
+    An AsyncMausProvider that uses the file system to retrieve MAUS s. Just like the
+    :class:`maus.maus_provider.FileBasedMausProvider` inheriting classes define where to find the files (to_path).
+    Both reading and deserializing the file are run in the executor.
+    """
+
+    def __init__(self, base_path: Path, encoding: str = "utf-8", executor: Optional[Executor] = None):
+        """
+        initialize by providing a base path relative to which the MAUS s can be found.
+        :param executor: the executor in which the files are read and deserialized; defaults to the default (thread
+        pool) executor of the event loop. A ProcessPoolExecutor avoids the GIL at the cost of pickling the results.
+        """
+        super().__init__()
+        self.base_path: Path = base_path
+        self._encoding = encoding
+        self._executor = executor
+
+    @abstractmethod
+    def to_path(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Path:
+        """
+        returns the path of the maus file relative to the given parameters.
+        """
+        raise NotImplementedError("Has to be implemented in inheriting class")
+
+    async def _load_maus(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[DeepAnwendungshandbuch]:
+        full_path = self.base_path / self.to_path(edifact_format, edifact_format_version, pruefidentifikator)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, load_maus_file, full_path, self._encoding
+        )
@@ -0,0 +1,464 @@
+"""
+This module contains a compact binary representation of a MAUS (:class:`.DeepAnwendungshandbuch`).
+Other than the JSON representation, the binary format does not have to be parsed as a whole. It consists of
+- a header
+- a string table that contains every distinct string (discriminators, expressions, meanings...) only once
+- a node table with fixed size records; the children of each node are stored next to each other.
+The file can be memory mapped (read only), so that multiple processes reading the same file share the same pages.
+The :class:`MausBinaryReader` navigates the binary data without building the full object graph; if you need the full
+DeepAnwendungshandbuch, use :meth:`MausBinaryReader.to_deep_ahb`. The binary format round-trips to the JSON format.
+Other than the JSON format, it also keeps the ahb_line_index of the segment groups and segments.
+"""
+
+import mmap
+import struct
+from collections import deque
+from enum import IntEnum
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+import attrs
+
+from maus.models.anwendungshandbuch import AhbMetaInformation, DeepAnwendungshandbuch
+from maus.models.edifact_components import (
+    DataElement,
+    DataElementDataType,
+    DataElementFreeText,
+    DataElementValuePool,
+    Segment,
+    SegmentGroup,
+    ValuePoolEntry,
+)
+
+_MAGIC = b"MAUSBIN\x00"
+_FORMAT_VERSION = 2
+_NO_STRING = 0xFFFFFFFF  #: the string id that represents None
+
+# magic, format version, reserved, 4 meta strings, root count, node count, node offset, string count,
+# string offsets offset, string data offset
+_header_struct = struct.Struct("<8sHH4IIIIIII")
+# kind, flags, reserved, 5 string ids, first child index and count of the first and the second child list,
+# ahb_line_index
+_node_struct = struct.Struct("<BBH5I4Ii")
+_string_offset_struct = struct.Struct("<I")
+
+_FIRST_CHILDREN_ARE_NONE = 1  #: flag that is set if e.g. SegmentGroup.segments is None (rather than an empty list)
+_SECOND_CHILDREN_ARE_NONE = 2  #: flag that is set if SegmentGroup.segment_groups is None (rather than an empty list)
+_HAS_AHB_LINE_INDEX = 4  #: flag that is set if the ahb_line_index of a segment group/segment is not None
+
+
+class BinaryNodeKind(IntEnum):
+    """
+    the kinds of nodes that are stored in the node table
+    """
+
+    SEGMENT_GROUP = 1  #: string ids: discriminator, ahb_expression; children: segments, segment_groups
+    SEGMENT = 2  #: string ids: discriminator, ahb_expression, section_name, segment_id; children: data_elements
+    DATA_ELEMENT_FREE_TEXT = 3  #: string ids: discriminator, ahb_expression, data_element_id, entered_input, value_type
+    DATA_ELEMENT_VALUE_POOL = 4  #: string ids: discriminator, -, data_element_id, entered_input, value_type; children
+    VALUE_POOL_ENTRY = 5  #: string ids: qualifier, meaning, ahb_expression
+
+
+_BinaryChild = Union[SegmentGroup, Segment, DataElement, ValuePoolEntry]
+
+
+class _StringTable:  # pylint:disable=too-few-public-methods
+    """
+    collects distinct strings and assigns them ids
+    """
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def add(self, value: Optional[str]) -> int:
+        """returns the id of the value, adds it to the table if necessary"""
+        if value is None:
+            return _NO_STRING
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.ids[value] = string_id
+            self.strings.append(value)
+        return string_id
+
+
+def _describe_node(
+    node: _BinaryChild,
+) -> Tuple[BinaryNodeKind, Tuple[Optional[str], ...], Optional[List], Optional[List]]:
+    """
+    returns kind, the string attributes and up to two lists of children of the given node
+    """
+    if isinstance(node, SegmentGroup):
+        return (
+            BinaryNodeKind.SEGMENT_GROUP,
+            (node.discriminator, node.ahb_expression),
+            node.segments,
+            node.segment_groups,
+        )
+    if isinstance(node, Segment):
+        return (
+            BinaryNodeKind.SEGMENT,
+            (node.discriminator, node.ahb_expression, node.section_name, node.segment_id),
+            node.data_elements,
+            [],
+        )
+    if isinstance(node, DataElementFreeText):
+        return (
+            BinaryNodeKind.DATA_ELEMENT_FREE_TEXT,
+            (
+                node.discriminator,
+                node.ahb_expression,
+                node.data_element_id,
+                node.entered_input,
+                node.value_type.value if node.value_type is not None else None,
+            ),
+            [],
+            [],
+        )
+    if isinstance(node, DataElementValuePool):
+        return (
+            BinaryNodeKind.DATA_ELEMENT_VALUE_POOL,
+            (
+                node.discriminator,
+                None,
+                node.data_element_id,
+                node.entered_input,
+                node.value_type.value if node.value_type is not None else None,
+            ),
+            node.value_pool,
+            [],
+        )
+    if isinstance(node, ValuePoolEntry):
+        return BinaryNodeKind.VALUE_POOL_ENTRY, (node.qualifier, node.meaning, node.ahb_expression), [], []
+    raise TypeError(f"The binary serialization of {node.__class__} is not supported")
+
+
+def dumps_maus_binary(maus: DeepAnwendungshandbuch) -> bytes:  # pylint:disable=too-many-locals
+    """
+    serializes the given MAUS into the binary format
+    """
+    strings = _StringTable()
+    meta_string_ids = [
+        strings.add(maus.meta.pruefidentifikator),
+        strings.add(maus.meta.maus_version),
+        strings.add(maus.meta.description),
+        strings.add(maus.meta.direction),
+    ]
+    # the nodes are placed breadth first, so that the children of every node are located next to each other
+    records: List[Optional[bytes]] = [None] * len(maus.lines)
+    queue: Deque[Tuple[int, _BinaryChild]] = deque(enumerate(maus.lines))
+    while queue:
+        node_index, node = queue.popleft()
+        kind, string_values, first_children, second_children = _describe_node(node)
+        flags = 0
+        child_blocks: List[Tuple[int, int]] = []
+        for children, none_flag in [
+            (first_children, _FIRST_CHILDREN_ARE_NONE),
+            (second_children, _SECOND_CHILDREN_ARE_NONE),
+        ]:
+            if children is None:
+                flags |= none_flag
+                children = []
+            first_child_index = len(records)
+            records.extend([None] * len(children))
+            queue.extend((first_child_index + offset, child) for offset, child in enumerate(children))
+            child_blocks.append((first_child_index, len(children)))
+        string_ids = [strings.add(value) for value in string_values]
+        string_ids += [_NO_STRING] * (5 - len(string_ids))
+        ahb_line_index = node.ahb_line_index if isinstance(node, (SegmentGroup, Segment)) else None
+        if ahb_line_index is not None:
+            flags |= _HAS_AHB_LINE_INDEX
+        records[node_index] = _node_struct.pack(
+            kind,
+            flags,
+            0,
+            *string_ids,
+            *child_blocks[0],  # type:ignore[arg-type]
+            *child_blocks[1],  # type:ignore[arg-type]
+            ahb_line_index if ahb_line_index is not None else 0,
+        )
+    encoded_strings = [string.encode("utf-8") for string in strings.strings]
+    node_offset = _header_struct.size
+    string_offsets_offset = node_offset + len(records) * _node_struct.size
+    string_data_offset = string_offsets_offset + (len(encoded_strings) + 1) * _string_offset_struct.size
+    header = _header_struct.pack(
+        _MAGIC,
+        _FORMAT_VERSION,
+        0,
+        *meta_string_ids,
+        len(maus.lines),
+        len(records),
+        node_offset,
+        len(encoded_strings),
+        string_offsets_offset,
+        string_data_offset,
+    )
+    string_offsets: List[int] = [0]
+    for encoded_string in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded_string))
+    return b"".join(
+        [
+            header,
+            *records,  # type:ignore[list-item]
+            struct.pack(f"<{len(string_offsets)}I", *string_offsets),
+            *encoded_strings,
+        ]
+    )
+
+
+def dump_maus_binary(maus: DeepAnwendungshandbuch, file_path: Path) -> None:
+    """
+    writes the given MAUS into the given file using the binary format
+    """
+    with open(file_path, "wb") as outfile:
+        outfile.write(dumps_maus_binary(maus))
+
+
+@attrs.define(kw_only=True, frozen=True)
+class BinaryMausNode:
+    """
+    A lightweight view on a single node inside the binary MAUS. Accessing its properties reads directly from the buffer.
+    """
+
+    reader: "MausBinaryReader" = attrs.field(repr=False)  #: the reader that holds the binary data
+    index: int  #: the index of the node inside the node table
+
+    def _fields(self) -> Tuple[int, ...]:
+        return self.reader.read_node(self.index)
+
+    @property
+    def kind(self) -> BinaryNodeKind:
+        """the kind of this node"""
+        return BinaryNodeKind(self._fields()[0])
+
+    def _string(self, position: int) -> Optional[str]:
+        return self.reader.get_string(self._fields()[3 + position])
+
+    @property
+    def discriminator(self) -> Optional[str]:
+        """the discriminator of the segment group/segment/data element; None for value pool entries"""
+        if self.kind == BinaryNodeKind.VALUE_POOL_ENTRY:
+            return None
+        return self._string(0)
+
+    @property
+    def ahb_expression(self) -> Optional[str]:
+        """the ahb expression; None for value pools (their entries have expressions)"""
+        if self.kind == BinaryNodeKind.VALUE_POOL_ENTRY:
+            return self._string(2)
+        return self._string(1)
+
+    @property
+    def ahb_line_index(self) -> Optional[int]:
+        """the ahb_line_index of the segment group/segment; None for data elements and value pool entries"""
+        fields = self._fields()
+        if fields[1] & _HAS_AHB_LINE_INDEX:
+            return fields[12]
+        return None
+
+    def _children(self, position: int) -> Optional[List["BinaryMausNode"]]:
+        fields = self._fields()
+        if fields[1] & (_FIRST_CHILDREN_ARE_NONE if position == 0 else _SECOND_CHILDREN_ARE_NONE):
+            return None
+        first_child_index, child_count = fields[8 + 2 * position], fields[9 + 2 * position]
+        return [
+            BinaryMausNode(reader=self.reader, index=child_index)
+            for child_index in range(first_child_index, first_child_index + child_count)
+        ]
+
+    @property
+    def children(self) -> List["BinaryMausNode"]:
+        """all direct children of this node (e.g. segments and segment groups of a segment group)"""
+        return (self._children(0) or []) + (self._children(1) or [])
+
+    def to_object(self) -> _BinaryChild:
+        """
+        builds the actual object (e.g. a SegmentGroup incl. all of its sub groups) from this node
+        """
+        fields = self._fields()
+        strings = [self.reader.get_string(string_id) for string_id in fields[3:8]]
+        kind = BinaryNodeKind(fields[0])
+        if kind == BinaryNodeKind.SEGMENT_GROUP:
+            segments = self._children(0)
+            segment_groups = self._children(1)
+            return SegmentGroup(
+                discriminator=strings[0],  # type:ignore[arg-type]
+                ahb_expression=strings[1],  # type:ignore[arg-type]
+                ahb_line_index=self.ahb_line_index,
+                segments=[s.to_object() for s in segments] if segments is not None else None,  # type:ignore[misc]
+                segment_groups=(
+                    [sg.to_object() for sg in segment_groups] if segment_groups is not None else None  # type:ignore
+                ),
+            )
+        if kind == BinaryNodeKind.SEGMENT:
+            return Segment(
+                discriminator=strings[0],  # type:ignore[arg-type]
+                ahb_expression=strings[1],  # type:ignore[arg-type]
+                ahb_line_index=self.ahb_line_index,
+                section_name=strings[2],
+                segment_id=strings[3],
+                data_elements=[de.to_object() for de in self.children],  # type:ignore[misc]
+            )
+        value_type = DataElementDataType(strings[4]) if strings[4] is not None else None
+        if kind == BinaryNodeKind.DATA_ELEMENT_FREE_TEXT:
+            return DataElementFreeText(
+                discriminator=strings[0],
+                ahb_expression=strings[1],  # type:ignore[arg-type]
+                data_element_id=strings[2],  # type:ignore[arg-type]
+                entered_input=strings[3],
+                value_type=value_type,
+            )
+        if kind == BinaryNodeKind.DATA_ELEMENT_VALUE_POOL:
+            return DataElementValuePool(
+                discriminator=strings[0],
+                data_element_id=strings[2],  # type:ignore[arg-type]
+                entered_input=strings[3],
+                value_type=value_type,
+                value_pool=[vpe.to_object() for vpe in self.children],  # type:ignore[misc]
+            )
+        return ValuePoolEntry(
+            qualifier=strings[0], meaning=strings[1], ahb_expression=strings[2]  # type:ignore[arg-type]
+        )
+
+
+class MausBinaryReader:  # pylint:disable=too-many-instance-attributes
+    """
+    Reads a MAUS from the binary format (e.g. from a memory mapped file) without deserializing it as a whole.
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]):
+        """
+        initialize the reader with a buffer that contains the binary MAUS.
+        Use :meth:`open` to read from a file.
+        """
+        self._buffer = buffer
+        self._mmap: Optional[mmap.mmap] = None
+        (
+            magic,
+            format_version,
+            _,
+            *meta_string_ids,
+            self._root_count,
+            self._node_count,
+            self._node_offset,
+            self._string_count,
+            self._string_offsets_offset,
+            self._string_data_offset,
+        ) = _header_struct.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError("The given data are no binary MAUS")
+        if format_version != _FORMAT_VERSION:
+            raise ValueError(f"The binary MAUS format version {format_version} is not supported")
+        self._meta_string_ids: List[int] = meta_string_ids
+        self._string_cache: Dict[int, str] = {}
+
+    @staticmethod
+    def open(file_path: Path) -> "MausBinaryReader":
+        """
+        memory maps the given file (read only) and returns a reader for it.
+        Call :meth:`close` (or use the reader as context manager) when you're done.
+        """
+        with open(file_path, "rb") as binary_file:
+            mapped_file = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+        reader = MausBinaryReader(mapped_file)
+        reader._mmap = mapped_file  # pylint:disable=protected-access
+        return reader
+
+    def close(self) -> None:
+        """
+        closes the underlying memory mapped file (if any)
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "MausBinaryReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get_string(self, string_id: int) -> Optional[str]:
+        """
+        returns the string with the given id from the string table
+        """
+        if string_id == _NO_STRING:
+            return None
+        result = self._string_cache.get(string_id)
+        if result is None:
+            start, end = struct.unpack_from("<2I", self._buffer, self._string_offsets_offset + 4 * string_id)
+            data_start = self._string_data_offset
+            result = bytes(self._buffer[data_start + start : data_start + end]).decode("utf-8")
+            self._string_cache[string_id] = result
+        return result
+
+    def read_node(self, index: int) -> Tuple[int, ...]:
+        """
+        returns the raw fields of the node record with the given index
+        """
+        if not 0 <= index < self._node_count:
+            raise IndexError(f"There is no node with index {index}")
+        return _node_struct.unpack_from(self._buffer, self._node_offset + index * _node_struct.size)
+
+    @property
+    def meta(self) -> AhbMetaInformation:
+        """
+        the meta information of the MAUS
+        """
+        pruefidentifikator, maus_version, description, direction = (
+            self.get_string(string_id) for string_id in self._meta_string_ids
+        )
+        return AhbMetaInformation(
+            pruefidentifikator=pruefidentifikator,  # type:ignore[arg-type]
+            maus_version=maus_version,
+            description=description,
+            direction=direction,
+        )
+
+    @property
+    def lines(self) -> List[BinaryMausNode]:
+        """
+        the root segment groups of the MAUS (equivalent to DeepAnwendungshandbuch.lines)
+        """
+        return [BinaryMausNode(reader=self, index=index) for index in range(self._root_count)]
+
+    def iter_nodes(self, kind: Optional[BinaryNodeKind] = None) -> Iterator[BinaryMausNode]:
+        """
+        iterates over all nodes (of the given kind, if specified) without following the tree structure
+        """
+        for index in range(self._node_count):
+            if kind is None or self.read_node(index)[0] == kind:
+                yield BinaryMausNode(reader=self, index=index)
+
+    def find_by_discriminator(self, discriminator: str) -> Optional[BinaryMausNode]:
+        """
+        returns the first segment group, segment or data element with the given discriminator; None if there is none
+        """
+        for node in self.iter_nodes():
+            if node.discriminator == discriminator:
+                return node
+        return None
+
+    def to_deep_ahb(self) -> DeepAnwendungshandbuch:
+        """
+        builds the full DeepAnwendungshandbuch from the binary data
+        """
+        return DeepAnwendungshandbuch(
+            meta=self.meta, lines=[line.to_object() for line in self.lines]  # type:ignore[misc]
+        )
+
+
+def loads_maus_binary(data: bytes) -> DeepAnwendungshandbuch:
+    """
+    deserializes a MAUS from the binary format
+    """
+    return MausBinaryReader(data).to_deep_ahb()
+
+
+def load_maus_binary(file_path: Path) -> DeepAnwendungshandbuch:
+    """
+    reads a MAUS from a file in the binary format
+    """
+    with MausBinaryReader.open(file_path) as reader:
+        return reader.to_deep_ahb()
@@ -12,6 +12,7 @@ except ImportError as import_error:
     # click is only an optional dependency when maus is used as CLI tool
     raise
 
+from maus.content_hash import diff_content
 from maus.mig_ahb_matching import to_deep_ahb
 from maus.models.anwendungshandbuch import (
     DeepAnwendungshandbuch,
@@ -19,10 +20,11 @@ from maus.models.anwendungshandbuch import (
     FlatAnwendungshandbuchSchema,
 )
 from maus.models.message_implementation_guide import SegmentGroupHierarchySchema
+from maus.reader.flat_ahb_batch_conversion import convert_csv_directory
 from maus.reader.mig_xml_reader import MigXmlReader
 
 
-# pylint:disable=too-many-arguments
+# pylint:disable=too-many-arguments,too-many-locals
 @click.command()
 @click.version_option()
 @click.option(
@@ -102,17 +104,64 @@ def main(
         with open(check_path, "r", encoding="utf-8") as maus_file:
             expected_maus: DeepAnwendungshandbuch = DeepAnwendungshandbuchSchema().loads(maus_file.read())
 
-            # reset the line index to make the comparison work
-            # this is fine cause there is no logic built on top of the line index
-            maus.reset_ahb_line_index()
-            expected_maus.reset_ahb_line_index()
-
-            if expected_maus == maus:
+            # the content hash comparison ignores the line index; there is no logic built on top of the line index
+            differences = diff_content(expected_maus, maus)
+            if not differences:
                 click.secho("✅ The generated maus.json matches the expected one", fg="green")
             else:
                 click.secho("❌ The generated maus.json does not match the expected one!", fg="red")
+                for difference in differences:
+                    click.secho(f"  - {' > '.join(difference.path)}", fg="red")
                 raise click.Abort()
 
 
+@click.command()
+@click.version_option()
+@click.option(
+    "-i",
+    "--input_path",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Path to the directory that contains the AHB CSV files (searched recursively)",
+    required=True,
+)
+@click.option(
+    "-o",
+    "--output_path",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Path to the directory to which the flat ahb json files and the manifest are written",
+    required=True,
+)
+@click.option(
+    "-c",
+    "--cache_path",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Path to the cache directory (defaults to <output_path>/.maus_cache)",
+)
+@click.option(
+    "--deterministic_guids",
+    is_flag=True,
+    default=False,
+    help="Derive the guids of the ahb lines from the CSV content, so that the same CSV always results in the same json",
+)
+def convert_csv_directory_main(input_path: Path, output_path: Path, cache_path: Path, deterministic_guids: bool):
+    """
+    🐭 converts all AHB CSV files in a directory (tree) to flat ahb json files; unchanged files are taken from a cache
+    """
+    manifest = convert_csv_directory(
+        input_path, output_path, cache_directory=cache_path, deterministic_guids=deterministic_guids
+    )
+    failed_results = [result for result in manifest.results if result.error is not None]
+    number_of_cached_results = len([result for result in manifest.results if result.cached])
+    click.secho(
+        f"Converted {len(manifest.results) - len(failed_results)} CSV files ({number_of_cached_results} from the cache)"
+        f" in {manifest.total_seconds:.1f}s",
+        fg="green" if not failed_results else "yellow",
+    )
+    for failed_result in failed_results:
+        click.secho(f"❌ {failed_result.csv_path}: {failed_result.error}", fg="red")
+    if failed_results:
+        raise click.Abort()
+
+
 if __name__ == "__main__":
     main()  # pylint:disable=no-value-for-parameter
@@ -0,0 +1,140 @@
+"""
+The content hash module allows to compare MAUS s (or any of their components) by their content without mutating them.
+Every (sub)tree is represented by a :class:`ContentHashNode` which carries a hash of its own content plus the hashes of
+all of its children (a "Merkle tree"). The ahb_line_index is excluded from the hash, because there is no logic built on
+top of it. Two trees with equal root hashes are equal; if they're not, the differing subtrees can be found by only
+descending into children whose hashes don't match.
+The hashes are not cached on the (mutable) model objects themselves, because every modification of a node would have
+to invalidate the hashes of all its parents. Instead, a hash tree is an immutable snapshot: build it once (e.g. for a
+reference MAUS) with :func:`build_content_hash_tree` and pass it to :func:`have_equal_content` or
+:func:`diff_content` instead of the object, so that only the other side is hashed. Rebuild the snapshot after you
+modified the object.
+"""
+
+import hashlib
+from typing import Any, FrozenSet, List, Optional, Tuple
+
+import attrs
+
+_EXCLUDED_FIELDS: FrozenSet[str] = frozenset({"ahb_line_index"})
+"""
+names of attributes that are not considered to be part of the content (and are hence ignored in the comparison)
+"""
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+@attrs.frozen(kw_only=True)
+class ContentHashNode:
+    """
+    A node in the content hash tree. It is an immutable snapshot of the respective object at the time of hashing.
+    """
+
+    label: str  #: a human-readable label of the node, e.g. the discriminator or the class name
+    own_digest: bytes = attrs.field(repr=False)
+    """
+    hash of the node's own attributes (excluding the children but including the number of children per attribute)
+    """
+    digest: bytes
+    """
+    hash of the own_digest and the digests of all children; if two digests are equal, the entire subtrees are equal
+    """
+    children: Tuple["ContentHashNode", ...] = attrs.field(repr=False)  #: the hash nodes of the sub objects
+    source: Any = attrs.field(repr=False, eq=False)  #: the object that has been hashed
+
+    def hexdigest(self) -> str:
+        """
+        returns the digest of this node as hex string
+        """
+        return self.digest.hex()
+
+
+def _get_label(obj: Any) -> str:
+    discriminator: Optional[str] = getattr(obj, "discriminator", None)
+    if discriminator:
+        return discriminator
+    if hasattr(obj, "qualifier"):
+        return f"{obj.__class__.__name__}({obj.qualifier})"
+    return obj.__class__.__name__
+
+
+def build_content_hash_tree(obj: Any) -> ContentHashNode:
+    """
+    recursively calculates the content hashes of the given object (e.g. a DeepAnwendungshandbuch, a SegmentGroup, a
+    Segment, a DataElement...) and all of its sub objects.
+    :param obj: an instance of an attrs class
+    :return: the root of the content hash tree
+    """
+    own_content: List[Any] = [obj.__class__.__name__]
+    children: List[ContentHashNode] = []
+    for field in attrs.fields(obj.__class__):
+        if field.name in _EXCLUDED_FIELDS or not field.eq:
+            continue
+        value = getattr(obj, field.name)
+        if isinstance(value, list) and all(attrs.has(item.__class__) for item in value):
+            own_content.append((field.name, len(value)))
+            children.extend(build_content_hash_tree(item) for item in value)
+        elif attrs.has(value.__class__):
+            own_content.append((field.name, "node"))
+            children.append(build_content_hash_tree(value))
+        else:
+            own_content.append((field.name, value))
+    own_digest = _digest(repr(own_content).encode("utf-8"))
+    digest = _digest(own_digest + b"".join(child.digest for child in children))
+    return ContentHashNode(
+        label=_get_label(obj), own_digest=own_digest, digest=digest, children=tuple(children), source=obj
+    )
+
+
+def _get_content_hash_tree(obj: Any) -> ContentHashNode:
+    """
+    returns obj if it is a content hash tree (snapshot) already, builds the tree otherwise
+    """
+    if isinstance(obj, ContentHashNode):
+        return obj
+    return build_content_hash_tree(obj)
+
+
+def have_equal_content(x: Any, y: Any) -> bool:  # pylint:disable=invalid-name
+    """
+    returns true iff both objects are equal in terms of their content (ignoring the ahb_line_index).
+    Other than resetting the ahb_line_index and comparing both objects, this does not modify x and y.
+    x and y may also be content hash trees that have been built before (they are not hashed again then).
+    """
+    return _get_content_hash_tree(x).digest == _get_content_hash_tree(y).digest
+
+
+@attrs.define(kw_only=True, frozen=True)
+class ContentDifference:
+    """
+    A subtree that differs between two compared objects
+    """
+
+    path: List[str]  #: the labels of the nodes from the root (inclusive) to the differing node (inclusive)
+    left: Any  #: the differing object in the left tree
+    right: Any  #: the differing object in the right tree
+
+
+def _diff_nodes(left: ContentHashNode, right: ContentHashNode, path: List[str]) -> List[ContentDifference]:
+    if left.digest == right.digest:
+        return []
+    current_path = path + [left.label]
+    if left.own_digest != right.own_digest:
+        # the node itself differs (or the number of its children), no need to look any further
+        return [ContentDifference(path=current_path, left=left.source, right=right.source)]
+    result: List[ContentDifference] = []
+    for left_child, right_child in zip(left.children, right.children):
+        result += _diff_nodes(left_child, right_child, current_path)
+    return result
+
+
+def diff_content(left: Any, right: Any) -> List[ContentDifference]:
+    """
+    compares left and right (e.g. two DeepAnwendungshandbuch s) and returns the smallest subtrees that differ.
+    Subtrees with matching content hashes are skipped entirely. Neither left nor right are modified.
+    left and right may also be content hash trees that have been built before (they are not hashed again then).
+    :return: an empty list if both objects have equal content, the differing subtrees otherwise
+    """
+    return _diff_nodes(_get_content_hash_tree(left), _get_content_hash_tree(right), [])
@@ -5,16 +5,125 @@ A MAUS Provider is a class that returns MAUS s' from what ever data source the i
 The MAUS provider is supposed to be used with dependency injection.
 """
 
+import bz2
+import gzip
 import json
+import lzma
+import os
+import re
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
-from pathlib import Path
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path, PurePath, PurePosixPath
+from typing import IO, Any, Callable, Collection, Dict, Iterable, List, Optional, Set, Tuple
 
-from maus.edifact import EdifactFormat, EdifactFormatVersion
+import attrs
+
+from maus.edifact import EdifactFormat, EdifactFormatVersion, get_format_of_pruefidentifikator
 from maus.models.anwendungshandbuch import DeepAnwendungshandbuch, DeepAnwendungshandbuchSchema
 
 # pylint:disable=too-few-public-methods
 
+MausKey = Tuple[EdifactFormat, EdifactFormatVersion, str]
+"""
+identifies a MAUS: (edifact format, edifact format version, pruefidentifikator)
+"""
+
+
+class MausProviderEventKind(str, Enum):
+    """
+    The kind of things that happen inside a MausProvider and that are reported to its metrics callback.
+    """
+
+    LOADED = "LOADED"  #: the MAUS has been read from its source (timings and maus are set)
+    NOT_FOUND = "NOT_FOUND"  #: the source does not contain the requested MAUS
+    CACHE_HIT = "CACHE_HIT"  #: the MAUS (or a cached miss) has been returned from the cache
+    CACHE_MISS = "CACHE_MISS"  #: the MAUS was not cached and has been loaded from the wrapped provider
+    EVICTED = "EVICTED"  #: the MAUS has been removed from the cache (eviction_reason is set)
+
+
+@attrs.define(kw_only=True, frozen=True)
+class LoadTimings:
+    """
+    The time (in seconds) that the single steps of loading a MAUS from a JSON file took
+    """
+
+    file_read_seconds: float  #: reading (and decoding) the file content
+    json_parse_seconds: float  #: parsing the JSON string into dictionaries
+    schema_load_seconds: float  #: deserializing the dictionaries into a DeepAnwendungshandbuch
+
+    @property
+    def total_seconds(self) -> float:
+        """
+        the time all steps took together
+        """
+        return self.file_read_seconds + self.json_parse_seconds + self.schema_load_seconds
+
+
+@attrs.define(kw_only=True, frozen=True)
+class MausProviderEvent:
+    """
+    Something that happened inside a MausProvider, e.g. a cache hit or a MAUS that has been loaded.
+    The events are passed to the metrics_callback of the provider (see :class:`maus.metrics.MausMetricsRegistry`).
+    """
+
+    kind: MausProviderEventKind
+    key: MausKey
+    timings: Optional[LoadTimings] = None  #: the split load latency (LOADED events of file based providers)
+    load_seconds: Optional[float] = None  #: the time it took the wrapped provider to load the MAUS (CACHE_MISS)
+    maus: Optional[DeepAnwendungshandbuch] = attrs.field(default=None, repr=False)  #: the loaded MAUS (if any)
+    size: Optional[int] = None  #: the estimated memory size of the MAUS in bytes, if it is known anyway
+    eviction_reason: Optional[str] = None  #: e.g. 'max_entries', 'max_memory_bytes', 'expired' (EVICTED)
+
+
+MausProviderMetricsCallback = Callable[[MausProviderEvent], None]
+"""
+Receives the events of a MausProvider. It is called synchronously (partly while internal locks are held), so it must
+be fast, must not raise and must not call the provider itself.
+"""
+
+_pruefi_in_file_name_pattern = re.compile(r"(?<!\d)[1-9]\d{4}(?!\d)")
+
+_compressed_file_openers: Dict[str, Callable[..., IO[str]]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+"""
+maps the suffix of compressed MAUS files (e.g. '11042_maus.json.gz') to the function that opens them as text stream
+"""
+
+
+def _get_maus_keys_from_paths(
+    relative_paths: Iterable[PurePath],
+    to_path: Callable[[EdifactFormat, EdifactFormatVersion, str], Path],
+    edifact_format_version: Optional[EdifactFormatVersion],
+) -> List[MausKey]:
+    """
+    returns the keys of those paths whose file name contains a pruefidentifikator and that are returned by to_path for
+    the respective format, (any or the given) format version and pruefidentifikator; sorted by path.
+    """
+    format_versions = [edifact_format_version] if edifact_format_version is not None else list(EdifactFormatVersion)
+    result: List[MausKey] = []
+    for relative_path in sorted(relative_paths, key=lambda path: path.as_posix()):
+        pruefi_match = _pruefi_in_file_name_pattern.search(relative_path.name)
+        if pruefi_match is None:
+            continue
+        pruefidentifikator = pruefi_match.group()
+        try:
+            edifact_format = get_format_of_pruefidentifikator(pruefidentifikator)
+        except ValueError:
+            continue
+        for format_version in format_versions:
+            expected_path = to_path(edifact_format, format_version, pruefidentifikator)
+            if PurePosixPath(expected_path.as_posix()) == PurePosixPath(relative_path.as_posix()):
+                result.append((edifact_format, format_version, pruefidentifikator))
+    return result
+
 
 class MausProvider(ABC):
     """
@@ -36,12 +145,26 @@ class FileBasedMausProvider(MausProvider):
     A MAUS provider that uses the file system to retrieve MAUS s.
     """
 
-    def __init__(self, base_path: Path, encoding: str = "utf-8"):
+    def __init__(
+        self,
+        base_path: Path,
+        encoding: str = "utf-8",
+        use_directory_index: bool = False,
+        metrics_callback: Optional[MausProviderMetricsCallback] = None,
+    ):
         """
         initialize by providing a base path relative to which the MAUS s can be found.
+        :param use_directory_index: if true, the base_path is scanned once (on first access) and requests for MAUS s
+        that are not in the index are answered without touching the file system. Call :meth:`refresh_directory_index`
+        after adding or removing files.
+        :param metrics_callback: if given, it receives a LOADED (with the split load latency) or NOT_FOUND event for
+        every request
         """
         self.base_path: Path = base_path
         self._encoding = encoding
+        self.use_directory_index: bool = use_directory_index
+        self._directory_index: Optional[Dict[MausKey, Path]] = None
+        self.metrics_callback: Optional[MausProviderMetricsCallback] = metrics_callback
 
     @abstractmethod
     def to_path(
@@ -52,15 +175,515 @@ class FileBasedMausProvider(MausProvider):
         """
         raise NotImplementedError("Has to be implemented in inheriting class")
 
+    def _scan_base_path(self, edifact_format_version: Optional[EdifactFormatVersion]) -> Dict[MausKey, Path]:
+        """
+        returns the full paths of all MAUS files below the base_path (compressed ones included)
+        """
+        # maps the relative path without compression suffix to the actual full path
+        full_paths: Dict[PurePosixPath, Path] = {}
+        for file_path in Path(self.base_path).rglob("*"):
+            if _pruefi_in_file_name_pattern.search(file_path.name) is None or not file_path.is_file():
+                continue
+            relative_path = PurePosixPath(file_path.relative_to(self.base_path).as_posix())
+            if relative_path.suffix in _compressed_file_openers:
+                # a plain file takes precedence over its compressed variants (just like in load_maus_file)
+                full_paths.setdefault(relative_path.with_suffix(""), file_path)
+            else:
+                full_paths[relative_path] = file_path
+        return {
+            key: full_paths[PurePosixPath(self.to_path(*key).as_posix())]
+            for key in _get_maus_keys_from_paths(full_paths.keys(), self.to_path, edifact_format_version)
+        }
+
+    def get_available_maus(self, edifact_format_version: Optional[EdifactFormatVersion] = None) -> List[MausKey]:
+        """
+        scans the base_path for MAUS files. A file is considered a MAUS if its name contains a pruefidentifikator and
+        to_path returns the path of the file for the respective format, format version and pruefidentifikator.
+        If the directory index is used, the (cached) index is returned instead of scanning the directory again.
+        :param edifact_format_version: if given, only MAUS s of this format version are returned
+        :return: the keys of all MAUS s that are available below the base_path
+        """
+        if not self.use_directory_index:
+            return list(self._scan_base_path(edifact_format_version).keys())
+        return [
+            key
+            for key in self._get_directory_index()
+            if edifact_format_version is None or key[1] == edifact_format_version
+        ]
+
+    def _get_directory_index(self) -> Dict[MausKey, Path]:
+        if self._directory_index is None:
+            self.refresh_directory_index()
+        assert self._directory_index is not None
+        return self._directory_index
+
+    def refresh_directory_index(self) -> None:
+        """
+        (re-)scans the base_path and rebuilds the directory index
+        """
+        self._directory_index = self._scan_base_path(None)
+
+    def _get_path(self, key: MausKey) -> Optional[Path]:
+        """
+        returns the full path from the directory index or (without index) the full path of the plain file
+        """
+        if self.use_directory_index:
+            return self._get_directory_index().get(key)
+        return Path(self.base_path) / self.to_path(*key)
+
+    def get_full_path(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[Path]:
+        """
+        returns the full path of the respective maus file. If only a compressed variant of the file exists (e.g.
+        '11042_maus.json.gz' instead of '11042_maus.json'), the path of the compressed file is returned.
+        :return: None if the directory index is used and the maus is not part of it; otherwise the path (even if the
+        file does not exist)
+        """
+        full_path = self._get_path((edifact_format, edifact_format_version, pruefidentifikator))
+        if full_path is None or self.use_directory_index or full_path.exists():
+            return full_path
+        for compression_suffix in _compressed_file_openers:
+            compressed_path = full_path.with_name(full_path.name + compression_suffix)
+            if compressed_path.exists():
+                return compressed_path
+        return full_path
+
     def get_maus(
         self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
     ) -> Optional[DeepAnwendungshandbuch]:
-        relative_path = self.to_path(edifact_format, edifact_format_version, pruefidentifikator)
-        full_path: Path = self.base_path / relative_path
+        # load_maus_file looks for compressed variants itself (only if the plain file does not exist)
+        full_path = self._get_path((edifact_format, edifact_format_version, pruefidentifikator))
+        if self.metrics_callback is None:
+            if full_path is None:
+                return None
+            return load_maus_file(full_path, self._encoding)
+        key: MausKey = (edifact_format, edifact_format_version, pruefidentifikator)
+        timed_result = _load_maus_file_timed(full_path, self._encoding) if full_path is not None else None
+        if timed_result is None:
+            self.metrics_callback(MausProviderEvent(kind=MausProviderEventKind.NOT_FOUND, key=key))
+            return None
+        maus, timings = timed_result
+        self.metrics_callback(MausProviderEvent(kind=MausProviderEventKind.LOADED, key=key, timings=timings, maus=maus))
+        return maus
+
+
+def _open_maus_file(full_path: Path, encoding: str) -> IO[str]:
+    """
+    opens the MAUS file as text stream; compressed files (.gz, .bz2, .xz) are decompressed while being read.
+    If full_path does not exist, its compressed variants (full_path + '.gz' etc.) are tried.
+    :raises FileNotFoundError: if neither full_path nor one of its compressed variants exists
+    """
+    full_path = Path(full_path)  # callers may pass other path-like objects (e.g. py.path.local)
+    opener = _compressed_file_openers.get(full_path.suffix)
+    if opener is not None:
+        return opener(full_path, "rt", encoding=encoding)
+    try:
+        return open(full_path, "r", encoding=encoding)  # pylint:disable=consider-using-with
+    except FileNotFoundError:
+        for compression_suffix, compressed_file_opener in _compressed_file_openers.items():
+            try:
+                return compressed_file_opener(
+                    full_path.with_name(full_path.name + compression_suffix), "rt", encoding=encoding
+                )
+            except FileNotFoundError:
+                continue
+        raise
+
+
+def load_maus_file(full_path: Path, encoding: str = "utf-8") -> Optional[DeepAnwendungshandbuch]:
+    """
+    reads and deserializes the MAUS from the given JSON file.
+    If the file does not exist, a compressed variant of it (full_path + '.gz', '.bz2' or '.xz') is read instead.
+    Compressed files are decompressed while they are read (no temporary file, no copy of the compressed content in
+    memory); the JSON parser of the standard library still needs the entire decompressed text.
+    This is a module level function, so that it can also be run in a process pool.
+    :return: None if the file does not exist
+    """
+    try:
+        with _open_maus_file(full_path, encoding) as maus_infile:
+            file_content_json = json.load(maus_infile)
+            maus = DeepAnwendungshandbuchSchema().load(file_content_json)
+    except FileNotFoundError:
+        return None
+    return maus
+
+
+def _load_maus_file_timed(full_path: Path, encoding: str) -> Optional[Tuple[DeepAnwendungshandbuch, LoadTimings]]:
+    """
+    does the same as load_maus_file but measures the single steps separately.
+    The file content is read into one string before it is parsed, so that reading and parsing can be timed separately;
+    json.load (used by load_maus_file) reads the entire content into one string, too.
+    :return: None if the file does not exist
+    """
+    start = time.perf_counter()
+    try:
+        with _open_maus_file(full_path, encoding) as maus_infile:
+            file_content = maus_infile.read()  # includes the decompression (if any)
+    except FileNotFoundError:
+        return None
+    read_done = time.perf_counter()
+    file_content_json = json.loads(file_content)
+    parse_done = time.perf_counter()
+    maus = DeepAnwendungshandbuchSchema().load(file_content_json)
+    timings = LoadTimings(
+        file_read_seconds=read_done - start,
+        json_parse_seconds=parse_done - read_done,
+        schema_load_seconds=time.perf_counter() - parse_done,
+    )
+    return maus, timings
+
+
+def estimate_memory_size(obj: Any) -> int:
+    """
+    Estimates the memory (in bytes) used by the given object (e.g. a DeepAnwendungshandbuch) and all objects it
+    references (attrs attributes, lists, dicts). Objects that are referenced multiple times (e.g. interned strings) are
+    only counted once.
+    """
+    seen: Set[int] = set()
+    result = 0
+    objects_to_visit = [obj]
+    while objects_to_visit:
+        current = objects_to_visit.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        result += sys.getsizeof(current)
+        if attrs.has(current.__class__):
+            objects_to_visit.extend(getattr(current, field.name) for field in attrs.fields(current.__class__))
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            objects_to_visit.extend(current)
+        elif isinstance(current, dict):
+            objects_to_visit.extend(current.keys())
+            objects_to_visit.extend(current.values())
+    return result
+
+
+@attrs.define(kw_only=True)
+class PreloadReport:
+    """
+    A summary of :meth:`CachingMausProvider.preload`
+    """
+
+    load_times: Dict[MausKey, float] = attrs.field(factory=dict)  #: the time (in seconds) it took to load each MAUS
+    memory_sizes: Dict[MausKey, int] = attrs.field(factory=dict)  #: the estimated memory size (in bytes) of each MAUS
+    errors: Dict[MausKey, str] = attrs.field(factory=dict)  #: the errors of MAUS s that could not be loaded
+    total_seconds: float = 0  #: the wall clock time of the entire preload
+
+    @property
+    def total_memory_bytes(self) -> int:
+        """
+        the estimated memory size of all preloaded MAUS s in bytes
+        """
+        return sum(self.memory_sizes.values())
+
+
+def _timed_get_maus(provider: MausProvider, key: MausKey) -> Tuple[Optional[DeepAnwendungshandbuch], float]:
+    """
+    returns the MAUS and the time (in seconds) it took to load it. Module level function to support process pools.
+    """
+    start = time.perf_counter()
+    maus = provider.get_maus(*key)
+    return maus, time.perf_counter() - start
+
+
+@attrs.define(kw_only=True)
+class _CacheEntry:
+    maus: Optional[DeepAnwendungshandbuch]  #: the cached MAUS; None if the wrapped provider didn't find it
+    created_at: float  #: the (monotonic) time at which the MAUS has been loaded
+    size: int  #: the estimated memory size of the MAUS in bytes
+    file_signature: Optional[Tuple[int, int]]  #: (mtime in ns, size) of the underlying file if it exists
+    file_checked_at: float  #: the (monotonic) time at which the file_signature has been checked the last time
+
+
+class CachingMausProvider(MausProvider):  # pylint:disable=too-many-instance-attributes
+    """
+    A MausProvider that wraps another MausProvider and caches the MAUS s it returns (including misses/None).
+    Entries are evicted in least-recently-used order as soon as the maximum number of entries or the memory budget
+    is exceeded. They expire after the (optional) time to live. If the wrapped provider is a FileBasedMausProvider,
+    entries are also invalidated if the modification time or size of the underlying file changes. The file is checked
+    at most once per file_check_interval_seconds, so that (nearly) all cache hits are served without a system call.
+    The provider is thread-safe; concurrent requests for the same MAUS only load it once.
+
+    Be aware that all callers share the same cached instances. Do not modify them (e.g. using
+    replace_inputs_based_on_discriminator) but use a :class:`maus.models.overlay.DeepAnwendungshandbuchOverlay`.
+    """
+
+    # pylint:disable=too-many-arguments
+    def __init__(
+        self,
+        provider: MausProvider,
+        max_entries: Optional[int] = 128,
+        max_memory_bytes: Optional[int] = None,
+        time_to_live_seconds: Optional[float] = None,
+        size_estimator: Callable[[Optional[DeepAnwendungshandbuch]], int] = estimate_memory_size,
+        clock: Callable[[], float] = time.monotonic,
+        metrics_callback: Optional[MausProviderMetricsCallback] = None,
+        file_check_interval_seconds: Optional[float] = 1,
+    ):
+        """
+        :param provider: the provider that actually loads the MAUS s
+        :param max_entries: the maximum number of cached MAUS s (None for no limit)
+        :param max_memory_bytes: the maximum estimated memory of all cached MAUS s (None for no limit)
+        :param time_to_live_seconds: the time after which cached entries expire (None for never)
+        :param size_estimator: estimates the memory size of a MAUS (only used if max_memory_bytes is set and for the
+        report of preload)
+        :param clock: returns the current time in seconds (the default should be fine outside of tests)
+        :param metrics_callback: if given, it receives the CACHE_HIT, CACHE_MISS and EVICTED events of this cache
+        (pass the same callback to the wrapped provider to get its events, too)
+        :param file_check_interval_seconds: the minimum time between two checks of the modification time and size of
+        the file of a cached MAUS (only for FileBasedMausProviders); a change of the file is noticed with this delay.
+        0 checks the file on every request, None never checks it.
+        """
+        self.provider: MausProvider = provider
+        self.max_entries: Optional[int] = max_entries
+        self.max_memory_bytes: Optional[int] = max_memory_bytes
+        self.time_to_live_seconds: Optional[float] = time_to_live_seconds
+        self._size_estimator = size_estimator
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[MausKey, _CacheEntry]" = OrderedDict()
+        self._loading: Dict[MausKey, "Future[Optional[DeepAnwendungshandbuch]]"] = {}
+        self._total_size: int = 0
+        self.metrics_callback: Optional[MausProviderMetricsCallback] = metrics_callback
+        self.file_check_interval_seconds: Optional[float] = file_check_interval_seconds
+
+    def _are_files_checked(self) -> bool:
+        return self.file_check_interval_seconds is not None and isinstance(self.provider, FileBasedMausProvider)
+
+    def _is_file_check_due(self, entry: Optional[_CacheEntry]) -> bool:
+        """
+        returns true if the file of the (cached) entry has to be checked now
+        """
+        if entry is None or not self._are_files_checked():
+            return False
+        assert self.file_check_interval_seconds is not None
+        return self._clock() - entry.file_checked_at >= self.file_check_interval_seconds
+
+    def _get_file_signature(self, key: MausKey) -> Optional[Tuple[int, int]]:
+        """
+        returns the modification time and size of the file of the MAUS; None if the files are not checked at all
+        """
+        if not self._are_files_checked():
+            return None
+        assert isinstance(self.provider, FileBasedMausProvider)
+        full_path = self.provider.get_full_path(*key)
+        if full_path is None:
+            return None
         try:
-            with open(full_path, "r", encoding=self._encoding) as maus_infile:
-                file_content_json = json.load(maus_infile)
-                maus = DeepAnwendungshandbuchSchema().load(file_content_json)
+            stat_result = os.stat(full_path)
         except FileNotFoundError:
             return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def _get_invalidity_reason(self, entry: _CacheEntry, file_signature: Optional[Tuple[int, int]]) -> Optional[str]:
+        """
+        returns why the entry is no longer valid (None if it is still valid)
+        """
+        if self.time_to_live_seconds is not None and self._clock() - entry.created_at > self.time_to_live_seconds:
+            return "expired"
+        if entry.file_signature != file_signature:
+            return "modified"
+        return None
+
+    def get_maus(  # pylint:disable=too-many-locals
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[DeepAnwendungshandbuch]:
+        key: MausKey = (edifact_format, edifact_format_version, pruefidentifikator)
+        # the file is checked outside the lock; at worst, a concurrent request checks it once more
+        is_file_checked = self._is_file_check_due(self._entries.get(key))
+        file_signature = self._get_file_signature(key) if is_file_checked else None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                invalidity_reason = self._get_invalidity_reason(
+                    entry, file_signature if is_file_checked else entry.file_signature
+                )
+                if invalidity_reason is None:
+                    if is_file_checked:
+                        entry.file_checked_at = self._clock()
+                    self._entries.move_to_end(key)
+                    if self.metrics_callback is not None:
+                        self.metrics_callback(
+                            MausProviderEvent(kind=MausProviderEventKind.CACHE_HIT, key=key, maus=entry.maus)
+                        )
+                    return entry.maus
+                self._remove(key, invalidity_reason)
+            future = self._loading.get(key)
+            is_loading_thread = future is None
+            if future is None:
+                future = Future()
+                self._loading[key] = future
+        if not is_loading_thread:
+            # another thread is already loading the same MAUS; wait for its result instead of loading it again
+            maus = future.result()
+            if self.metrics_callback is not None:
+                self.metrics_callback(MausProviderEvent(kind=MausProviderEventKind.CACHE_HIT, key=key, maus=maus))
+            return maus
+        if not is_file_checked:
+            file_signature = self._get_file_signature(key)
+        load_start = time.perf_counter()
+        try:
+            maus = self.provider.get_maus(edifact_format, edifact_format_version, pruefidentifikator)
+            size = self._get_entry_size(maus)
+        except BaseException as loading_error:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(loading_error)
+            raise
+        load_seconds = time.perf_counter() - load_start
+        with self._lock:
+            self._store(key, maus, size, file_signature)
+            del self._loading[key]
+        future.set_result(maus)
+        if self.metrics_callback is not None:
+            self.metrics_callback(
+                MausProviderEvent(
+                    kind=MausProviderEventKind.CACHE_MISS,
+                    key=key,
+                    load_seconds=load_seconds,
+                    maus=maus,
+                    size=size if self.max_memory_bytes is not None else None,
+                )
+            )
         return maus
+
+    def _get_entry_size(self, maus: Optional[DeepAnwendungshandbuch]) -> int:
+        """
+        returns the size that is accounted for the maus in the cache (0 if there is no memory budget)
+        """
+        if self.max_memory_bytes is None or maus is None:
+            return 0
+        return self._size_estimator(maus)
+
+    def _store(
+        self, key: MausKey, maus: Optional[DeepAnwendungshandbuch], size: int, file_signature: Optional[Tuple[int, int]]
+    ) -> None:
+        """
+        adds the maus to the cache; must be called while holding the lock
+        """
+        if key in self._entries:
+            self._remove(key)
+        now = self._clock()
+        self._entries[key] = _CacheEntry(
+            maus=maus, created_at=now, size=size, file_signature=file_signature, file_checked_at=now
+        )
+        self._total_size += size
+        self._evict()
+
+    # pylint:disable=too-many-locals
+    def preload(
+        self,
+        edifact_format_version: EdifactFormatVersion,
+        formats: Optional[Collection[EdifactFormat]] = None,
+        pruefis: Optional[Collection[str]] = None,
+        executor: Optional[Executor] = None,
+    ) -> PreloadReport:
+        """
+        Loads all MAUS s of the given format version that are available in the wrapped (file based) provider into the
+        cache. The MAUS s are loaded in parallel, so that the first requests after e.g. a deployment do not have to
+        pay the load latency. Make sure that max_entries and max_memory_bytes are large enough to hold all of them.
+        :param formats: if given, only MAUS s of these formats are loaded
+        :param pruefis: if given, only MAUS s with these pruefidentifikators are loaded
+        :param executor: the executor that loads the MAUS s; defaults to a ThreadPoolExecutor. A ProcessPoolExecutor
+        bypasses the GIL (JSON parsing and deserialization are CPU bound) but requires a picklable provider.
+        :return: a report with the load time and memory size of every MAUS
+        :raises TypeError: if the wrapped provider is no FileBasedMausProvider (only those can list their MAUS s)
+        """
+        if not isinstance(self.provider, FileBasedMausProvider):
+            raise TypeError(
+                f"Preloading requires the wrapped provider to be a FileBasedMausProvider (which can list the available "
+                f"MAUS s) but it is a {self.provider.__class__.__name__}"
+            )
+        keys = [
+            key
+            for key in self.provider.get_available_maus(edifact_format_version)
+            if (formats is None or key[0] in formats) and (pruefis is None or key[2] in pruefis)
+        ]
+        report = PreloadReport()
+        start = time.perf_counter()
+        own_executor = executor is None
+        used_executor: Executor = executor if executor is not None else ThreadPoolExecutor()
+        try:
+            futures = {
+                key: (self._get_file_signature(key), used_executor.submit(_timed_get_maus, self.provider, key))
+                for key in keys
+            }
+            for key, (file_signature, future) in futures.items():
+                try:
+                    maus, load_seconds = future.result()
+                except Exception as loading_error:  # pylint:disable=broad-exception-caught
+                    report.errors[key] = repr(loading_error)
+                    continue
+                entry_size = self._get_entry_size(maus)
+                report.load_times[key] = load_seconds
+                report.memory_sizes[key] = (
+                    entry_size if self.max_memory_bytes is not None else self._size_estimator(maus)
+                )
+                with self._lock:
+                    self._store(key, maus, entry_size, file_signature)
+        finally:
+            if own_executor:
+                used_executor.shutdown()
+        report.total_seconds = time.perf_counter() - start
+        return report
+
+    def _remove(self, key: MausKey, eviction_reason: Optional[str] = None) -> None:
+        """
+        removes the entry from the cache; must be called while holding the lock
+        :param eviction_reason: if given, an EVICTED event is reported
+        """
+        entry = self._entries.pop(key)
+        self._total_size -= entry.size
+        if eviction_reason is not None and self.metrics_callback is not None:
+            self.metrics_callback(
+                MausProviderEvent(
+                    kind=MausProviderEventKind.EVICTED,
+                    key=key,
+                    size=entry.size if self.max_memory_bytes is not None else None,
+                    eviction_reason=eviction_reason,
+                )
+            )
+
+    def _evict(self) -> None:
+        while self._entries:
+            if self.max_entries is not None and len(self._entries) > self.max_entries:
+                eviction_reason = "max_entries"
+            elif self.max_memory_bytes is not None and self._total_size > self.max_memory_bytes:
+                eviction_reason = "max_memory_bytes"
+            else:
+                break
+            least_recently_used_key = next(iter(self._entries))
+            self._remove(least_recently_used_key, eviction_reason)
+
+    def invalidate(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> None:
+        """
+        removes the respective MAUS from the cache (if it is cached)
+        """
+        with self._lock:
+            key: MausKey = (edifact_format, edifact_format_version, pruefidentifikator)
+            if key in self._entries:
+                self._remove(key, "invalidated")
+
+    def clear(self) -> None:
+        """
+        removes all MAUS s from the cache
+        """
+        with self._lock:
+            self._entries.clear()
+            self._total_size = 0
+
+    def __len__(self) -> int:
+        """
+        returns the number of cached entries (including cached misses)
+        """
+        return len(self._entries)
+
+    @property
+    def total_size(self) -> int:
+        """
+        the estimated memory size of all cached MAUS s in bytes (only tracked if max_memory_bytes is set)
+        """
+        return self._total_size
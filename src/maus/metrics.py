@@ -0,0 +1,172 @@
+"""
+This module contains a simple in-process collector for the events that MausProviders report to their metrics_callback.
+It aggregates cache hits/misses per MAUS, load latency histograms (split into file read, JSON parse and schema load),
+the memory sizes of the loaded MAUS s and the cache evictions. Export the numbers to your monitoring system of choice
+or register further listeners that receive the raw events.
+"""
+
+import bisect
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import attrs
+
+from maus.maus_provider import (
+    MausKey,
+    MausProviderEvent,
+    MausProviderEventKind,
+    MausProviderMetricsCallback,
+    estimate_memory_size,
+)
+
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+"""
+the default upper bounds (in seconds) of the latency histogram buckets
+"""
+
+
+@attrs.define(kw_only=True)
+class Histogram:
+    """
+    A histogram with fixed buckets. bucket_counts[i] is the number of observed values v with
+    bucket_bounds[i-1] < v <= bucket_bounds[i]; the last bucket counts the values above the largest bound.
+    """
+
+    bucket_bounds: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS  #: the (sorted) upper bounds of the buckets
+    bucket_counts: List[int] = attrs.field(
+        default=attrs.Factory(lambda self: [0] * (len(self.bucket_bounds) + 1), takes_self=True)
+    )
+    count: int = 0  #: the number of observed values
+    total: float = 0  #: the sum of all observed values
+
+    def observe(self, value: float) -> None:
+        """
+        adds the value to the histogram
+        """
+        self.bucket_counts[bisect.bisect_left(self.bucket_bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    @property
+    def mean(self) -> Optional[float]:
+        """
+        the mean of all observed values; None if there are none
+        """
+        return self.total / self.count if self.count else None
+
+
+class MausMetricsRegistry:  # pylint:disable=too-many-instance-attributes
+    """
+    Aggregates the events of one or more MausProviders. The registry itself is the callback; pass it as
+    metrics_callback to the providers, e.g.:
+
+    .. code-block:: python
+
+        metrics = MausMetricsRegistry()
+        file_based_provider = MyFileBasedMausProvider(base_path, metrics_callback=metrics)
+        provider = CachingMausProvider(file_based_provider, metrics_callback=metrics)
+
+    Read the aggregated numbers from the public attributes (while no provider is used concurrently) or use
+    :meth:`snapshot`.
+    """
+
+    def __init__(self, measure_object_sizes: bool = False, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        :param measure_object_sizes: if true, the memory size of every loaded MAUS is estimated (if the provider does
+        not know it anyway). This walks the entire object graph and is much more expensive than everything else here.
+        :param latency_buckets: the upper bounds (in seconds) of the latency histogram buckets
+        """
+        self.measure_object_sizes = measure_object_sizes
+        self._latency_buckets = tuple(sorted(latency_buckets))
+        self._lock = threading.Lock()
+        self._listeners: List[MausProviderMetricsCallback] = []
+        self.cache_hits: Counter = Counter()  #: number of cache hits per MausKey
+        self.cache_misses: Counter = Counter()  #: number of cache misses per MausKey
+        self.loads: Counter = Counter()  #: number of MAUS s loaded (from files) per MausKey
+        self.not_found: Counter = Counter()  #: number of requests for MAUS s that do not exist per MausKey
+        self.evictions: Counter = Counter()  #: number of evicted cache entries per eviction reason
+        self.object_sizes: Dict[MausKey, int] = {}  #: the (last known) memory size of each MAUS in bytes
+        self.latencies: Dict[str, Histogram] = {
+            # the split latency of LOADED events
+            "file_read": self._create_histogram(),
+            "json_parse": self._create_histogram(),
+            "schema_load": self._create_histogram(),
+            "load": self._create_histogram(),  # the sum of the three above
+            "cache_miss": self._create_histogram(),  # the time it took a cache to load a MAUS it didn't have
+        }
+
+    def _create_histogram(self) -> Histogram:
+        return Histogram(bucket_bounds=self._latency_buckets)
+
+    def add_listener(self, listener: MausProviderMetricsCallback) -> None:
+        """
+        registers a callback that receives every (raw) event after it has been aggregated
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: MausProviderMetricsCallback) -> None:
+        """
+        removes a callback that has been added using :meth:`add_listener`
+        """
+        self._listeners.remove(listener)
+
+    def __call__(self, event: MausProviderEvent) -> None:
+        """
+        aggregates the given event (this is the metrics_callback that is passed to the providers)
+        """
+        size = event.size
+        if size is None and self.measure_object_sizes and event.maus is not None:
+            if event.kind in (MausProviderEventKind.LOADED, MausProviderEventKind.CACHE_MISS):
+                size = estimate_memory_size(event.maus)
+        with self._lock:
+            if event.kind == MausProviderEventKind.CACHE_HIT:
+                self.cache_hits[event.key] += 1
+            elif event.kind == MausProviderEventKind.CACHE_MISS:
+                self.cache_misses[event.key] += 1
+                if event.load_seconds is not None:
+                    self.latencies["cache_miss"].observe(event.load_seconds)
+            elif event.kind == MausProviderEventKind.LOADED:
+                self.loads[event.key] += 1
+                if event.timings is not None:
+                    self.latencies["file_read"].observe(event.timings.file_read_seconds)
+                    self.latencies["json_parse"].observe(event.timings.json_parse_seconds)
+                    self.latencies["schema_load"].observe(event.timings.schema_load_seconds)
+                    self.latencies["load"].observe(event.timings.total_seconds)
+            elif event.kind == MausProviderEventKind.NOT_FOUND:
+                self.not_found[event.key] += 1
+            elif event.kind == MausProviderEventKind.EVICTED:
+                self.evictions[event.eviction_reason] += 1
+            if size is not None and event.kind != MausProviderEventKind.EVICTED:
+                self.object_sizes[event.key] = size
+        for listener in self._listeners:
+            listener(event)
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        returns a consistent copy of the aggregated numbers
+        """
+        with self._lock:
+            return {
+                "cache_hits": dict(self.cache_hits),
+                "cache_misses": dict(self.cache_misses),
+                "loads": dict(self.loads),
+                "not_found": dict(self.not_found),
+                "evictions": dict(self.evictions),
+                "object_sizes": dict(self.object_sizes),
+                "latencies": {
+                    name: attrs.evolve(histogram, bucket_counts=list(histogram.bucket_counts))
+                    for name, histogram in self.latencies.items()
+                },
+            }
+
+    def reset(self) -> None:
+        """
+        sets all numbers back to zero
+        """
+        with self._lock:
+            for counter in (self.cache_hits, self.cache_misses, self.loads, self.not_found, self.evictions):
+                counter.clear()
+            self.object_sizes.clear()
+            for name in self.latencies:
+                self.latencies[name] = self._create_histogram()
@@ -3,6 +3,9 @@ models are the data classes used to store information from e.g. ahbs.
 This module contains methods available to all methods in the package.
 """
 
+import sys
+from typing import Any
+
 
 # pylint: disable=unused-argument
 def _check_that_string_is_not_whitespace_or_empty(instance, attribute, value):
@@ -13,3 +16,13 @@ def _check_that_string_is_not_whitespace_or_empty(instance, attribute, value):
         raise ValueError(f"The string {attribute.name} must not be None or empty")
     if len(value.strip()) == 0:
         raise ValueError(f"The string {attribute.name} must not consist only of whitespace: '{value}'")
+
+
+def _intern_string(value: Any) -> Any:
+    """
+    A converter that interns strings, so that strings which occur many times in an AHB (e.g. "X", "Muss", "Soll [1]")
+    share a single instance in memory. Values that are no strings (e.g. None) are returned unchanged.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
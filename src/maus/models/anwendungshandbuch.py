@@ -7,7 +7,7 @@ structure.
 another segment group)
 """
 import re
-from typing import Callable, List, Optional, Sequence, Set
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
 from uuid import UUID
 
 import attr.validators
@@ -15,8 +15,9 @@ import attrs
 from marshmallow import Schema, fields, post_load  # type:ignore[import]
 from more_itertools import last, split_when
 
-from maus.models import _check_that_string_is_not_whitespace_or_empty
+from maus.models import _check_that_string_is_not_whitespace_or_empty, _intern_string
 from maus.models.edifact_components import (
+    DataElement,
     DataElementFreeText,
     DataElementValuePool,
     Segment,
@@ -40,17 +41,17 @@ class AhbLine:
     # because the combination (segment group, segment, data element, name) is not guaranteed to be unique
     # yes, it's actually that bad already
     segment_group_key: Optional[str] = attrs.field(
-        validator=attrs.validators.optional(validator=attrs.validators.instance_of(str))
+        validator=attrs.validators.optional(validator=attrs.validators.instance_of(str)), converter=_intern_string
     )
     """ the segment group, e.g. 'SG5' """
 
     segment_code: Optional[str] = attrs.field(
-        validator=attrs.validators.optional(validator=attrs.validators.instance_of(str))
+        validator=attrs.validators.optional(validator=attrs.validators.instance_of(str)), converter=_intern_string
     )
     """the segment, e.g. 'IDE'"""
 
     data_element: Optional[str] = attrs.field(
-        validator=attrs.validators.optional(validator=attrs.validators.instance_of(str))
+        validator=attrs.validators.optional(validator=attrs.validators.instance_of(str)), converter=_intern_string
     )
     """ the data element ID, e.g. '3224' """
 
@@ -63,11 +64,13 @@ class AhbLine:
     """
 
     value_pool_entry: Optional[str] = attrs.field(
-        validator=attrs.validators.optional(attrs.validators.instance_of(str))
+        validator=attrs.validators.optional(attrs.validators.instance_of(str)), converter=_intern_string
     )
     """ one of (possible multiple) allowed values, e.g. 'E01' or '293' """
 
-    name: Optional[str] = attrs.field(validator=attrs.validators.optional(validator=attrs.validators.instance_of(str)))
+    name: Optional[str] = attrs.field(
+        validator=attrs.validators.optional(validator=attrs.validators.instance_of(str)), converter=_intern_string
+    )
     """the name, e.g. 'Meldepunkt'. It can be both the description of a field but also its meaning"""
 
     # Check the unittest test_csv_file_reading_11042 to see the different values of name. It's not only the grey fields
@@ -79,7 +82,8 @@ class AhbLine:
             validator=attrs.validators.and_(
                 attrs.validators.instance_of(str), _check_that_string_is_not_whitespace_or_empty
             )
-        )
+        ),
+        converter=_intern_string,
     )
     """a requirement indicator + an optional condition ("ahb expression"), e.g. 'Muss [123] O [456]' """
     # note: to parse expressions from AHBs consider using AHBicht: https://github.com/Hochfrequenz/ahbicht/
@@ -91,7 +95,9 @@ class AhbLine:
     E.g. '[492] This is a condition text. [999] And this is another one.'
     """
     section_name: Optional[str] = attrs.field(
-        validator=attrs.validators.optional(validator=attrs.validators.instance_of(str)), default=None
+        validator=attrs.validators.optional(validator=attrs.validators.instance_of(str)),
+        default=None,
+        converter=_intern_string,
     )
     """
     The section name describes the purpose of a segment, e.g. "Nachrichten-Kopfsegment" or "Beginn der Nachricht"
@@ -298,6 +304,59 @@ def _check_that_line_has_either_none_az_segment_code(instance, attribute, value:
         raise ValueError(f"The segment_code '{value.segment_code}' does not match {_segment_code_pattern}")
 
 
+@attrs.frozen(kw_only=True)
+class FlatAhbLineIndex:
+    """
+    Indexes that are derived from the lines of a :class:`.FlatAnwendungshandbuch`.
+    They are built in a single pass over the lines and cached by the FlatAnwendungshandbuch.
+    """
+
+    segment_group_order: Dict[Optional[str], int]
+    """
+    maps the segment group keys (including None) to the position of their first occurrence among all segment groups
+    """
+    line_ranges_by_segment_group: Dict[Optional[str], List[Tuple[int, int]]]
+    """
+    maps the segment group keys to the (start, stop) index ranges of the consecutive lines that belong to the group
+    """
+    line_indexes_by_segment_code: Dict[Optional[str], List[int]]
+    """
+    maps the segment codes (including None) to the indexes of the lines with the respective segment code
+    """
+
+    @staticmethod
+    def from_lines(lines: Sequence[AhbLine]) -> "FlatAhbLineIndex":
+        """
+        builds the indexes from the given lines
+        """
+        segment_group_order: Dict[Optional[str], int] = {}
+        line_ranges: Dict[Optional[str], List[Tuple[int, int]]] = {}
+        line_indexes_by_segment_code: Dict[Optional[str], List[int]] = {}
+        range_start = 0
+        for line_index, line in enumerate(lines):
+            segment_group_order.setdefault(line.segment_group_key, len(segment_group_order))
+            line_indexes_by_segment_code.setdefault(line.segment_code, []).append(line_index)
+            if line_index > 0 and lines[line_index - 1].segment_group_key != line.segment_group_key:
+                line_ranges.setdefault(lines[range_start].segment_group_key, []).append((range_start, line_index))
+                range_start = line_index
+        if len(lines) > 0:
+            line_ranges.setdefault(lines[range_start].segment_group_key, []).append((range_start, len(lines)))
+        return FlatAhbLineIndex(
+            segment_group_order=segment_group_order,
+            line_ranges_by_segment_group=line_ranges,
+            line_indexes_by_segment_code=line_indexes_by_segment_code,
+        )
+
+
+# pylint:disable=unused-argument
+def _invalidate_line_index(instance: "FlatAnwendungshandbuch", attribute, value):
+    """
+    an on_setattr hook that drops the cached line index whenever the lines are replaced
+    """
+    instance.invalidate_line_index()
+    return value
+
+
 @attrs.define(auto_attribs=True, kw_only=True)
 class FlatAnwendungshandbuch:
     """
@@ -310,6 +369,7 @@ class FlatAnwendungshandbuch:
     """information about this AHB"""
 
     lines: List[AhbLine] = attrs.field(
+        on_setattr=attrs.setters.pipe(attrs.setters.validate, _invalidate_line_index),
         validator=attrs.validators.deep_iterable(
             member_validator=attrs.validators.and_(
                 attrs.validators.instance_of(AhbLine),
@@ -324,14 +384,61 @@ class FlatAnwendungshandbuch:
                 attrs.validators.instance_of(list),
                 _check_that_nearly_all_lines_have_a_segment_group,
             ),
-        )
+        ),
     )  #: ordered list lines as they occur in the AHB
 
+    _line_index: Optional[FlatAhbLineIndex] = attrs.field(init=False, default=None, eq=False, repr=False)
+    """
+    lazily built derived indexes of the lines; they're rebuilt if the lines are replaced or their number changes.
+    If you replace single lines in place, call :meth:`invalidate_line_index`.
+    """
+    _indexed_lines_length: int = attrs.field(init=False, default=0, eq=False, repr=False)
+
+    def get_line_index(self) -> FlatAhbLineIndex:
+        """
+        returns the (cached) derived indexes of the lines of this AHB
+        """
+        if self._line_index is None or self._indexed_lines_length != len(self.lines):
+            self._line_index = FlatAhbLineIndex.from_lines(self.lines)
+            self._indexed_lines_length = len(self.lines)
+        return self._line_index
+
+    def invalidate_line_index(self) -> None:
+        """
+        drops the cached line index; it will be rebuilt on next access
+        """
+        self._line_index = None
+
     def get_segment_groups(self) -> List[Optional[str]]:
         """
         :return: a set with all segment groups in this AHB in the order in which they occur
         """
-        return FlatAnwendungshandbuch._get_available_segment_groups(self.lines)
+        return list(self.get_line_index().segment_group_order)
+
+    def get_lines_by_segment_group(self, segment_group_key: Optional[str]) -> List[AhbLine]:
+        """
+        :return: all lines of the given segment group (None for lines without segment group) in their original order
+        """
+        return [
+            line
+            for start, stop in self.get_line_index().line_ranges_by_segment_group.get(segment_group_key, [])
+            for line in self.lines[start:stop]
+        ]
+
+    def get_lines_by_segment_code(self, segment_code: Optional[str]) -> List[AhbLine]:
+        """
+        :return: all lines with the given segment code (e.g. 'IDE') in their original order
+        """
+        return [self.lines[i] for i in self.get_line_index().line_indexes_by_segment_code.get(segment_code, [])]
+
+    def iter_lines_grouped_by_segment_group(self) -> Iterator[Tuple[Optional[str], List[AhbLine]]]:
+        """
+        yields (segment group key, lines of the group) in the order in which the segment groups occur. Other than a
+        groupby over the unsorted lines, every segment group is yielded exactly once, even if it is interrupted by
+        other segment groups.
+        """
+        for segment_group_key in self.get_line_index().segment_group_order:
+            yield segment_group_key, self.get_lines_by_segment_group(segment_group_key)
 
     @staticmethod
     def _get_available_segment_groups(lines: List[AhbLine]) -> List[Optional[str]]:
@@ -341,18 +448,18 @@ class FlatAnwendungshandbuch:
         :return: distinct segment groups, including None in the order in which they occur
         """
         # this code is in a static method to make it easily accessible for fine grained unit testing
-        result: List[Optional[str]] = []
-        for line in lines:
-            if line.segment_group_key not in result:
-                # an "in" check against a set would be faster but we want to preserve both order and readability
-                result.append(line.segment_group_key)
-        return result
+        # dicts preserve the insertion order, so the keys are both distinct and ordered
+        return list(dict.fromkeys(line.segment_group_key for line in lines))
 
     def sort_lines_by_segment_groups(self):
         """
         sorts lines by segment groups while preserving the order inside the groups and the order between the groups.
         """
-        self.lines = FlatAnwendungshandbuch._sorted_lines_by_segment_groups(self.lines, self.get_segment_groups())
+        sorted_lines = [line for _, group_lines in self.iter_lines_grouped_by_segment_group() for line in group_lines]
+        _check_that_nearly_all_lines_have_a_segment_group(self, None, sorted_lines)
+        # the single lines have already been validated; no need to run the (regex) validators for each line again
+        object.__setattr__(self, "lines", sorted_lines)
+        self.invalidate_line_index()
 
     @staticmethod
     def _sorted_lines_by_segment_groups(ahb_lines: Sequence[AhbLine], sg_order: List[Optional[str]]) -> List[AhbLine]:
@@ -387,9 +494,10 @@ class FlatAnwendungshandbuch:
         """
 
         # this code is in a static method to make it easily accessible for fine-grained unit testing
-        result: List[AhbLine] = sorted(ahb_lines, key=lambda x: x.segment_group_key or "")
-        result.sort(key=lambda ahb_line: sg_order.index(ahb_line.segment_group_key))
-        return result
+        sg_order_map: Dict[Optional[str], int] = {}
+        for position, segment_group_key in enumerate(sg_order):
+            sg_order_map.setdefault(segment_group_key, position)
+        return sorted(ahb_lines, key=lambda ahb_line: sg_order_map[ahb_line.segment_group_key])
 
 
 class FlatAnwendungshandbuchSchema(Schema):
@@ -427,6 +535,51 @@ class DeepAhbInputReplacement:
     """
 
 
+def _create_expression_ids(instance: "ExpressionRegistry") -> Dict[str, int]:
+    return {expression: expression_id for expression_id, expression in enumerate(instance.expressions)}
+
+
+@attrs.frozen(kw_only=True)
+class ExpressionRegistry:
+    """
+    Maps the distinct ahb expressions of a MAUS to integer IDs (and back).
+    The IDs are the positions of the expressions in the sorted list of distinct expressions. They are only valid for
+    the MAUS instance the registry has been created for: another MAUS (e.g. a new version of the same AHB) with only
+    one additional expression shifts all later IDs. Do not persist the IDs or share them between MAUS instances.
+    Consumers (e.g. AHBicht evaluation caches for a single MAUS) may key by ID instead of by expression string.
+    """
+
+    expressions: Tuple[str, ...] = attrs.field(
+        validator=attrs.validators.deep_iterable(
+            member_validator=attrs.validators.instance_of(str),
+            iterable_validator=attrs.validators.instance_of(tuple),
+        )
+    )  #: the distinct expressions; the index of an expression is its ID
+    _ids: Dict[str, int] = attrs.field(
+        init=False, default=attrs.Factory(_create_expression_ids, takes_self=True), eq=False, repr=False
+    )
+
+    def id_of(self, expression: str) -> int:
+        """
+        returns the ID of the given expression
+        :raises KeyError: if the expression is not registered
+        """
+        return self._ids[expression]
+
+    def expression_of(self, expression_id: int) -> str:
+        """
+        returns the expression with the given ID
+        :raises IndexError: if there is no expression with the given ID
+        """
+        return self.expressions[expression_id]
+
+    def __contains__(self, expression: object) -> bool:
+        return expression in self._ids
+
+    def __len__(self) -> int:
+        return len(self.expressions)
+
+
 @attrs.define(auto_attribs=True, kw_only=True)
 class DeepAnwendungshandbuch:
     """
@@ -443,6 +596,9 @@ class DeepAnwendungshandbuch:
         )
     )  #: the nested data
 
+    _expression_registry: Optional[ExpressionRegistry] = attrs.field(default=None, init=False, eq=False, repr=False)
+    """the registry created by the first call of :meth:`get_expression_registry`"""
+
     def reset_ahb_line_index(self) -> None:
         """
         reset the ahb line index for all lines in the DeepAnwendungshandbuch
@@ -451,37 +607,53 @@ class DeepAnwendungshandbuch:
         for line in self.lines:
             line.reset_ahb_line_index()
 
-    @staticmethod
-    def _query_segment_group(
-        segment_group: SegmentGroup, predicate: Callable[[SegmentGroup], bool]
-    ) -> List[SegmentGroup]:
+    def iter_segment_groups(self, predicate: Callable[[SegmentGroup], bool] = lambda _: True) -> Iterator[SegmentGroup]:
         """
-        recursively search for a segment group that matches the predicate
-        :return: return empty list if nothing was found, the matching segment groups otherwise
+        recursively iterate over all segment groups in this ahb and yield those that meet the predicate. Every segment
+        group is visited exactly once. The order is: for every line, first its sub groups (depth first, parents before
+        their sub groups), then the line itself.
         """
-        result: List[SegmentGroup] = []
-        if predicate(segment_group):
-            result.append(segment_group)
-        if segment_group.segment_groups is not None:
-            for sub_group in segment_group.segment_groups:
-                sub_result = DeepAnwendungshandbuch._query_segment_group(sub_group, predicate)
-                result += sub_result
-        return result
+        for line in self.lines:
+            if line.segment_groups is not None:
+                for sub_group in line.segment_groups:
+                    yield from _iter_segment_groups(sub_group, predicate)
+            if predicate(line):
+                yield line
 
     def find_segment_groups(self, predicate: Callable[[SegmentGroup], bool]) -> List[SegmentGroup]:
         """
         recursively search for segment group in this ahb that meets the predicate.
         :return: list of segment groups that match the predicate; empty list otherwise
         """
-        result: List[SegmentGroup] = []
+        return list(self.iter_segment_groups(predicate))
+
+    def iter_segments(
+        self,
+        group_predicate: Callable[[SegmentGroup], bool] = lambda _: True,
+        segment_predicate: Callable[[Segment], bool] = lambda _: True,
+    ) -> Iterator[Segment]:
+        """
+        recursively iterate over all segments that meet the segment_predicate and are located inside a group (or any of
+        its sub groups) that meets the group_predicate. Segments that are located directly in the root lines of the ahb
+        are always considered. Every segment is yielded at most once. The order is, for every line:
+        1. the segments of the sub groups (depth first) that match the group_predicate or have a matching parent below
+           the line
+        2. if the line itself matches: its own segments, then the remaining segments of its sub groups (depth first)
+        and after all lines: the own segments of those lines that do not match the group_predicate.
+        """
+        unmatched_lines: List[SegmentGroup] = []
         for line in self.lines:
+            unmatched_groups: List[SegmentGroup] = []
             if line.segment_groups is not None:
-                for segment_group in line.segment_groups:
-                    result += DeepAnwendungshandbuch._query_segment_group(segment_group, predicate)
-            for line_result in DeepAnwendungshandbuch._query_segment_group(line, predicate):
-                if line_result not in result:
-                    result.append(line_result)
-        return result
+                for sub_group in line.segment_groups:
+                    yield from _iter_segments(sub_group, group_predicate, segment_predicate, False, unmatched_groups)
+            if group_predicate(line):
+                for segment_group in [line] + unmatched_groups:
+                    yield from _filter_segments(segment_group, segment_predicate)
+            else:
+                unmatched_lines.append(line)
+        for line in unmatched_lines:
+            yield from _filter_segments(line, segment_predicate)
 
     def find_segments(
         self,
@@ -493,79 +665,146 @@ class DeepAnwendungshandbuch:
         group_predicate.
         :return: list of matching segments, empty list if nothing was found
         """
-        result: List[Segment] = []
-        for segment_group in self.find_segment_groups(group_predicate):
-            result += segment_group.find_segments(segment_predicate)
-        for line in self.lines:
-            if line.segments is not None:
-                for segment in line.segments:
-                    if segment_predicate(segment):
-                        result.append(segment)
-        return result
+        return list(self.iter_segments(group_predicate, segment_predicate))
+
+    def iter_data_elements(self) -> Iterator[DataElement]:
+        """
+        recursively iterate over all data elements in the deep ahb. Every data element is yielded exactly once.
+        """
+        for segment in self.iter_segments():
+            yield from segment.data_elements
 
     def replace_inputs_based_on_discriminator(self, replacement_func: Callable[[str], DeepAhbInputReplacement]) -> None:
         """
         Replace all the entered_inputs in the entire DeepAnwendungshandbuch using the given replacement_func.
         Note that this modifies this DeepAnwendungshandbuch instance (self).
         """
-        _replace_inputs_based_on_discriminator(self.lines, replacement_func)
+        replace_inputs_in_segment_groups(self.lines, replacement_func)
 
     def get_all_value_pools(self) -> List[DataElementValuePool]:
         """
-        recursively find all value pools in the deep ahb
+        recursively find all value pools in the deep ahb (in the order of :meth:`iter_segments`).
+        Value pools with the same discriminator as a value pool that has been found before are skipped (assumption: the
+        discriminator is truly unique in an AHB).
         :return: a list of all value pools
         """
         result: List[DataElementValuePool] = []
         added_discriminators: Set[Optional[str]] = set()
-        # checks like "str in set" are way faster than "value pool in list"
-
-        def add_to_result(value_pool: DataElementValuePool):
-            if value_pool.discriminator in added_discriminators:
-                # assumption: the discriminator is truly unique in an AHB
-                return
-            if value_pool not in result:
-                added_discriminators.add(value_pool.discriminator)
-                result.append(value_pool)
+        for data_element in self.iter_data_elements():
+            if (
+                isinstance(data_element, DataElementValuePool)
+                and data_element.discriminator not in added_discriminators
+            ):
+                added_discriminators.add(data_element.discriminator)
+                result.append(data_element)
+        return result
 
-        for segment in self.find_segments():
-            for sub_result in segment.get_all_value_pools():
-                add_to_result(sub_result)
-        for segment_group in self.find_segment_groups(lambda _: True):
-            for sub_result in segment_group.get_all_value_pools():
-                add_to_result(sub_result)
-        return list(result)
+    def get_value_pools_with_invalid_entered_input(
+        self, entered_inputs: Optional[Mapping[str, Optional[str]]] = None
+    ) -> List[DataElementValuePool]:
+        """
+        checks the entered inputs of all value pools in the deep ahb against the qualifiers of their value pool.
+        :param entered_inputs: optional discriminator ➡ entered input mapping that takes precedence over the
+        entered_input of the data elements themselves
+        :return: all value pools with an entered input (that is not None) that is not part of the value pool
+        """
+        result: List[DataElementValuePool] = []
+        for value_pool in self.get_all_value_pools():
+            entered_input = value_pool.entered_input
+            if entered_inputs is not None and value_pool.discriminator is not None:
+                entered_input = entered_inputs.get(value_pool.discriminator, entered_input)
+            if entered_input is not None and not value_pool.is_allowed_qualifier(entered_input):
+                result.append(value_pool)
+        return result
 
     def get_all_expressions(self) -> List[str]:
         """
         recursively iterate through the deep ahb and return all distinct expressions found
         """
         result: Set[str] = set()
-        for segment in self.find_segments():
-            if segment.ahb_expression:
-                result.add(segment.ahb_expression)
-            for data_element in segment.data_elements:
-                if isinstance(data_element, DataElementFreeText):
-                    if data_element.ahb_expression:
-                        result.add(data_element.ahb_expression)
-                elif isinstance(data_element, DataElementValuePool):
-                    for value_pool_entry in data_element.value_pool:
-                        if value_pool_entry.ahb_expression:
-                            result.add(value_pool_entry.ahb_expression)
-        for segment_group in self.find_segment_groups(lambda _: True):
+        for segment_group in self.iter_segment_groups():
             if segment_group.ahb_expression:
                 result.add(segment_group.ahb_expression)
+        for segment in self.iter_segments():
+            if segment.ahb_expression:
+                result.add(segment.ahb_expression)
+        for data_element in self.iter_data_elements():
+            if isinstance(data_element, DataElementFreeText):
+                if data_element.ahb_expression:
+                    result.add(data_element.ahb_expression)
+            elif isinstance(data_element, DataElementValuePool):
+                for value_pool_entry in data_element.value_pool:
+                    if value_pool_entry.ahb_expression:
+                        result.add(value_pool_entry.ahb_expression)
         return sorted(result)
 
+    def get_expression_registry(self, refresh: bool = False) -> ExpressionRegistry:
+        """
+        returns a registry that maps all distinct expressions of this deep ahb (see :meth:`get_all_expressions`) to
+        integer IDs. The registry is created on the first call and then cached; the IDs are only valid for this
+        instance. If you change the expressions of this deep ahb afterwards, call it with refresh=True.
+        """
+        if self._expression_registry is None or refresh:
+            self._expression_registry = ExpressionRegistry(expressions=tuple(self.get_all_expressions()))
+        return self._expression_registry
+
+
+def _iter_segment_groups(
+    segment_group: SegmentGroup, predicate: Callable[[SegmentGroup], bool]
+) -> Iterator[SegmentGroup]:
+    """
+    recursively yield the segment group itself and all of its sub groups that match the predicate (depth first)
+    """
+    if predicate(segment_group):
+        yield segment_group
+    if segment_group.segment_groups is not None:
+        for sub_group in segment_group.segment_groups:
+            yield from _iter_segment_groups(sub_group, predicate)
+
+
+def _filter_segments(segment_group: SegmentGroup, segment_predicate: Callable[[Segment], bool]) -> Iterator[Segment]:
+    """
+    yields the (own) segments of the segment group that match the segment_predicate
+    """
+    if segment_group.segments is not None:
+        for segment in segment_group.segments:
+            if segment_predicate(segment):
+                yield segment
+
+
+def _iter_segments(
+    segment_group: SegmentGroup,
+    group_predicate: Callable[[SegmentGroup], bool],
+    segment_predicate: Callable[[Segment], bool],
+    group_matched: bool,
+    unmatched_groups: List[SegmentGroup],
+) -> Iterator[Segment]:
+    """
+    recursively yield the segments of the segment group and its sub groups that match the segment_predicate, iff either
+    the segment group itself or any of its parents (group_matched) match the group_predicate.
+    The groups whose segments are not yielded are appended to unmatched_groups (depth first).
+    """
+    group_matched = group_matched or group_predicate(segment_group)
+    if group_matched:
+        yield from _filter_segments(segment_group, segment_predicate)
+    else:
+        unmatched_groups.append(segment_group)
+    if segment_group.segment_groups is not None:
+        for sub_group in segment_group.segment_groups:
+            yield from _iter_segments(sub_group, group_predicate, segment_predicate, group_matched, unmatched_groups)
+
 
-def _replace_inputs_based_on_discriminator(
+def replace_inputs_in_segment_groups(
     segment_groups: List[SegmentGroup], replacement_func: Callable[[str], DeepAhbInputReplacement]
 ) -> None:
     """
-    Replace all the entered_inputs in the entire list of segment groups using the given replacement_func.
+    Replace all the entered_inputs in the entire list of segment groups (and their sub groups) using the given
+    replacement_func. The segment groups are modified in place (see
+    :meth:`DeepAnwendungshandbuch.replace_inputs_based_on_discriminator`).
     """
     for segment_group in segment_groups:
         if segment_group.segment_groups is not None:
-            _replace_inputs_based_on_discriminator(segment_group.segment_groups, replacement_func)
+            replace_inputs_in_segment_groups(segment_group.segment_groups, replacement_func)
         if segment_group.segments is None:
             continue
         for segment in segment_group.segments:
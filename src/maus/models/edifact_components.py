@@ -3,17 +3,18 @@
 EDIFACT components are data structures on different hierarchical levels inside an EDIFACT message.
 Components contain not only EDIFACT composites but also segments and segment groups.
 """
+import functools
 import re
 from abc import ABC
 from enum import Enum
-from typing import Callable, Dict, Iterable, List, Mapping, Optional, Type
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Type
 
 import attr
 import attrs
 from marshmallow import Schema, fields, post_dump, post_load, pre_dump, pre_load  # type:ignore[import]
 from marshmallow.fields import Enum as MarshmallowEnum
 
-from maus.models import _check_that_string_is_not_whitespace_or_empty
+from maus.models import _check_that_string_is_not_whitespace_or_empty, _intern_string
 
 
 class DataElementDataType(str, Enum):
@@ -54,7 +55,7 @@ class DataElement(ABC):
     """
     # but could also be a reference or a name
     #: the ID of the data element (e.g. "0062") for the Nachrichten-Referenznummer
-    data_element_id: str = attrs.field(validator=attrs.validators.matches_re(r"^\d{4}$"))
+    data_element_id: str = attrs.field(validator=attrs.validators.matches_re(r"^\d{4}$"), converter=_intern_string)
     #: the type of data expected to be used with this data element
     entered_input: Optional[str] = attrs.field(validator=attrs.validators.optional(attrs.validators.instance_of(str)))
     """
@@ -102,7 +103,8 @@ class DataElementFreeText(DataElement):
     ahb_expression: str = attrs.field(
         validator=attrs.validators.and_(
             attrs.validators.instance_of(str), _check_that_string_is_not_whitespace_or_empty
-        )
+        ),
+        converter=_intern_string,
     )
     """any freetext data element has an ahb expression attached. Could be 'X' but also 'M [13]'"""
 
@@ -158,11 +160,11 @@ class ValuePoolEntry:
     """
 
     #: the qualifier in edifact, might be e.g. "E01", "D", "9", "1.1a", "G_0057"
-    qualifier: str = attr.field(validator=_check_is_edifact_qualifier)
+    qualifier: str = attr.field(validator=_check_is_edifact_qualifier, converter=_intern_string)
     #: the meaning as it is written in the AHB (e.g. "Einzug", "Entwurfs-Version", "GS1", "Codeliste Gas G_0057"
-    meaning: str = attr.field(validator=attrs.validators.instance_of(str))
+    meaning: str = attr.field(validator=attrs.validators.instance_of(str), converter=_intern_string)
     #: the ahb expression, in most cases this is a simple "X"; it must not be empty
-    ahb_expression: str = attr.field(validator=_check_that_string_is_not_whitespace_or_empty)
+    ahb_expression: str = attr.field(validator=_check_that_string_is_not_whitespace_or_empty, converter=_intern_string)
     # must not be empty (if so, the value pool entry should not be included of the result)
 
 
@@ -185,6 +187,15 @@ class ValuePoolEntrySchema(Schema):
         return ValuePoolEntry(**data)
 
 
+# pylint:disable=unused-argument
+def _invalidate_qualifier_index(instance: "DataElementValuePool", attribute, value):
+    """
+    resets the qualifier index of the data element value pool whenever its value_pool is replaced
+    """
+    instance._qualifier_index = None  # pylint:disable=protected-access
+    return value
+
+
 @attrs.define(auto_attribs=True, kw_only=True)
 class DataElementValuePool(DataElement):
     """
@@ -202,11 +213,49 @@ class DataElementValuePool(DataElement):
         validator=attrs.validators.deep_iterable(
             member_validator=attrs.validators.instance_of(ValuePoolEntry),
             iterable_validator=attrs.validators.instance_of(list),
-        )
+        ),
+        on_setattr=attrs.setters.pipe(attrs.setters.validate, _invalidate_qualifier_index),
     )
     """
     The value pool contains at least one value :class:`.ValuePoolEntry`
     """
+    _qualifier_index: Optional[Dict[str, ValuePoolEntry]] = attrs.field(init=False, default=None, eq=False, repr=False)
+    """
+    lazily built index qualifier ➡ value pool entry. It's reset whenever the value_pool is replaced, changes its length
+    or is modified using replace_value_pool. If you modify the qualifiers of the entries yourself, call
+    invalidate_qualifier_index().
+    """
+    _indexed_value_pool_length: int = attrs.field(init=False, default=0, eq=False, repr=False)
+    """
+    the length of the value_pool at the time the _qualifier_index was built
+    """
+
+    def _get_qualifier_index(self) -> Dict[str, ValuePoolEntry]:
+        if self._qualifier_index is None or self._indexed_value_pool_length != len(self.value_pool):
+            index: Dict[str, ValuePoolEntry] = {}
+            for value_pool_entry in self.value_pool:
+                index.setdefault(value_pool_entry.qualifier, value_pool_entry)
+            self._qualifier_index = index
+            self._indexed_value_pool_length = len(self.value_pool)
+        return self._qualifier_index
+
+    def invalidate_qualifier_index(self) -> None:
+        """
+        resets the qualifier index. Call this after you modified the value pool (entries) in place.
+        """
+        self._qualifier_index = None
+
+    def get_value_pool_entry(self, qualifier: str) -> Optional[ValuePoolEntry]:
+        """
+        returns the (first) value pool entry with the given qualifier in O(1); None if the qualifier is not in the pool
+        """
+        return self._get_qualifier_index().get(qualifier)
+
+    def is_allowed_qualifier(self, qualifier: Optional[str]) -> bool:
+        """
+        returns true iff the given qualifier (e.g. an entered input) is part of the value pool
+        """
+        return qualifier is not None and self.get_value_pool_entry(qualifier) is not None
 
     def replace_value_pool(
         self,
@@ -247,12 +296,14 @@ class DataElementValuePool(DataElement):
                         value_pool_entry.meaning, existing_value_pool_qualifier
                     )
                 value_pool_entry.qualifier = edifact_to_domain_mapping[existing_value_pool_qualifier]
+        self.invalidate_qualifier_index()
 
     def has_value_pool_which_is_subset_of(self, entries: Iterable[str]) -> bool:
         """
         returns true iff all qualifiers from the data elements value pool are found in entries
         """
-        return all(x.qualifier in entries for x in self.value_pool)
+        entries_set = entries if isinstance(entries, (set, frozenset)) else set(entries)
+        return all(qualifier in entries_set for qualifier in self._get_qualifier_index())
 
 
 class DataElementValuePoolSchema(DataElementSchema):
@@ -368,7 +419,8 @@ class SegmentLevel(ABC):
     ahb_expression: str = attrs.field(
         validator=attrs.validators.and_(
             attrs.validators.instance_of(str), _check_that_string_is_not_whitespace_or_empty
-        )
+        ),
+        converter=_intern_string,
     )
     ahb_line_index: Optional[int] = attrs.field(
         validator=attrs.validators.optional(attrs.validators.instance_of(int)), default=None
@@ -404,7 +456,7 @@ class Segment(SegmentLevel):
 
     data_elements: List[DataElement]
     section_name: Optional[str] = attrs.field(
-        validator=attrs.validators.optional(attrs.validators.instance_of(str)), default=None
+        validator=attrs.validators.optional(attrs.validators.instance_of(str)), default=None, converter=_intern_string
     )
     """
     For the MIG matching it might be necessary to know the section in which the data element occurred in the AHB.
@@ -544,6 +596,28 @@ class EdifactStackLevel:
 _level_pattern = re.compile(r"\[\"(?P<level_name>[^\[\]]+?)\"\](?:\[(?P<index>\d+)\])?")
 
 
+EdifactStackLevelKey = Tuple[str, bool, Optional[int]]
+"""
+an immutable (and hashable) representation of an EdifactStackLevel: (name, is_groupable, index)
+"""
+
+
+@functools.lru_cache(maxsize=16384)
+def parse_json_path(json_path: str) -> Tuple[EdifactStackLevelKey, ...]:
+    """
+    parses a json path as it is created by :meth:`EdifactStack.to_json_path` into immutable level keys.
+    The results are cached, so that the regex is only run once per distinct json path (e.g. per discriminator).
+    """
+    return tuple(
+        (
+            level_match["level_name"],
+            level_match["index"] is not None,
+            int(level_match["index"]) if level_match["index"] is not None else None,
+        )
+        for level_match in _level_pattern.finditer(json_path)
+    )
+
+
 @attrs.define(auto_attribs=True, kw_only=True)
 class EdifactStack:
     """
@@ -564,14 +638,29 @@ class EdifactStack:
         """
         reads a json path as it is created by "to_json_path" and returns the corresponding edifact stack
         """
-        levels: List[EdifactStackLevel] = []
-        for level_match in _level_pattern.finditer(json_path):
-            level = EdifactStackLevel(name=level_match["level_name"], is_groupable=level_match["index"] is not None)
-            if level.is_groupable:
-                level.index = int(level_match["index"])
-            levels.append(level)
+        # the parsed levels are cached but the EdifactStackLevels are mutable, hence we create new instances every time
+        levels: List[EdifactStackLevel] = [
+            EdifactStackLevel(name=name, is_groupable=is_groupable, index=index)
+            for name, is_groupable, index in parse_json_path(json_path)
+        ]
         return EdifactStack(levels=levels)
 
+    def to_level_keys(self) -> Tuple[EdifactStackLevelKey, ...]:
+        """
+        returns the levels as immutable keys (as they are returned by :func:`parse_json_path` for the json path of
+        this stack). Like in :meth:`to_json_path`, groupable levels without an index are treated as index 0 and levels
+        with an index are treated as groupable (the json path cannot tell a non-groupable level with an index apart).
+        """
+        # pylint: disable=not-an-iterable
+        return tuple(
+            (
+                (level.name, True, level.index if level.index is not None else 0)
+                if level.is_groupable or level.index is not None
+                else (level.name, False, None)
+            )
+            for level in self.levels
+        )
+
     def is_sub_stack_of(self, other: "EdifactStack") -> bool:
         """
         Returns true iff this (self) stack is a sub stack of the other provided stack.
@@ -0,0 +1,150 @@
+"""
+This module contains a prefix tree (trie) over EdifactStacks. Other than comparing EdifactStacks pairwise (see
+:meth:`.EdifactStack.is_sub_stack_of`), the trie allows to find e.g. all data elements below a given stack, the longest
+known prefix of a stack or the closest known parent of a stack in O(depth) instead of O(number of discriminators).
+"""
+
+from typing import Dict, Generic, Iterator, List, Optional, Tuple, TypeVar, Union
+
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuch
+from maus.models.edifact_components import DataElement, EdifactStack, EdifactStackLevelKey, parse_json_path
+
+T = TypeVar("T")
+
+StackOrJsonPath = Union[EdifactStack, str]
+"""
+the keys of the trie may either be provided as EdifactStack or as json path (as used in the discriminators of a MAUS)
+"""
+
+
+def _to_level_keys(stack: StackOrJsonPath) -> Tuple[EdifactStackLevelKey, ...]:
+    if isinstance(stack, EdifactStack):
+        return stack.to_level_keys()
+    return parse_json_path(stack)
+
+
+class _EdifactStackTrieNode(Generic[T]):  # pylint:disable=too-few-public-methods
+    """
+    a single node of the trie; it corresponds to one level of an EdifactStack
+    """
+
+    __slots__ = ("children", "json_path", "values")
+
+    def __init__(self) -> None:
+        self.children: Dict[EdifactStackLevelKey, "_EdifactStackTrieNode[T]"] = {}
+        self.json_path: Optional[str] = None  #: the json path of the stack that ends at this node (if any was added)
+        self.values: List[T] = []  #: the values that have been added for the stack that ends at this node
+
+
+class EdifactStackTrie(Generic[T]):
+    """
+    A trie that is keyed by the levels of EdifactStacks. Every stack may carry one or more values (e.g. the data
+    elements of a MAUS that share the respective discriminator).
+    """
+
+    def __init__(self) -> None:
+        self._root: _EdifactStackTrieNode[T] = _EdifactStackTrieNode()
+        self._number_of_stacks: int = 0
+
+    @staticmethod
+    def from_maus(maus: DeepAnwendungshandbuch) -> "EdifactStackTrie[DataElement]":
+        """
+        creates a trie from all data elements of the given MAUS whose discriminator is a json path
+        """
+        result: EdifactStackTrie[DataElement] = EdifactStackTrie()
+        for data_element in maus.iter_data_elements():
+            if data_element.discriminator is not None and data_element.discriminator.startswith("$"):
+                result.add(data_element.discriminator, data_element)
+        return result
+
+    def add(self, stack: StackOrJsonPath, value: T) -> None:
+        """
+        adds the value for the given stack
+        """
+        node = self._root
+        for level_key in _to_level_keys(stack):
+            child = node.children.get(level_key)
+            if child is None:
+                child = _EdifactStackTrieNode()
+                node.children[level_key] = child
+            node = child
+        if node.json_path is None:
+            node.json_path = stack if isinstance(stack, str) else stack.to_json_path()
+            self._number_of_stacks += 1
+        node.values.append(value)
+
+    def _find_node(self, stack: StackOrJsonPath) -> Optional[_EdifactStackTrieNode[T]]:
+        node = self._root
+        for level_key in _to_level_keys(stack):
+            child = node.children.get(level_key)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def get(self, stack: StackOrJsonPath) -> List[T]:
+        """
+        returns the values that have been added for exactly the given stack (an empty list if there are none)
+        """
+        node = self._find_node(stack)
+        if node is None:
+            return []
+        return list(node.values)
+
+    def __contains__(self, stack: StackOrJsonPath) -> bool:
+        node = self._find_node(stack)
+        return node is not None and node.json_path is not None
+
+    def __len__(self) -> int:
+        """
+        returns the number of distinct stacks in the trie
+        """
+        return self._number_of_stacks
+
+    def iter_subtree(self, stack: StackOrJsonPath) -> Iterator[Tuple[str, T]]:
+        """
+        yields (json path, value) for the given stack itself and all stacks below it (depth first, in the order in
+        which they have been added per level). E.g. the subtree of $["Dokument"][0]["Nachricht"][0]["Vorgang"][0]
+        contains all data elements of the Vorgang.
+        """
+        node = self._find_node(stack)
+        if node is None:
+            return
+        nodes_to_visit: List[_EdifactStackTrieNode[T]] = [node]
+        while nodes_to_visit:
+            current = nodes_to_visit.pop()
+            if current.json_path is not None:
+                for value in current.values:
+                    yield current.json_path, value
+            nodes_to_visit.extend(reversed(current.children.values()))
+
+    def find_longest_prefix(self, stack: StackOrJsonPath) -> Optional[str]:
+        """
+        returns the json path of the deepest stack in the trie that is a prefix of (or equal to) the given stack
+        :return: None if no stack in the trie is a prefix of the given stack
+        """
+        return self._find_deepest_ancestor(stack, include_stack_itself=True)
+
+    def find_parent(self, stack: StackOrJsonPath) -> Optional[str]:
+        """
+        returns the json path of the deepest stack in the trie that is a true parent of the given stack (i.e. a prefix
+        that is not equal to the stack itself)
+        :return: None if there is no parent of the given stack in the trie
+        """
+        return self._find_deepest_ancestor(stack, include_stack_itself=False)
+
+    def _find_deepest_ancestor(self, stack: StackOrJsonPath, include_stack_itself: bool) -> Optional[str]:
+        level_keys = _to_level_keys(stack)
+        if not level_keys and not include_stack_itself:
+            return None  # the root has no parent
+        node = self._root
+        result: Optional[str] = node.json_path
+        for depth, level_key in enumerate(level_keys):
+            child = node.children.get(level_key)
+            if child is None:
+                break
+            node = child
+            is_stack_itself = depth == len(level_keys) - 1
+            if node.json_path is not None and (include_stack_itself or not is_stack_itself):
+                result = node.json_path
+        return result
@@ -0,0 +1,173 @@
+"""
+This module contains an overlay that allows to fill a single, shared MAUS with the inputs of many different messages.
+Other than :meth:`.DeepAnwendungshandbuch.replace_inputs_based_on_discriminator`, the overlay does not modify the MAUS
+but stores the entered inputs in a sparse dictionary (discriminator ➡ entered_input) per message. Hence, one (cached)
+MAUS can be used concurrently to validate many messages without copying it.
+"""
+
+import copy
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from maus.models.anwendungshandbuch import (
+    AhbMetaInformation,
+    DeepAhbInputReplacement,
+    DeepAnwendungshandbuch,
+    replace_inputs_in_segment_groups,
+)
+from maus.models.edifact_components import DataElement, DataElementFreeText, Segment, SegmentGroup
+
+
+class OverlaidDataElement:
+    """
+    A read-only view on a data element of the shared MAUS with the entered_input from the overlay.
+    All other attributes (discriminator, value_pool, ahb_expression...) are read from the original data element.
+    """
+
+    __slots__ = ("data_element", "entered_input")
+
+    def __init__(self, data_element: DataElement, entered_input: Optional[str]):
+        self.data_element: DataElement = data_element  #: the original data element in the shared MAUS
+        self.entered_input: Optional[str] = entered_input  #: the entered input for the respective message
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.data_element, name)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(data_element={self.data_element!r}, entered_input={self.entered_input!r})"
+
+
+class DeepAnwendungshandbuchOverlay:
+    """
+    Combines a shared DeepAnwendungshandbuch (which must not be modified as long as it is used in overlays) with the
+    entered inputs of a single message. The overlay exposes the same traversal API as the DeepAnwendungshandbuch.
+    """
+
+    def __init__(self, maus: DeepAnwendungshandbuch, entered_inputs: Optional[Dict[str, Optional[str]]] = None):
+        """
+        :param maus: the shared MAUS
+        :param entered_inputs: optional initial entered inputs (discriminator ➡ entered_input)
+        """
+        self.maus: DeepAnwendungshandbuch = maus
+        self.entered_inputs: Dict[str, Optional[str]] = dict(entered_inputs or {})
+        """
+        the entered inputs of this message; discriminators that are not contained fall back to the shared MAUS
+        """
+
+    @property
+    def meta(self) -> AhbMetaInformation:
+        """the meta information of the shared MAUS"""
+        return self.maus.meta
+
+    @property
+    def lines(self) -> List[SegmentGroup]:
+        """the lines of the shared MAUS; be aware that the data elements inside do not know about the overlay"""
+        return self.maus.lines
+
+    def get_entered_input(self, data_element: DataElement) -> Optional[str]:
+        """
+        returns the entered input for the given data element of the shared MAUS
+        """
+        if data_element.discriminator is not None and data_element.discriminator in self.entered_inputs:
+            return self.entered_inputs[data_element.discriminator]
+        return data_element.entered_input
+
+    def set_entered_input(self, discriminator: str, entered_input: Optional[str]) -> None:
+        """
+        sets the entered input of the data element(s) with the given discriminator (only in this overlay)
+        """
+        self.entered_inputs[discriminator] = entered_input
+
+    def iter_segment_groups(self, predicate: Callable[[SegmentGroup], bool] = lambda _: True) -> Iterator[SegmentGroup]:
+        """
+        see :meth:`.DeepAnwendungshandbuch.iter_segment_groups`
+        """
+        return self.maus.iter_segment_groups(predicate)
+
+    def find_segment_groups(self, predicate: Callable[[SegmentGroup], bool]) -> List[SegmentGroup]:
+        """
+        see :meth:`.DeepAnwendungshandbuch.find_segment_groups`
+        """
+        return self.maus.find_segment_groups(predicate)
+
+    def iter_segments(
+        self,
+        group_predicate: Callable[[SegmentGroup], bool] = lambda _: True,
+        segment_predicate: Callable[[Segment], bool] = lambda _: True,
+    ) -> Iterator[Segment]:
+        """
+        see :meth:`.DeepAnwendungshandbuch.iter_segments`
+        """
+        return self.maus.iter_segments(group_predicate, segment_predicate)
+
+    def find_segments(
+        self,
+        group_predicate: Callable[[SegmentGroup], bool] = lambda _: True,
+        segment_predicate: Callable[[Segment], bool] = lambda _: True,
+    ) -> List[Segment]:
+        """
+        see :meth:`.DeepAnwendungshandbuch.find_segments`
+        """
+        return self.maus.find_segments(group_predicate, segment_predicate)
+
+    def iter_data_elements(self) -> Iterator[OverlaidDataElement]:
+        """
+        like :meth:`.DeepAnwendungshandbuch.iter_data_elements` but yields views that carry the overlaid entered_input
+        """
+        for data_element in self.maus.iter_data_elements():
+            yield OverlaidDataElement(data_element, self.get_entered_input(data_element))
+
+    def get_all_value_pools(self) -> List[OverlaidDataElement]:
+        """
+        like :meth:`.DeepAnwendungshandbuch.get_all_value_pools` but returns views that carry the overlaid entered_input
+        """
+        return [
+            OverlaidDataElement(value_pool, self.get_entered_input(value_pool))
+            for value_pool in self.maus.get_all_value_pools()
+        ]
+
+    def get_all_free_texts(self) -> List[OverlaidDataElement]:
+        """
+        returns views on all free text data elements that carry the overlaid entered_input
+        """
+        return [de for de in self.iter_data_elements() if isinstance(de.data_element, DataElementFreeText)]
+
+    def get_value_pools_with_invalid_entered_input(self) -> List[OverlaidDataElement]:
+        """
+        like :meth:`.DeepAnwendungshandbuch.get_value_pools_with_invalid_entered_input` but uses the overlaid inputs and
+        returns views that carry the overlaid entered_input (just like :meth:`get_all_value_pools`)
+        """
+        return [
+            OverlaidDataElement(value_pool, self.get_entered_input(value_pool))
+            for value_pool in self.maus.get_value_pools_with_invalid_entered_input(self.entered_inputs)
+        ]
+
+    def get_all_expressions(self) -> List[str]:
+        """
+        see :meth:`.DeepAnwendungshandbuch.get_all_expressions`
+        """
+        return self.maus.get_all_expressions()
+
+    def replace_inputs_based_on_discriminator(self, replacement_func: Callable[[str], DeepAhbInputReplacement]) -> None:
+        """
+        Like :meth:`.DeepAnwendungshandbuch.replace_inputs_based_on_discriminator` but only modifies this overlay.
+        The shared MAUS stays untouched.
+        """
+        for data_element in self.maus.iter_data_elements():
+            if data_element.discriminator is not None:
+                replacement_result = replacement_func(data_element.discriminator)
+                if replacement_result.replacement_found is True:
+                    self.entered_inputs[data_element.discriminator] = replacement_result.input_replacement
+
+    def to_deep_ahb(self) -> DeepAnwendungshandbuch:
+        """
+        creates a (deep) copy of the shared MAUS in which the entered inputs of this overlay are applied
+        """
+        result = copy.deepcopy(self.maus)
+        replace_inputs_in_segment_groups(
+            result.lines,
+            lambda discriminator: DeepAhbInputReplacement(
+                replacement_found=discriminator in self.entered_inputs,
+                input_replacement=self.entered_inputs.get(discriminator),
+            ),
+        )
+        return result
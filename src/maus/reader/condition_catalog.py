@@ -0,0 +1,229 @@
+"""
+This module contains a catalog of all conditions (Bedingungen) of a format version.
+Every AHB (CSV) lists the texts of the conditions it uses; most of them are shared by many pruefidentifikators.
+Instead of storing them once per pruefidentifikator (see :meth:`.FlatAhbCsvReader.extract_condition_texts`), the
+catalog stores every condition only once and records which pruefidentifikators reference it (i.e. use its key, e.g.
+"[494]", in their AHB expressions).
+"""
+
+import csv
+import re
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import attrs
+from marshmallow import Schema, fields, post_load
+from marshmallow.fields import Enum as MarshmallowEnum
+
+from maus.edifact import EdifactFormatVersion
+from maus.models.anwendungshandbuch import _VERSION
+from maus.reader.flat_ahb_reader import FlatAhbCsvReader
+
+
+@attrs.define(kw_only=True)
+class CatalogCondition:
+    """
+    a single condition of the :class:`ConditionCatalog`
+    """
+
+    key: str  #: the condition key, e.g. "494"
+    text: str  #: the condition text (without the "[494]" prefix); the first text found for this key
+    pruefidentifikators: List[str] = attrs.field(factory=list)
+    """
+    the pruefidentifikators that reference the condition in their AHB expressions (sorted)
+    """
+    deviating_texts: Dict[str, str] = attrs.field(factory=dict)
+    """
+    the texts of those pruefidentifikators whose AHB has a different text for the same key (e.g. another wording)
+    """
+
+    def get_text(self, pruefidentifikator: Optional[str] = None) -> str:
+        """
+        returns the text of the condition as it is used by the given pruefidentifikator (default: the common text)
+        """
+        if pruefidentifikator is not None:
+            return self.deviating_texts.get(pruefidentifikator, self.text)
+        return self.text
+
+
+class CatalogConditionSchema(Schema):
+    """
+    A schema to (de-)serialize :class:`CatalogCondition` s
+    """
+
+    key = fields.String(required=True)
+    text = fields.String(required=True)
+    pruefidentifikators = fields.List(fields.String(), required=False)
+    deviating_texts = fields.Dict(keys=fields.String(), values=fields.String(), required=False)
+
+    # pylint:disable=unused-argument
+    @post_load
+    def deserialize(self, data, **kwargs) -> CatalogCondition:
+        """
+        Converts the barely typed data dictionary into an actual :class:`.CatalogCondition`
+        """
+        return CatalogCondition(**data)
+
+
+_condition_reference_pattern = re.compile(r"\[(?P<key>\d+)\]")  #: a reference to a condition in an ahb expression
+
+
+def _condition_sort_key(condition_key: str) -> Tuple[int, str]:
+    """
+    sorts the condition keys numerically ("2" < "10")
+    """
+    return (int(condition_key), condition_key) if condition_key.isdigit() else (-1, condition_key)
+
+
+@attrs.define(kw_only=True)
+class ConditionCatalog:
+    """
+    A deduplicated catalog of the conditions of (all the AHBs of) a format version.
+    """
+
+    format_version: Optional[EdifactFormatVersion] = None
+    maus_version: str = _VERSION  #: the maus version that has been used to create the catalog
+    conditions: Dict[str, CatalogCondition] = attrs.field(factory=dict)  #: the conditions by their key
+
+    def add_condition_texts(
+        self, condition_texts: Mapping[str, str], references: Mapping[str, Collection[str]]
+    ) -> None:
+        """
+        Adds the condition texts (as returned by :meth:`.FlatAhbCsvReader.extract_condition_texts`) of an AHB.
+        Conditions that are already in the catalog are not added again; only if the text differs from the one in the
+        catalog, it is stored as deviating text of the pruefidentifikators that reference the condition.
+        :param references: the keys of the conditions that each pruefidentifikator of the AHB references in its
+        expressions (see :func:`read_condition_texts`). The conditions are only attributed to these pruefidentifikators.
+        """
+        for key, text in condition_texts.items():
+            condition = self.conditions.get(key)
+            referencing_pruefidentifikators = [pruefi for pruefi, keys in references.items() if key in keys]
+            if condition is None:
+                condition = CatalogCondition(key=key, text=text)
+                self.conditions[key] = condition
+            elif text != condition.text:
+                condition.deviating_texts.update(
+                    {pruefidentifikator: text for pruefidentifikator in referencing_pruefidentifikators}
+                )
+        self.add_references(references)
+
+    def add_references(self, references: Mapping[str, Collection[str]]) -> None:
+        """
+        Records that the pruefidentifikators reference the conditions with the given keys. Keys of conditions that are
+        not (yet) in the catalog are ignored.
+        """
+        for pruefidentifikator, keys in references.items():
+            for key in keys:
+                condition = self.conditions.get(key)
+                if condition is not None and pruefidentifikator not in condition.pruefidentifikators:
+                    condition.pruefidentifikators = sorted(condition.pruefidentifikators + [pruefidentifikator])
+
+    def __len__(self) -> int:
+        return len(self.conditions)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.conditions
+
+    def __getitem__(self, key: str) -> CatalogCondition:
+        return self.conditions[key]
+
+    def get_text(self, key: str, pruefidentifikator: Optional[str] = None) -> Optional[str]:
+        """
+        returns the text of the condition with the given key or None if it is not in the catalog
+        :param pruefidentifikator: if given, the text as it is used in the AHB of this pruefidentifikator
+        """
+        condition = self.conditions.get(key)
+        return condition.get_text(pruefidentifikator) if condition is not None else None
+
+    def get_pruefidentifikators(self, key: str) -> List[str]:
+        """
+        returns the pruefidentifikators that reference the condition with the given key (empty if it is unknown)
+        """
+        condition = self.conditions.get(key)
+        return list(condition.pruefidentifikators) if condition is not None else []
+
+    def get_condition_texts(self, pruefidentifikator: str) -> Dict[str, str]:
+        """
+        returns the texts of the conditions that a single pruefidentifikator references, sorted by key
+        """
+        return {
+            key: condition.get_text(pruefidentifikator)
+            for key, condition in sorted(self.conditions.items(), key=lambda item: _condition_sort_key(item[0]))
+            if pruefidentifikator in condition.pruefidentifikators
+        }
+
+
+class ConditionCatalogSchema(Schema):
+    """
+    A schema to (de-)serialize :class:`ConditionCatalog` s
+    """
+
+    format_version = MarshmallowEnum(EdifactFormatVersion, required=False, allow_none=True)
+    maus_version = fields.String(required=False)
+    conditions = fields.Method("_dump_conditions", "_load_conditions", required=False)
+
+    def _dump_conditions(self, catalog: ConditionCatalog) -> List[dict]:
+        conditions = sorted(catalog.conditions.values(), key=lambda condition: _condition_sort_key(condition.key))
+        return CatalogConditionSchema(many=True).dump(conditions)
+
+    def _load_conditions(self, value: List[dict]) -> Dict[str, CatalogCondition]:
+        return {condition.key: condition for condition in CatalogConditionSchema(many=True).load(value)}
+
+    # pylint:disable=unused-argument
+    @post_load
+    def deserialize(self, data, **kwargs) -> ConditionCatalog:
+        """
+        Converts the barely typed data dictionary into an actual :class:`.ConditionCatalog`
+        """
+        return ConditionCatalog(**data)
+
+
+def read_condition_texts(
+    csv_path: Path, encoding: str = "utf-8", delimiter: str = ","
+) -> Tuple[Dict[str, Set[str]], Dict[str, str]]:
+    """
+    Reads only the condition texts (column 'Bedingung') and the condition references in the expression columns of an
+    AHB CSV file. This is much cheaper than creating the AhbLines with a :class:`.FlatAhbCsvReader` but returns the
+    same condition texts as its :meth:`.FlatAhbCsvReader.extract_condition_texts`. Note that the 'Bedingung' column
+    also contains the texts of conditions that are only used by other pruefidentifikators of the same AHB document.
+    :return: the keys of the conditions referenced by each pruefidentifikator (expression column) and the condition
+    texts
+    """
+    # pylint:disable=protected-access
+    condition_texts: Dict[str, str] = {}
+    with open(csv_path, "r", encoding=encoding) as infile:
+        reader = csv.DictReader(infile, delimiter=delimiter)
+        pruefidentifikators = FlatAhbCsvReader._get_names_of_expression_columns(reader.fieldnames)
+        if not pruefidentifikators:
+            raise ValueError(f"Cannot find column names for ahb expressions in {csv_path}")
+        references: Dict[str, Set[str]] = {pruefidentifikator: set() for pruefidentifikator in pruefidentifikators}
+        for row in reader:
+            condition_texts.update(FlatAhbCsvReader._extract_bedingungen(row.get("Bedingung")))
+            for pruefidentifikator in pruefidentifikators:
+                expression = row.get(pruefidentifikator)
+                if expression:
+                    references[pruefidentifikator].update(_condition_reference_pattern.findall(expression))
+    return references, condition_texts
+
+
+def build_condition_catalog(
+    csv_paths: Iterable[Path],
+    format_version: Optional[EdifactFormatVersion] = None,
+    encoding: str = "utf-8",
+    delimiter: str = ",",
+) -> ConditionCatalog:
+    """
+    Builds the condition catalog from the given AHB CSV files (which should all belong to the same format version).
+    Every file is read only once. The files are processed in the order of their paths, so the result does not depend
+    on the order of the input.
+    A pruefidentifikator that references a condition whose text is only found in another file is attributed to it, too.
+    """
+    catalog = ConditionCatalog(format_version=format_version)
+    all_references: List[Dict[str, Set[str]]] = []
+    for csv_path in sorted(csv_paths, key=lambda path: Path(path).as_posix()):
+        references, condition_texts = read_condition_texts(csv_path, encoding=encoding, delimiter=delimiter)
+        catalog.add_condition_texts(condition_texts, references)
+        all_references.append(references)
+    for file_references in all_references:
+        catalog.add_references(file_references)
+    return catalog
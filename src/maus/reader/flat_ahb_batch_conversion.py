@@ -0,0 +1,223 @@
+"""
+This module converts entire directory trees of AHB CSV files to flat AHB JSON files.
+The files are converted in parallel (by default in a process pool, because reading the CSVs is CPU bound).
+The results are cached by the hash of the CSV content, the maus version and the reader options, so that a new run only
+converts those CSVs that actually changed. Every run writes a manifest with the timings and the bedingungen of every
+file.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import attrs
+from marshmallow import Schema, fields, post_load
+
+from maus.models.anwendungshandbuch import _VERSION, FlatAnwendungshandbuchSchema
+from maus.reader.flat_ahb_reader import FlatAhbCsvReader
+
+MANIFEST_FILE_NAME = "manifest.json"  #: the name of the manifest file in the output directory
+
+
+@attrs.define(kw_only=True)
+class CsvConversionResult:
+    """
+    the result of converting a single CSV file (an entry of the :class:`BatchConversionManifest`)
+    """
+
+    csv_path: str  #: the path of the CSV file, relative to the input directory (posix style)
+    json_path: Optional[str] = None  #: the path of the flat AHB JSON, relative to the output directory (posix style)
+    content_hash: str  #: the SHA-256 hash of the CSV file content
+    pruefidentifikator: Optional[str] = None
+    bedingungen: Dict[str, str] = attrs.field(factory=dict)  #: the condition texts found in the CSV file
+    seconds: float = 0  #: the time it took to convert the file (or to copy it from the cache)
+    cached: bool = False  #: true if the result has been taken from the cache
+    error: Optional[str] = None  #: the error if the file could not be converted (json_path is None then)
+
+
+class CsvConversionResultSchema(Schema):
+    """
+    A schema to (de-)serialize :class:`CsvConversionResult` s
+    """
+
+    csv_path = fields.String(required=True)
+    json_path = fields.String(required=False, allow_none=True)
+    content_hash = fields.String(required=True)
+    pruefidentifikator = fields.String(required=False, allow_none=True)
+    bedingungen = fields.Dict(keys=fields.String(), values=fields.String(), required=False)
+    seconds = fields.Float(required=False)
+    cached = fields.Boolean(required=False)
+    error = fields.String(required=False, allow_none=True)
+
+    # pylint:disable=unused-argument
+    @post_load
+    def deserialize(self, data, **kwargs) -> CsvConversionResult:
+        """
+        Converts the barely typed data dictionary into an actual :class:`.CsvConversionResult`
+        """
+        return CsvConversionResult(**data)
+
+
+@attrs.define(kw_only=True)
+class BatchConversionManifest:
+    """
+    a summary of :func:`convert_csv_directory`
+    """
+
+    maus_version: str  #: the maus version that has been used for the conversion
+    total_seconds: float = 0  #: the wall clock time of the entire conversion
+    results: List[CsvConversionResult] = attrs.field(factory=list)  #: one entry per CSV file (sorted by path)
+
+
+class BatchConversionManifestSchema(Schema):
+    """
+    A schema to (de-)serialize :class:`BatchConversionManifest` s
+    """
+
+    maus_version = fields.String(required=True)
+    total_seconds = fields.Float(required=False)
+    results = fields.List(fields.Nested(CsvConversionResultSchema), required=False)
+
+    # pylint:disable=unused-argument
+    @post_load
+    def deserialize(self, data, **kwargs) -> BatchConversionManifest:
+        """
+        Converts the barely typed data dictionary into an actual :class:`.BatchConversionManifest`
+        """
+        return BatchConversionManifest(**data)
+
+
+def _convert_csv_file(
+    csv_path: Path, encoding: str, delimiter: str, deterministic_guids: bool
+) -> Tuple[Dict[str, Any], Dict[str, str], float]:
+    """
+    reads the CSV file and returns the serialized flat AHB, the bedingungen and the time it took.
+    Module level function, so that it can be run in a process pool.
+    """
+    start = time.perf_counter()
+    reader = FlatAhbCsvReader(csv_path, encoding=encoding, delimiter=delimiter, deterministic_guids=deterministic_guids)
+    flat_ahb_dict = FlatAnwendungshandbuchSchema().dump(reader.to_flat_ahb())
+    return flat_ahb_dict, reader.extract_condition_texts(), time.perf_counter() - start
+
+
+def _write_json_atomically(path: Path, content: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(path.name + ".tmp")
+    with open(temporary_path, "w", encoding="utf-8") as outfile:
+        json.dump(content, outfile, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(temporary_path, path)
+
+
+def _get_cache_paths(
+    cache_directory: Path, content_hash: str, encoding: str, delimiter: str, deterministic_guids: bool
+) -> Tuple[Path, Path]:
+    """
+    returns the paths of the cached flat AHB JSON file and of the cached conversion result (with the bedingungen).
+    Besides the content hash and the maus version, the key contains (a hash of) all options that change the result.
+    """
+    options = json.dumps({"encoding": encoding, "delimiter": delimiter, "deterministic_guids": deterministic_guids})
+    options_hash = hashlib.sha256(options.encode("utf-8")).hexdigest()[:16]
+    cache_key = f"{content_hash}_{_VERSION}_{options_hash}"
+    return cache_directory / f"{cache_key}.json", cache_directory / f"{cache_key}.result.json"
+
+
+def _copy_cached_result(
+    cached_json_path: Path, cached_result_path: Path, output_path: Path, result: CsvConversionResult
+) -> bool:
+    """
+    copies the cached flat AHB JSON file to the output_path and fills the result from the cache
+    :return: false if the cache entry does not exist (or is incomplete); nothing has been done then
+    """
+    copy_start = time.perf_counter()
+    try:
+        with open(cached_result_path, "r", encoding="utf-8") as cache_file:
+            cached_result = CsvConversionResultSchema().load(json.load(cache_file))
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cached_json_path, output_path)
+    except FileNotFoundError:
+        return False
+    result.pruefidentifikator = cached_result.pruefidentifikator
+    result.bedingungen = cached_result.bedingungen
+    result.cached = True
+    result.seconds = time.perf_counter() - copy_start
+    return True
+
+
+# pylint:disable=too-many-arguments,too-many-locals
+def convert_csv_directory(
+    input_directory: Path,
+    output_directory: Path,
+    cache_directory: Optional[Path] = None,
+    executor: Optional[Executor] = None,
+    encoding: str = "utf-8",
+    delimiter: str = ",",
+    deterministic_guids: bool = False,
+) -> BatchConversionManifest:
+    """
+    Converts all AHB CSV files below the input directory to flat AHB JSON files (see :class:`.FlatAhbCsvReader`).
+    The JSON files are written to the same relative path in the output directory ('FV2304/UTILMD/11042.csv' becomes
+    'FV2304/UTILMD/11042.json'); the manifest is written to output_directory/manifest.json.
+    A CSV file whose content hash is found in the cache (for the same maus version and the same encoding, delimiter
+    and deterministic_guids) is not read again; its cached result is written instead. Incomplete cache entries are
+    ignored. Files that cannot be converted are reported in the manifest but do not stop the conversion.
+    :param cache_directory: where the converted results are cached; defaults to output_directory/.maus_cache
+    :param executor: converts the CSV files; defaults to a ProcessPoolExecutor
+    :param deterministic_guids: derive the line guids from the CSV content (see :class:`.FlatAhbCsvReader`), so that
+    the same CSV always results in the same JSON file
+    :return: the manifest
+    """
+    start = time.perf_counter()
+    if cache_directory is None:
+        cache_directory = output_directory / ".maus_cache"
+    manifest = BatchConversionManifest(maus_version=_VERSION)
+    pending: Dict[str, Tuple[CsvConversionResult, "Future[Tuple[Dict[str, Any], Dict[str, str], float]]"]] = {}
+    own_executor = executor is None
+    used_executor: Executor = executor if executor is not None else ProcessPoolExecutor()
+    try:
+        for csv_path in sorted(input_directory.rglob("*.csv"), key=lambda path: path.as_posix()):
+            relative_path = csv_path.relative_to(input_directory)
+            result = CsvConversionResult(
+                csv_path=relative_path.as_posix(), content_hash=hashlib.sha256(csv_path.read_bytes()).hexdigest()
+            )
+            manifest.results.append(result)
+            json_path = relative_path.with_suffix(".json")
+            cached_json_path, cached_result_path = _get_cache_paths(
+                cache_directory, result.content_hash, encoding, delimiter, deterministic_guids
+            )
+            if _copy_cached_result(cached_json_path, cached_result_path, output_directory / json_path, result):
+                result.json_path = json_path.as_posix()
+                continue
+            pending[result.csv_path] = (
+                result,
+                used_executor.submit(_convert_csv_file, csv_path, encoding, delimiter, deterministic_guids),
+            )
+        for result, future in pending.values():
+            try:
+                flat_ahb_dict, bedingungen, seconds = future.result()
+            except Exception as conversion_error:  # pylint:disable=broad-exception-caught
+                result.error = repr(conversion_error)
+                continue
+            json_path = Path(result.csv_path).with_suffix(".json")
+            _write_json_atomically(output_directory / json_path, flat_ahb_dict)
+            result.json_path = json_path.as_posix()
+            result.pruefidentifikator = flat_ahb_dict["meta"]["pruefidentifikator"]
+            result.bedingungen = bedingungen
+            result.seconds = seconds
+            cached_json_path, cached_result_path = _get_cache_paths(
+                cache_directory, result.content_hash, encoding, delimiter, deterministic_guids
+            )
+            cache_directory.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(output_directory / json_path, cached_json_path)
+            # the result file is written last; a cache entry is only valid if it exists
+            _write_json_atomically(cached_result_path, CsvConversionResultSchema().dump(result))
+    finally:
+        if own_executor:
+            used_executor.shutdown()
+    manifest.total_seconds = time.perf_counter() - start
+    _write_json_atomically(output_directory / MANIFEST_FILE_NAME, BatchConversionManifestSchema().dump(manifest))
+    return manifest
@@ -3,12 +3,15 @@ A module that reads AHBs from a given CSV file
 """
 
 import csv
+import functools
 import logging
 import re
 import uuid
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List, Literal, Optional, Sequence, Set, TextIO, Tuple, overload
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Sequence, Set, TextIO, Tuple, overload
+
+import attrs
 
 from maus.models.anwendungshandbuch import _VERSION, AhbLine, AhbMetaInformation, FlatAnwendungshandbuch
 from maus.models.edifact_components import gabi_edifact_qualifier_pattern
@@ -18,6 +21,21 @@ _value_pool_entry_pattern = re.compile(r"^(?!MP-ID)[A-Z0-9\-i]{2,}$")  # i for G
 _numeric_value_pool_entry_pattern = re.compile(r"^\d+(?:\.\d+)?[a-z]?$")
 _ebd_code_pattern = re.compile(r"^([EG])_\d+$")
 _segment_group_pattern = re.compile(r"^SG\d+$")
+_ahb_line_guid_namespace = uuid.UUID("7f1c2a4e-9b3d-4c5e-8a6f-0d2e4b6c8a10")  #: namespace of the deterministic guids
+# matches iff one of the patterns matches (the anchors ^ and $ are moved out of the alternatives)
+_combined_value_pool_entry_pattern = re.compile(
+    "^(?:"
+    + "|".join(
+        pattern.pattern[1:-1]
+        for pattern in (
+            _value_pool_entry_pattern,
+            _numeric_value_pool_entry_pattern,
+            gabi_edifact_qualifier_pattern,
+            _ebd_code_pattern,
+        )
+    )
+    + ")$"
+)
 
 
 # pylint:disable=too-few-public-methods
@@ -44,28 +62,92 @@ def check_file_can_be_parsed_as_ahb_csv(file_path: Path) -> None:
     _ = FlatAhbCsvReader(file_path)  # this may die with a meaningful exception
 
 
+# pylint:disable=too-many-instance-attributes
 class FlatAhbCsvReader(FlatAhbReader):
     """
     reads csv files and returns AHBs
     """
 
-    def __init__(self, file_path: Path, pruefidentifikator: Optional[str] = None, encoding="utf-8", delimiter=","):
+    # pylint:disable=too-many-arguments
+    def __init__(
+        self,
+        file_path: Path,
+        pruefidentifikator: Optional[str] = None,
+        encoding="utf-8",
+        delimiter=",",
+        streaming: bool = False,
+        deterministic_guids: bool = False,
+    ):
+        """
+        :param streaming: if true, the file is not read in the constructor. Instead, every call of
+        :meth:`iter_ahb_lines` (and :meth:`to_flat_ahb`) reads it lazily, one row at a time, and :attr:`rows` stays
+        empty. The pruefidentifikator and the bedingungen are known only after the lines have been iterated.
+        :param deterministic_guids: if true, the guids of the lines are derived from the pruefidentifikator, the row
+        index and the row content (uuid5) instead of being random (uuid4). Reading the same CSV file then always
+        results in the same flat AHB (and MAUS), which allows to cache and diff them.
+        """
         self.rows: List[AhbLine] = []
         self._logger = logging.getLogger()
         self.current_section_name: Optional[str] = None
         self.pruefidentifikator = pruefidentifikator
         self.delimiter = delimiter
         self.bedingungen: Dict[str, str] = {}
+        self.file_path = file_path
+        self.encoding = encoding
+        self.streaming = streaming
+        self.deterministic_guids = deterministic_guids
+        if streaming:
+            return
         with open(file_path, "r", encoding=encoding) as infile:
-            # current_section_name: Optional[str]
             raw_lines = self.get_raw_rows(infile)
-        raw_lines_with_merged_section_names = FlatAhbCsvReader.merge_section_only_lines(raw_lines)
+        self.rows = list(self._iter_ahb_lines_from_raw_rows(raw_lines))
+
+    def _iter_rows_and_ahb_lines(self, raw_lines: Iterable[dict]) -> Iterator[Tuple[dict, AhbLine]]:
+        """
+        merges the section only lines and converts the raw rows to AhbLines (skipping the rows that are no AhbLines)
+        :return: pairs of the (merged) raw row and the AhbLine created from it
+        """
+        raw_lines_with_merged_section_names = FlatAhbCsvReader.iter_merged_section_only_lines(raw_lines)
         for row_index, row in enumerate(raw_lines_with_merged_section_names):
             ahb_line = self.raw_ahb_row_to_ahbline(row)
             if ahb_line is None:
                 continue
             ahb_line.index = row_index  # it is ascending but not continuous
-            self.rows.append(ahb_line)
+            if self.deterministic_guids:
+                ahb_line.guid = FlatAhbCsvReader.create_deterministic_guid(self.pruefidentifikator, row_index, row)
+            yield row, ahb_line
+
+    @staticmethod
+    def create_deterministic_guid(pruefidentifikator: Optional[str], row_index: int, raw_row: dict) -> uuid.UUID:
+        """
+        Creates a guid for the line that is derived from the pruefidentifikator, the index and the content of the raw
+        row (uuid5). The same input always results in the same guid.
+        The expression columns of other pruefidentifikators are ignored, so that the guids do not depend on whether
+        a pruefidentifikator is read from a CSV with one or with many expression columns.
+        """
+        row_content = "\x1f".join(
+            f"{key}={value}"
+            for key, value in raw_row.items()
+            if key == pruefidentifikator or not (isinstance(key, str) and _pruefi_pattern.match(key))
+        )
+        return uuid.uuid5(_ahb_line_guid_namespace, f"{pruefidentifikator}\x1e{row_index}\x1e{row_content}")
+
+    def _iter_ahb_lines_from_raw_rows(self, raw_lines: Iterable[dict]) -> Iterator[AhbLine]:
+        for _, ahb_line in self._iter_rows_and_ahb_lines(raw_lines):
+            yield ahb_line
+
+    def iter_ahb_lines(self) -> Iterator[AhbLine]:
+        """
+        Yields the AhbLines of the AHB (the same as :attr:`rows`; including those that do not hold any information).
+        In streaming mode, the file is read lazily: reading the raw rows, merging the section only lines and
+        converting the rows to AhbLines are chained generators, so that only a few rows are held in memory at a time.
+        """
+        if not self.streaming:
+            yield from self.rows
+            return
+        self.current_section_name = None
+        with open(self.file_path, "r", encoding=self.encoding) as infile:
+            yield from self._iter_ahb_lines_from_raw_rows(self.iter_raw_rows(infile))
 
     @staticmethod
     def merge_section_only_lines(raw_lines: List[dict]) -> List[dict]:
@@ -76,8 +158,13 @@ class FlatAhbCsvReader(FlatAhbReader):
         When the section heading spans multiple lines, we don't want to treat them as separate but as a single heading.
         The method consumes a list of dicts and returns a _new_ list of dicts that is of the same length or shorter.
         """
-        result: List[dict] = []
+        return list(FlatAhbCsvReader.iter_merged_section_only_lines(raw_lines))
 
+    @staticmethod
+    def iter_merged_section_only_lines(raw_lines: Iterable[dict]) -> Iterator[dict]:
+        """
+        does the same as :meth:`merge_section_only_lines` but lazily, one line at a time
+        """
         # imagine the original list to be
         # 0,asd,qwertz,
         # 1,a very long section,
@@ -125,23 +212,29 @@ class FlatAhbCsvReader(FlatAhbReader):
                         # although we know there's no meaningful value here, we still need the keys with empty values
                         # so that to downstream code the line seems legit ➡ We re-add them.
                         artificial_merged_line[key] = ""
-                    result.append(artificial_merged_line)
+                    yield artificial_merged_line
                     merged_section_name = ""
                     number_of_lines_merged = 0
-                result.append(raw_line)
-        return result
+                yield raw_line
 
     def get_raw_rows(self, file_handle: TextIO) -> List[dict]:
         """
-        reads the input file and returns an iterator over raw lines.
-        Override this method if your data source is not a CSV file
+        reads the input file and returns a list of raw lines.
+        Override this method (or :meth:`iter_raw_rows`, which is also used in streaming mode) if your data source is
+        not a CSV file
+        """
+        return list(self.iter_raw_rows(file_handle))
+
+    def iter_raw_rows(self, file_handle: TextIO) -> Iterator[dict]:
+        """
+        reads the input file lazily and yields the raw lines
         """
         reader = csv.DictReader(file_handle, delimiter=self.delimiter)
         if not self.pruefidentifikator:
             self.pruefidentifikator = FlatAhbCsvReader._get_name_of_expression_column(reader.fieldnames)
         if not self.pruefidentifikator:
             raise ValueError("Cannot find column name for ahb expression")
-        return list(reader)
+        yield from reader
 
     def raw_ahb_row_to_ahbline(self, ahb_row: dict) -> Optional[AhbLine]:
         """
@@ -194,9 +287,9 @@ class FlatAhbCsvReader(FlatAhbReader):
             x = x.strip()
         if y is not None:
             y = y.strip()
-        if FlatAhbCsvReader._is_value_pool_entry(x) and not FlatAhbCsvReader._is_value_pool_entry(y):
-            return x, y or None
-        if FlatAhbCsvReader._is_value_pool_entry(x) and FlatAhbCsvReader._is_value_pool_entry(y):
+        if FlatAhbCsvReader._is_value_pool_entry(x):
+            if not FlatAhbCsvReader._is_value_pool_entry(y):
+                return x, y or None
             # Both look like a value pool entry. This typically happens e.g. for date qualifiers or code lists
             return x, y
         return y or None, x or None
@@ -208,17 +301,7 @@ class FlatAhbCsvReader(FlatAhbReader):
         """
         if not candidate:
             return False
-        if _value_pool_entry_pattern.match(candidate) is not None:
-            return True
-        # numbers alone might be value pool entries even if they don't match the regex
-        # we don't use "isdigit" because isdigit e.g. does not match '1.2'
-        if _numeric_value_pool_entry_pattern.match(candidate) is not None:
-            return True
-        if len(candidate) == 1 and candidate.upper() == candidate:
-            return True
-        if gabi_edifact_qualifier_pattern.match(candidate) is not None:
-            return True
-        return _ebd_code_pattern.match(candidate) is not None
+        return _is_value_pool_entry_memoized(candidate)
 
     @staticmethod
     def _is_segment_group(candidate: Optional[str]) -> bool:
@@ -243,6 +326,18 @@ class FlatAhbCsvReader(FlatAhbReader):
             return {}
         return {m[0]: m[1].strip() for m in FlatAhbCsvReader._bedingung_pattern.findall(candidate)}
 
+    @staticmethod
+    def _get_names_of_expression_columns(field_names: Optional[Sequence[str]]) -> List[str]:
+        """
+        Gets the names of all columns that hold AHB expressions (one per pruefidentifikator).
+
+        :param field_names: list of fieldnames
+        :return: all 5 digit field names (in the order of the columns)
+        """
+        if not field_names:
+            return []
+        return [field_name for field_name in field_names if _pruefi_pattern.match(field_name)]
+
     @staticmethod
     def _get_name_of_expression_column(field_names: Optional[Sequence[str]]) -> Optional[str]:
         """
@@ -264,13 +359,107 @@ class FlatAhbCsvReader(FlatAhbReader):
         Converts the content of the CSV file to a FlatAnwendungshandbuch.
         :return:
         """
+        lines = [row for row in self.iter_ahb_lines() if row.holds_any_information()]
         return FlatAnwendungshandbuch(
             meta=AhbMetaInformation(
                 pruefidentifikator=self.pruefidentifikator,  # type:ignore[arg-type]
                 maus_version=_VERSION,
             ),
-            lines=[row for row in self.rows if row.holds_any_information()],
+            lines=lines,
+        )
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_value_pool_entry_memoized(candidate: str) -> bool:
+    """
+    Classifies the (non-empty) candidate in a single regex pass, see :meth:`FlatAhbCsvReader._is_value_pool_entry`.
+    The same codes ('X', 'Z01', 'E01'...) occur in thousands of rows (of all CSV files read by the same process), so
+    the results are memoized in a bounded table.
+    """
+    # a single (upper case) character like "X" or "Z"; all other single characters that the patterns would match are
+    # not cased (digits, '-') anyway
+    if len(candidate) == 1:
+        return candidate.upper() == candidate
+    # numbers alone might be value pool entries even if they don't match the value pool entry pattern (e.g. '1.2');
+    # the combined pattern also covers GABi qualifiers and EBD codes
+    return _combined_value_pool_entry_pattern.match(candidate) is not None
+
+
+class MultiPruefiFlatAhbCsvReader(FlatAhbCsvReader):
+    """
+    reads csv files that contain the expression columns of multiple pruefidentifikators (e.g. all pruefis that are
+    described in the same AHB document) and returns one AHB per pruefidentifikator.
+    The file is read and every row is parsed and classified (value pool entry vs. name, segment group, section name,
+    bedingungen) only once; only the ahb expressions are taken from the respective column.
+    """
+
+    # pylint:disable=too-many-arguments
+    def __init__(
+        self,
+        file_path: Path,
+        pruefidentifikators: Optional[Sequence[str]] = None,
+        encoding="utf-8",
+        delimiter=",",
+        deterministic_guids: bool = False,
+    ):
+        """
+        :param pruefidentifikators: the names of the expression columns to read; defaults to all 5 digit columns
+        :param deterministic_guids: see :class:`FlatAhbCsvReader`
+        """
+        # the base class must not read the file; we do it ourselves (below) for all columns at once
+        super().__init__(
+            file_path, encoding=encoding, delimiter=delimiter, streaming=True, deterministic_guids=deterministic_guids
         )
+        self.pruefidentifikators: List[str] = list(pruefidentifikators or [])
+        self.rows_by_pruefidentifikator: Dict[str, List[AhbLine]] = {}
+        with open(file_path, "r", encoding=encoding) as infile:
+            for raw_row, ahb_line in self._iter_rows_and_ahb_lines(self.iter_raw_rows(infile)):
+                self._add_row(raw_row, ahb_line)
+        self.rows = self.rows_by_pruefidentifikator[self.pruefidentifikators[0]]
+        self.streaming = False  # iter_ahb_lines and to_flat_ahb now use the rows of the first pruefidentifikator
+
+    def iter_raw_rows(self, file_handle: TextIO) -> Iterator[dict]:
+        reader = csv.DictReader(file_handle, delimiter=self.delimiter)
+        if not self.pruefidentifikators:
+            self.pruefidentifikators = FlatAhbCsvReader._get_names_of_expression_columns(reader.fieldnames)
+        if not self.pruefidentifikators:
+            raise ValueError("Cannot find column names for ahb expressions")
+        missing_columns = [pruefi for pruefi in self.pruefidentifikators if pruefi not in (reader.fieldnames or [])]
+        if missing_columns:
+            raise ValueError(f"The expression columns {', '.join(missing_columns)} do not exist")
+        self.rows_by_pruefidentifikator = {pruefi: [] for pruefi in self.pruefidentifikators}
+        # raw_ahb_row_to_ahbline reads the expression of the first pruefidentifikator; see _add_row for the others
+        self.pruefidentifikator = self.pruefidentifikators[0]
+        yield from reader
+
+    def _add_row(self, raw_row: dict, ahb_line: AhbLine) -> None:
+        """
+        adds the line (which has been created for the first pruefidentifikator) and its copies with the ahb
+        expressions of the other pruefidentifikators
+        """
+        self.rows_by_pruefidentifikator[self.pruefidentifikators[0]].append(ahb_line)
+        for pruefidentifikator in self.pruefidentifikators[1:]:
+            if self.deterministic_guids:
+                assert ahb_line.index is not None
+                guid = FlatAhbCsvReader.create_deterministic_guid(pruefidentifikator, ahb_line.index, raw_row)
+            else:
+                guid = uuid.uuid4()
+            self.rows_by_pruefidentifikator[pruefidentifikator].append(
+                attrs.evolve(ahb_line, guid=guid, ahb_expression=raw_row.get(pruefidentifikator) or None)
+            )
+
+    def to_flat_ahbs(self) -> Dict[str, FlatAnwendungshandbuch]:
+        """
+        Converts the content of the CSV file to one FlatAnwendungshandbuch per pruefidentifikator.
+        :return: the AHBs by pruefidentifikator (in the order of the columns)
+        """
+        return {
+            pruefidentifikator: FlatAnwendungshandbuch(
+                meta=AhbMetaInformation(pruefidentifikator=pruefidentifikator, maus_version=_VERSION),
+                lines=[row for row in rows if row.holds_any_information()],
+            )
+            for pruefidentifikator, rows in self.rows_by_pruefidentifikator.items()
+        }
 
 
 @overload
@@ -2,8 +2,9 @@
 A module to parse Hochfrequenz .tree files and return them as Segment Group Hierarchy
 """
 
+import functools
 from pathlib import Path
-from typing import Union
+from typing import Literal, Optional, Union
 
 from more_itertools import first
 
@@ -40,13 +41,35 @@ SEGMENT_GROUP_KEY: "SG" INT|"UNH"|"UNB" // e.g. "SG12"
 %import common.WS
 %ignore WS  // WS = whitespace
 """
-_parser = Lark(GRAMMAR)
 
+TreeParserType = Literal["lalr", "earley"]  #: the lark parser algorithm; both accept the same .tree files
 
-def read_tree(tree: Union[str, Path]) -> Tree:
+
+@functools.lru_cache(maxsize=None)
+def get_tree_parser(parser_type: TreeParserType = "lalr", cache_path: Optional[Path] = None) -> Lark:
+    """
+    Returns the parser for the .tree grammar. It is created on the first call (and not on import) because compiling
+    the grammar takes a while.
+    The (default) LALR parser is much faster than lark's default Earley parser, especially on large .tree files.
+    :param parser_type: the parser algorithm; "earley" is the parser that has been used before
+    :param cache_path: (opt-in, LALR only) a file in which lark caches the compiled grammar, so that later processes
+    do not have to compile it again. Lark pickles the parser into this file; only use a path that no one else can
+    write to.
+    """
+    if parser_type == "lalr":
+        return Lark(GRAMMAR, parser="lalr", cache=str(cache_path) if cache_path is not None else False)
+    if parser_type == "earley":
+        if cache_path is not None:
+            raise ValueError("Lark can only cache LALR parsers")
+        return Lark(GRAMMAR)
+    raise ValueError(f"The parser type '{parser_type}' is not supported")
+
+
+def read_tree(tree: Union[str, Path], parser_type: TreeParserType = "lalr") -> Tree:
     """
     tries to parse the given tree using our .tree grammar.
     :param tree: string with the .tree content or the path to the tree file
+    :param parser_type: the parser algorithm (see :func:`get_tree_parser`)
     :return: a parsed tree
     """
     tree_str: str
@@ -57,7 +80,7 @@ def read_tree(tree: Union[str, Path]) -> Tree:
         tree_str = tree
     else:
         raise ValueError(f"The provided argument is neither a path nor a str but a {tree.__class__}")
-    parsed_tree = _parser.parse(tree_str)
+    parsed_tree = get_tree_parser(parser_type).parse(tree_str)
     return parsed_tree
 
 
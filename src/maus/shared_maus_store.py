@@ -0,0 +1,196 @@
+"""
+This module contains a read-only store for many MAUS s that can be shared between multiple (web worker) processes.
+The MAUS s are kept in the compact binary format (see :mod:`maus.binary_maus`) in a single buffer:
+- either a bytes object that is created in the master process before the workers are forked. The buffer is a single
+  Python object whose pages are never written to, so they stay shared (copy on write) between all workers.
+- or a :class:`multiprocessing.shared_memory.SharedMemory` segment that (e.g. spawned) processes attach to by name.
+Other than a dictionary of DeepAnwendungshandbuch objects, the store does not contain millions of small Python objects
+whose reference counts (and GC headers) are touched on access, which would un-share the pages after the fork.
+"""
+
+import gc
+import json
+import struct
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from maus.binary_maus import MausBinaryReader, dumps_maus_binary
+from maus.edifact import EdifactFormat, EdifactFormatVersion
+from maus.maus_provider import MausKey, MausProvider
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuch
+
+_MAGIC = b"MAUSSTOR"
+_header_struct = struct.Struct("<8sI")  # magic, length of the JSON encoded index
+
+
+class SharedMausStore:
+    """
+    A read-only collection of MAUS s in the binary format, stored in a single (optionally shared memory) buffer.
+    """
+
+    def __init__(self, buffer: Union[bytes, memoryview], shared_memory_segment: Optional[shared_memory.SharedMemory]):
+        """
+        use :meth:`build` or :meth:`attach` to create a store
+        """
+        self._buffer: Union[bytes, memoryview] = buffer
+        self._shared_memory = shared_memory_segment
+        magic, index_length = _header_struct.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError("The given data are no shared MAUS store")
+        index_start = _header_struct.size
+        raw_index = json.loads(bytes(buffer[index_start : index_start + index_length]).decode("utf-8"))
+        # the offsets in the index are relative to the start of the data section (right behind the index)
+        self._data_start: int = index_start + index_length
+        self._index: Dict[MausKey, Tuple[int, int]] = {
+            (EdifactFormat(edifact_format), EdifactFormatVersion(format_version), pruefi): (offset, length)
+            for edifact_format, format_version, pruefi, offset, length in raw_index
+        }
+
+    @staticmethod
+    def build(
+        maus_by_key: Mapping[MausKey, DeepAnwendungshandbuch], use_shared_memory: bool = False
+    ) -> "SharedMausStore":
+        """
+        serializes the given MAUS s into a new store.
+        :param use_shared_memory: if true, the data are copied into a new shared memory segment (see :attr:`name`);
+        otherwise they are kept in a bytes object (which is shared with child processes that are forked afterwards)
+        """
+        binaries: List[bytes] = [dumps_maus_binary(maus) for maus in maus_by_key.values()]
+        raw_index: List[Tuple[str, str, str, int, int]] = []
+        offset = 0
+        for (edifact_format, format_version, pruefi), binary in zip(maus_by_key.keys(), binaries):
+            raw_index.append((str(edifact_format), str(format_version), pruefi, offset, len(binary)))
+            offset += len(binary)
+        encoded_index = json.dumps(raw_index).encode("utf-8")
+        data = b"".join([_header_struct.pack(_MAGIC, len(encoded_index)), encoded_index, *binaries])
+        if not use_shared_memory:
+            return SharedMausStore(data, None)
+        segment = shared_memory.SharedMemory(create=True, size=len(data))
+        segment.buf[: len(data)] = data
+        return SharedMausStore(segment.buf[: len(data)], segment)
+
+    @staticmethod
+    def from_provider(
+        provider: MausProvider, keys: Iterable[MausKey], use_shared_memory: bool = False
+    ) -> "SharedMausStore":
+        """
+        loads the MAUS s with the given keys from the provider (e.g. all keys from get_available_maus of a
+        FileBasedMausProvider) and builds a store from them. Keys for which the provider returns None are skipped.
+        """
+        maus_by_key: Dict[MausKey, DeepAnwendungshandbuch] = {}
+        for key in keys:
+            maus = provider.get_maus(*key)
+            if maus is not None:
+                maus_by_key[key] = maus
+        return SharedMausStore.build(maus_by_key, use_shared_memory=use_shared_memory)
+
+    @staticmethod
+    def attach(name: str) -> "SharedMausStore":
+        """
+        attaches to the shared memory segment with the given name (see :attr:`name`), e.g. in a spawned process
+        """
+        segment = shared_memory.SharedMemory(name=name, create=False)
+        return SharedMausStore(segment.buf, segment)
+
+    @property
+    def name(self) -> Optional[str]:
+        """
+        the name of the shared memory segment; None if the store is not in shared memory
+        """
+        return self._shared_memory.name if self._shared_memory is not None else None
+
+    def keys(self) -> List[MausKey]:
+        """
+        returns the keys of all MAUS s in the store
+        """
+        return list(self._index.keys())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def get_reader(self, key: MausKey) -> Optional[MausBinaryReader]:
+        """
+        returns a reader that navigates the respective MAUS without copying or deserializing it as a whole
+        :return: None if the MAUS is not in the store
+        """
+        position = self._index.get(key)
+        if position is None:
+            return None
+        start = self._data_start + position[0]
+        return MausBinaryReader(memoryview(self._buffer)[start : start + position[1]])
+
+    def close(self) -> None:
+        """
+        detaches from the shared memory segment (if any); readers returned before must not be used anymore
+        """
+        if self._shared_memory is not None:
+            self._buffer = b""
+            self._shared_memory.close()
+
+    def unlink(self) -> None:
+        """
+        destroys the shared memory segment (call it once, in the process that built the store, after all workers
+        have detached)
+        """
+        if self._shared_memory is not None:
+            self._shared_memory.unlink()
+
+
+class SharedMausStoreProvider(MausProvider):
+    """
+    A MausProvider that returns the MAUS s from a :class:`SharedMausStore`.
+    By default every call of get_maus deserializes a new (private) DeepAnwendungshandbuch from the shared buffer and
+    the provider keeps no reference to it; the memory of the worker does not grow with the number of MAUS s it served.
+    With cache_deserialized_maus=True, each MAUS is deserialized only once per provider (i.e. once per worker process,
+    on its first access) and later calls return the same instance. That saves the deserialization on every call but
+    every worker then holds a private copy of the object graph of every MAUS it touched (just like a
+    FileBasedMausProvider inside a CachingMausProvider); see benchmarks/benchmark_shared_maus_store.py.
+    Do not modify cached MAUS s but use a :class:`maus.models.overlay.DeepAnwendungshandbuchOverlay` for request
+    specific inputs. To look up single nodes without deserializing the MAUS at all, use :meth:`get_reader`.
+    """
+
+    def __init__(self, store: SharedMausStore, cache_deserialized_maus: bool = False):
+        """
+        :param cache_deserialized_maus: if true, every MAUS is deserialized only once and kept (per process)
+        """
+        self.store: SharedMausStore = store
+        self.cache_deserialized_maus: bool = cache_deserialized_maus
+        self._maus_by_key: Dict[MausKey, DeepAnwendungshandbuch] = {}
+
+    def get_reader(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[MausBinaryReader]:
+        """
+        returns a reader on the shared buffer of the respective MAUS (see :meth:`SharedMausStore.get_reader`)
+        :return: None if the MAUS is not in the store
+        """
+        return self.store.get_reader((edifact_format, edifact_format_version, pruefidentifikator))
+
+    def get_maus(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[DeepAnwendungshandbuch]:
+        key: MausKey = (edifact_format, edifact_format_version, pruefidentifikator)
+        maus = self._maus_by_key.get(key)
+        if maus is not None:
+            return maus
+        reader = self.store.get_reader(key)
+        if reader is None:
+            return None
+        maus = reader.to_deep_ahb()
+        if self.cache_deserialized_maus:
+            self._maus_by_key[key] = maus
+        return maus
+
+
+def freeze_before_fork() -> None:
+    """
+    Collects garbage and moves all objects that exist so far (e.g. MAUS s that are cached in the master process) into
+    the permanent generation of the garbage collector. Call it in the master process right before the workers are
+    forked (e.g. in the gunicorn when_ready/pre_fork hook). The GC of the workers then no longer touches (and
+    thereby copies) the memory pages of these objects.
+    """
+    gc.collect()
+    gc.freeze()
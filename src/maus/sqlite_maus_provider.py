@@ -0,0 +1,253 @@
+"""
+This module contains a MausProvider that stores MAUS s in a local SQLite database.
+Other than (JSON) files, the database allows to answer questions like "which Pruefidentifikators use discriminator X"
+or "give me only segment group Y of MAUS Z" without deserializing entire MAUS s.
+Every segment group is stored in its own row (without its sub groups), the data elements are additionally indexed by
+their discriminator.
+"""
+
+import bisect
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from maus.edifact import EdifactFormat, EdifactFormatVersion
+from maus.maus_provider import MausKey, MausProvider
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuch, DeepAnwendungshandbuchSchema
+from maus.models.edifact_components import SegmentGroup, SegmentGroupSchema
+
+_CREATE_TABLES = """
+CREATE TABLE IF NOT EXISTS maus (
+    id INTEGER PRIMARY KEY,
+    edifact_format TEXT NOT NULL,
+    edifact_format_version TEXT NOT NULL,
+    pruefidentifikator TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    UNIQUE (edifact_format, edifact_format_version, pruefidentifikator)
+);
+CREATE TABLE IF NOT EXISTS segment_group (
+    id INTEGER PRIMARY KEY,
+    maus_id INTEGER NOT NULL REFERENCES maus(id) ON DELETE CASCADE,
+    parent_id INTEGER REFERENCES segment_group(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    discriminator TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segment_group_discriminator ON segment_group(discriminator, maus_id);
+CREATE INDEX IF NOT EXISTS segment_group_maus ON segment_group(maus_id, position);
+CREATE TABLE IF NOT EXISTS data_element (
+    maus_id INTEGER NOT NULL REFERENCES maus(id) ON DELETE CASCADE,
+    segment_group_id INTEGER NOT NULL REFERENCES segment_group(id) ON DELETE CASCADE,
+    discriminator TEXT NOT NULL,
+    data_element_id TEXT
+);
+CREATE INDEX IF NOT EXISTS data_element_discriminator ON data_element(discriminator, maus_id);
+"""
+
+
+class SqliteMausProvider(MausProvider):
+    """
+    A MAUS provider that reads the MAUS s from a SQLite database. Use :meth:`store_maus` to fill the database.
+    The provider holds a single connection that is shared (behind a lock) by all threads; call :meth:`close` (or use
+    a with block) when you're done.
+    """
+
+    def __init__(self, database_path: Union[Path, str]):
+        """
+        opens (and if necessary creates) the database
+        :param database_path: path of the database file (or ':memory:')
+        """
+        self.database_path = database_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(database_path), check_same_thread=False)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(_CREATE_TABLES)
+
+    def store_maus(
+        self,
+        edifact_format: EdifactFormat,
+        edifact_format_version: EdifactFormatVersion,
+        pruefidentifikator: str,
+        maus: DeepAnwendungshandbuch,
+    ) -> None:
+        """
+        stores the given maus in the database; an existing maus with the same key is replaced
+        """
+        maus_dict = DeepAnwendungshandbuchSchema().dump(maus)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM maus WHERE edifact_format=? AND edifact_format_version=? AND pruefidentifikator=?",
+                (str(edifact_format), str(edifact_format_version), pruefidentifikator),
+            )
+            maus_id = self._connection.execute(
+                "INSERT INTO maus (edifact_format, edifact_format_version, pruefidentifikator, meta) VALUES (?,?,?,?)",
+                (str(edifact_format), str(edifact_format_version), pruefidentifikator, json.dumps(maus_dict["meta"])),
+            ).lastrowid
+            position = 0
+            # depth first (pre-order), so that ordering by position restores the original order of the groups
+            groups_to_store: List[Any] = [(None, line) for line in reversed(maus_dict["lines"])]
+            while groups_to_store:
+                parent_id, segment_group_dict = groups_to_store.pop()
+                sub_groups = segment_group_dict["segment_groups"]
+                own_content = {**segment_group_dict, "segment_groups": None if sub_groups is None else []}
+                segment_group_id = self._connection.execute(
+                    "INSERT INTO segment_group (maus_id, parent_id, position, discriminator, content) "
+                    "VALUES (?,?,?,?,?)",
+                    (maus_id, parent_id, position, segment_group_dict["discriminator"], json.dumps(own_content)),
+                ).lastrowid
+                position += 1
+                self._connection.executemany(
+                    "INSERT INTO data_element (maus_id, segment_group_id, discriminator, data_element_id) "
+                    "VALUES (?,?,?,?)",
+                    [
+                        (maus_id, segment_group_id, data_element["discriminator"], data_element.get("data_element_id"))
+                        for segment in segment_group_dict["segments"] or []
+                        for data_element in segment["data_elements"]
+                        if data_element.get("discriminator") is not None
+                    ],
+                )
+                groups_to_store.extend((segment_group_id, sub_group) for sub_group in reversed(sub_groups or []))
+
+    def _get_maus_id(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[int]:
+        row = self._connection.execute(
+            "SELECT id FROM maus WHERE edifact_format=? AND edifact_format_version=? AND pruefidentifikator=?",
+            (str(edifact_format), str(edifact_format_version), pruefidentifikator),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _load_segment_group_dicts(self, maus_id: int, root_ids: Optional[List[int]] = None) -> List[dict]:
+        """
+        loads the segment groups of the given maus and nests them again.
+        :param root_ids: if given, only the subtrees of these segment groups are loaded (otherwise the entire maus)
+        :return: the (nested) dictionaries of the root groups (or of the groups with the root_ids, in the given order,
+        even if one of them is nested inside another one)
+        """
+        if root_ids is None:
+            rows = self._connection.execute(
+                "SELECT id, parent_id, content FROM segment_group WHERE maus_id=? ORDER BY position", (maus_id,)
+            ).fetchall()
+        else:
+            rows = self._connection.execute(
+                f"""WITH RECURSIVE subtree(id) AS (
+                    SELECT id FROM segment_group WHERE id IN ({",".join("?" for _ in root_ids)})
+                    UNION ALL
+                    SELECT segment_group.id FROM segment_group JOIN subtree ON segment_group.parent_id = subtree.id
+                )
+                SELECT id, parent_id, content FROM segment_group WHERE id IN (SELECT id FROM subtree)
+                ORDER BY position""",
+                root_ids,
+            ).fetchall()
+        dicts_by_id: Dict[int, dict] = {}
+        roots: List[dict] = []
+        for segment_group_id, parent_id, content in rows:
+            segment_group_dict = json.loads(content)
+            dicts_by_id[segment_group_id] = segment_group_dict
+            if parent_id in dicts_by_id:
+                dicts_by_id[parent_id]["segment_groups"].append(segment_group_dict)
+            else:
+                roots.append(segment_group_dict)
+        if root_ids is not None:
+            return [dicts_by_id[root_id] for root_id in root_ids]
+        return roots
+
+    def get_maus(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[DeepAnwendungshandbuch]:
+        with self._lock:
+            maus_id = self._get_maus_id(edifact_format, edifact_format_version, pruefidentifikator)
+            if maus_id is None:
+                return None
+            meta = self._connection.execute("SELECT meta FROM maus WHERE id=?", (maus_id,)).fetchone()[0]
+            lines = self._load_segment_group_dicts(maus_id)
+        return DeepAnwendungshandbuchSchema().load({"meta": json.loads(meta), "lines": lines})
+
+    def get_segment_groups(
+        self,
+        edifact_format: EdifactFormat,
+        edifact_format_version: EdifactFormatVersion,
+        pruefidentifikator: str,
+        discriminator: str,
+    ) -> List[SegmentGroup]:
+        """
+        loads only the segment groups (including their sub groups) with the given discriminator (e.g. 'SG4').
+        Like :meth:`.DeepAnwendungshandbuch.find_segment_groups`, a matching group that is nested inside another
+        matching group is returned, too (in addition to being a sub group of the outer one).
+        :return: the matching segment groups in the same order as find_segment_groups returns them; empty list if there
+        are none
+        """
+        with self._lock:
+            maus_id = self._get_maus_id(edifact_format, edifact_format_version, pruefidentifikator)
+            if maus_id is None:
+                return []
+            matches = self._connection.execute(
+                "SELECT id, parent_id, position FROM segment_group WHERE discriminator=? AND maus_id=?",
+                (discriminator, maus_id),
+            ).fetchall()
+            if not matches:
+                return []
+            line_positions = [
+                row[0]
+                for row in self._connection.execute(
+                    "SELECT position FROM segment_group WHERE maus_id=? AND parent_id IS NULL ORDER BY position",
+                    (maus_id,),
+                )
+            ]
+
+            def get_sort_key(match: Tuple[int, Optional[int], int]) -> Tuple[int, bool, int]:
+                # the same order as find_segment_groups: for every line, first its sub groups, then the line itself
+                _, parent_id, position = match
+                return bisect.bisect_right(line_positions, position), parent_id is None, position
+
+            root_ids = [match[0] for match in sorted(matches, key=get_sort_key)]
+            segment_group_dicts = self._load_segment_group_dicts(maus_id, root_ids)
+        return [SegmentGroupSchema().load(segment_group_dict) for segment_group_dict in segment_group_dicts]
+
+    def find_maus_using_discriminator(
+        self, discriminator: str, edifact_format_version: Optional[EdifactFormatVersion] = None
+    ) -> List[MausKey]:
+        """
+        returns the keys of all MAUS s that contain a segment group or data element with the given discriminator
+        :param edifact_format_version: if given, only MAUS s of this format version are considered
+        """
+        statement = """SELECT edifact_format, edifact_format_version, pruefidentifikator FROM maus WHERE (
+            id IN (SELECT maus_id FROM data_element WHERE discriminator=?)
+            OR id IN (SELECT maus_id FROM segment_group WHERE discriminator=?)
+        )"""
+        parameters: List[str] = [discriminator, discriminator]
+        if edifact_format_version is not None:
+            statement += " AND edifact_format_version=?"
+            parameters.append(str(edifact_format_version))
+        statement += " ORDER BY edifact_format_version, edifact_format, pruefidentifikator"
+        with self._lock:
+            rows = self._connection.execute(statement, parameters).fetchall()
+        return [(EdifactFormat(row[0]), EdifactFormatVersion(row[1]), row[2]) for row in rows]
+
+    def get_available_maus(self, edifact_format_version: Optional[EdifactFormatVersion] = None) -> List[MausKey]:
+        """
+        returns the keys of all MAUS s in the database
+        """
+        statement = "SELECT edifact_format, edifact_format_version, pruefidentifikator FROM maus"
+        parameters: List[str] = []
+        if edifact_format_version is not None:
+            statement += " WHERE edifact_format_version=?"
+            parameters.append(str(edifact_format_version))
+        statement += " ORDER BY edifact_format_version, edifact_format, pruefidentifikator"
+        with self._lock:
+            rows = self._connection.execute(statement, parameters).fetchall()
+        return [(EdifactFormat(row[0]), EdifactFormatVersion(row[1]), row[2]) for row in rows]
+
+    def close(self) -> None:
+        """
+        closes the database connection
+        """
+        self._connection.close()
+
+    def __enter__(self) -> "SqliteMausProvider":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
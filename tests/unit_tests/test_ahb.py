@@ -1,4 +1,5 @@
 import uuid
+from pathlib import Path
 from typing import List, Optional, Set
 
 import pytest  # type:ignore[import]
@@ -22,6 +23,7 @@ from maus.models.edifact_components import (
     SegmentGroup,
     ValuePoolEntry,
 )
+from maus.reader.flat_ahb_reader import FlatAhbCsvReader
 
 meta_x = AhbMetaInformation(pruefidentifikator="11042", maus_version="0.2.3")
 meta_y = AhbMetaInformation(pruefidentifikator="11043", maus_version="0.2.3")
@@ -698,6 +700,37 @@ class TestAhb:
         actual = FlatAnwendungshandbuch._sorted_lines_by_segment_groups(unsorted_input, sg_order)
         assert actual == expected_result
 
+    @pytest.mark.datafiles("./ahbs/FV2204/UTILMD/11042.csv")
+    def test_flat_ahb_line_index(self, datafiles):
+        flat_ahb = FlatAhbCsvReader(file_path=Path(datafiles / "11042.csv")).to_flat_ahb()
+        segment_groups = flat_ahb.get_segment_groups()
+        assert segment_groups == FlatAnwendungshandbuch._get_available_segment_groups(flat_ahb.lines)
+        line_index = flat_ahb.get_line_index()
+        assert flat_ahb.get_line_index() is line_index  # cached
+        assert list(line_index.segment_group_order.values()) == list(range(len(segment_groups)))
+        for segment_group_key in segment_groups:
+            assert flat_ahb.get_lines_by_segment_group(segment_group_key) == [
+                line for line in flat_ahb.lines if line.segment_group_key == segment_group_key
+            ]
+        assert flat_ahb.get_lines_by_segment_code("IDE") == [
+            line for line in flat_ahb.lines if line.segment_code == "IDE"
+        ]
+        assert flat_ahb.get_lines_by_segment_code("XYZ") == []
+        grouped = list(flat_ahb.iter_lines_grouped_by_segment_group())
+        assert [key for key, _ in grouped] == segment_groups
+
+        expected_sorted_lines = FlatAnwendungshandbuch._sorted_lines_by_segment_groups(flat_ahb.lines, segment_groups)
+        flat_ahb.sort_lines_by_segment_groups()
+        assert flat_ahb.lines == expected_sorted_lines
+        assert flat_ahb.get_line_index() is not line_index  # replacing the lines invalidates the index
+        assert sum(
+            stop - start for start, stop in flat_ahb.get_line_index().line_ranges_by_segment_group["SG4"]
+        ) == len(flat_ahb.get_lines_by_segment_group("SG4"))
+        assert len(flat_ahb.get_line_index().line_ranges_by_segment_group["SG4"]) == 1  # the SG4 lines are consecutive
+
+        flat_ahb.lines.append(flat_ahb.lines[0])
+        assert flat_ahb.get_lines_by_segment_group(flat_ahb.lines[0].segment_group_key)[-1] is flat_ahb.lines[0]
+
     @pytest.mark.parametrize(
         "original,expected",
         [
@@ -909,6 +942,98 @@ class TestAhb:
         actual = deep_ahb.get_all_value_pools()
         assert len(actual) == 1
 
+    def test_get_value_pools_with_invalid_entered_input(self):
+        value_pool = DataElementValuePool(
+            value_pool=[
+                ValuePoolEntry(qualifier="HELLO", meaning="world", ahb_expression="X"),
+                ValuePoolEntry(qualifier="MAUS", meaning="rocks", ahb_expression="X"),
+            ],
+            discriminator="baz",
+            entered_input="MAUS",
+            data_element_id="0123",
+        )
+        deep_ahb = DeepAnwendungshandbuch(
+            meta=AhbMetaInformation(pruefidentifikator="11042"),
+            lines=[
+                SegmentGroup(
+                    ahb_expression="expr A",
+                    discriminator="disc A",
+                    segments=[Segment(ahb_expression="expr B", discriminator="disc B", data_elements=[value_pool])],
+                )
+            ],
+        )
+        assert deep_ahb.get_value_pools_with_invalid_entered_input() == []
+        assert deep_ahb.get_value_pools_with_invalid_entered_input({"baz": "MOUSE"}) == [value_pool]
+        assert deep_ahb.get_value_pools_with_invalid_entered_input({"baz": None}) == []
+        value_pool.entered_input = "MOUSE"
+        assert deep_ahb.get_value_pools_with_invalid_entered_input() == [value_pool]
+        assert deep_ahb.get_value_pools_with_invalid_entered_input({"baz": "HELLO"}) == []
+
+    def test_expression_registry(self):
+        deep_ahb = DeepAnwendungshandbuch(
+            meta=AhbMetaInformation(pruefidentifikator="11042"),
+            lines=[
+                SegmentGroup(
+                    ahb_expression="Muss",
+                    discriminator="disc A",
+                    segments=[
+                        Segment(
+                            ahb_expression="Soll [1]",
+                            discriminator="disc B",
+                            data_elements=[
+                                DataElementFreeText(
+                                    ahb_expression="Muss",
+                                    discriminator="disc C",
+                                    data_element_id="0123",
+                                    entered_input=None,
+                                )
+                            ],
+                        )
+                    ],
+                )
+            ],
+        )
+        registry = deep_ahb.get_expression_registry()
+        assert registry.expressions == ("Muss", "Soll [1]")
+        assert len(registry) == 2
+        assert registry.id_of("Soll [1]") == 1
+        assert registry.expression_of(0) == "Muss"
+        assert "Muss" in registry
+        assert "Kann" not in registry
+        with pytest.raises(KeyError):
+            registry.id_of("Kann")
+        assert deep_ahb.get_expression_registry() is registry  # cached
+        deep_ahb.lines[0].segments[0].ahb_expression = "Kann"  # type:ignore[index]
+        assert deep_ahb.get_expression_registry() is registry
+        refreshed_registry = deep_ahb.get_expression_registry(refresh=True)
+        assert refreshed_registry.expressions == ("Kann", "Muss")
+        assert deep_ahb.get_expression_registry() is refreshed_registry
+
+    def test_strings_are_interned(self):
+        # build the strings at runtime, so that they are not constants of the same code object
+        entry_a = ValuePoolEntry(qualifier="".join(["E", "01"]), meaning="".join(["Ja"]), ahb_expression="X [1]"[:5])
+        entry_b = ValuePoolEntry(qualifier="E0" + "1", meaning="J" + "a", ahb_expression="".join(["X", " [1]"]))
+        assert entry_a.qualifier is entry_b.qualifier
+        assert entry_a.meaning is entry_b.meaning
+        assert entry_a.ahb_expression is entry_b.ahb_expression
+        line_a = AhbLine(**self._interning_line_kwargs("Muss" + " [2]"))
+        line_b = AhbLine(**self._interning_line_kwargs("".join(["Muss", " [2]"])))
+        assert line_a.ahb_expression is line_b.ahb_expression
+        assert line_a.section_name is line_b.section_name
+
+    @staticmethod
+    def _interning_line_kwargs(ahb_expression: str) -> dict:
+        return {
+            "ahb_expression": ahb_expression,
+            "segment_group_key": "SG4",
+            "segment_code": "IDE",
+            "data_element": "7495",
+            "value_pool_entry": None,
+            "name": None,
+            "guid": uuid.uuid4(),
+            "section_name": "".join(["Vorgang"]),
+        }
+
 
 """
     _find_this_sg2 = SegmentGroup(
@@ -1,9 +1,17 @@
+import csv
+import json
 from pathlib import Path
 from typing import Dict, List, Optional
 
+import attrs
 import pytest  # type:ignore[import]
 
-from maus.reader.flat_ahb_reader import FlatAhbCsvReader, check_file_can_be_parsed_as_ahb_csv
+from maus.models.anwendungshandbuch import FlatAnwendungshandbuchSchema
+from maus.reader.flat_ahb_reader import (
+    FlatAhbCsvReader,
+    MultiPruefiFlatAhbCsvReader,
+    check_file_can_be_parsed_as_ahb_csv,
+)
 
 
 class TestAhbCsvReader:
@@ -44,6 +52,13 @@ class TestAhbCsvReader:
             pytest.param("GABi-RLMoT", True),
             pytest.param("GABi-RLMmT", True),
             pytest.param("Gabi sitzt zu Hause ", False),
+            pytest.param("X", True),
+            pytest.param("x", False),
+            pytest.param("1.2", True),
+            pytest.param("293", True),
+            pytest.param("E_0401", True),
+            pytest.param("MP-ID", False),
+            pytest.param("Z01 ", False),
         ],
     )
     def test_is_value_pool_entry(self, value: Optional[str], expected_is_value_pool_entry: bool):
@@ -220,6 +235,97 @@ class TestAhbCsvReader:
         assert flat_ahb.get_segment_groups() == [None, "SG2", "SG3", "SG4", "SG5", "SG6", "SG8", "SG9", "SG10", "SG12"]
         assert all([line.index is not None for line in flat_ahb.lines]) is True
 
+    @pytest.mark.datafiles("./ahbs/FV2204/UTILMD/11042.csv")
+    def test_streaming_csv_file_reading_11042(self, datafiles):
+        path_to_csv: Path = datafiles / "11042.csv"
+        reader = FlatAhbCsvReader(file_path=path_to_csv)
+        streaming_reader = FlatAhbCsvReader(file_path=path_to_csv, streaming=True)
+        assert streaming_reader.rows == []
+        assert streaming_reader.pruefidentifikator is None  # the file has not been touched yet
+        lines = streaming_reader.iter_ahb_lines()
+        first_line = next(lines)
+        assert first_line.segment_code == "UNH"
+        assert streaming_reader.pruefidentifikator == "11042"
+        streamed_lines = [first_line, *lines]
+
+        def without_guid(line):
+            return attrs.evolve(line, guid=None)
+
+        assert [without_guid(line) for line in streamed_lines] == [without_guid(line) for line in reader.rows]
+        assert [without_guid(line) for line in reader.iter_ahb_lines()] == [without_guid(line) for line in reader.rows]
+        assert streaming_reader.extract_condition_texts() == reader.extract_condition_texts()
+        flat_ahb = reader.to_flat_ahb()
+        streamed_flat_ahb = streaming_reader.to_flat_ahb()  # reads the file once more
+        assert streamed_flat_ahb.meta == flat_ahb.meta
+        assert [without_guid(line) for line in streamed_flat_ahb.lines] == [
+            without_guid(line) for line in flat_ahb.lines
+        ]
+
+    @pytest.mark.datafiles("./ahbs/FV2204/UTILMD/11042.csv")
+    def test_multi_pruefi_csv_file_reading(self, datafiles, tmp_path: Path):
+        path_to_csv: Path = datafiles / "11042.csv"
+        # we add a second expression column that requires everything that is optional ('Kann') for 11042
+        multi_pruefi_csv = tmp_path / "11042_11043.csv"
+        with open(path_to_csv, "r", encoding="utf-8") as infile:
+            rows = list(csv.DictReader(infile))
+        field_names = list(rows[0].keys())
+        field_names.insert(field_names.index("11042") + 1, "11043")
+        for row in rows:
+            row["11043"] = "Muss" if row["11042"] == "Kann" else row["11042"]
+        with open(multi_pruefi_csv, "w", encoding="utf-8", newline="") as outfile:
+            writer = csv.DictWriter(outfile, fieldnames=field_names)
+            writer.writeheader()
+            writer.writerows(rows)
+
+        def without_guid(line):
+            return attrs.evolve(line, guid=None)
+
+        expected_11042 = FlatAhbCsvReader(file_path=path_to_csv).to_flat_ahb()
+        reader = MultiPruefiFlatAhbCsvReader(multi_pruefi_csv)
+        assert reader.pruefidentifikators == ["11042", "11043"]
+        flat_ahbs = reader.to_flat_ahbs()
+        assert list(flat_ahbs.keys()) == ["11042", "11043"]
+        assert flat_ahbs["11042"].meta == expected_11042.meta
+        assert [without_guid(line) for line in flat_ahbs["11042"].lines] == [
+            without_guid(line) for line in expected_11042.lines
+        ]
+        assert flat_ahbs["11043"].meta.pruefidentifikator == "11043"
+        assert [line.ahb_expression for line in flat_ahbs["11043"].lines] == [
+            "Muss" if line.ahb_expression == "Kann" else line.ahb_expression for line in expected_11042.lines
+        ]
+        assert "Kann" in [line.ahb_expression for line in flat_ahbs["11042"].lines]
+        assert len({line.guid for line in flat_ahbs["11042"].lines + flat_ahbs["11043"].lines}) == 2 * len(
+            expected_11042.lines
+        )
+        assert reader.extract_condition_texts() == FlatAhbCsvReader(file_path=path_to_csv).extract_condition_texts()
+        assert reader.to_flat_ahb().meta.pruefidentifikator == "11042"
+
+        only_11043 = MultiPruefiFlatAhbCsvReader(multi_pruefi_csv, pruefidentifikators=["11043"]).to_flat_ahbs()
+        assert list(only_11043.keys()) == ["11043"]
+        assert [without_guid(line) for line in only_11043["11043"].lines] == [
+            without_guid(line) for line in flat_ahbs["11043"].lines
+        ]
+        with pytest.raises(ValueError):
+            MultiPruefiFlatAhbCsvReader(multi_pruefi_csv, pruefidentifikators=["99999"])
+
+        deterministic_flat_ahbs = MultiPruefiFlatAhbCsvReader(multi_pruefi_csv, deterministic_guids=True).to_flat_ahbs()
+        single_pruefi_flat_ahb = FlatAhbCsvReader(file_path=path_to_csv, deterministic_guids=True).to_flat_ahb()
+        assert deterministic_flat_ahbs["11042"] == single_pruefi_flat_ahb
+
+    @pytest.mark.datafiles("./ahbs/FV2204/UTILMD/11042.csv")
+    @pytest.mark.parametrize("streaming", [True, False])
+    def test_deterministic_guids(self, datafiles, streaming: bool):
+        path_to_csv: Path = datafiles / "11042.csv"
+        flat_ahb = FlatAhbCsvReader(file_path=path_to_csv, deterministic_guids=True, streaming=streaming).to_flat_ahb()
+        second_flat_ahb = FlatAhbCsvReader(file_path=path_to_csv, deterministic_guids=True).to_flat_ahb()
+        assert flat_ahb == second_flat_ahb
+        assert json.dumps(FlatAnwendungshandbuchSchema().dump(flat_ahb)) == json.dumps(
+            FlatAnwendungshandbuchSchema().dump(second_flat_ahb)
+        )
+        assert len({line.guid for line in flat_ahb.lines}) == len(flat_ahb.lines)
+        random_flat_ahb = FlatAhbCsvReader(file_path=path_to_csv).to_flat_ahb()
+        assert {line.guid for line in random_flat_ahb.lines}.isdisjoint({line.guid for line in flat_ahb.lines})
+
     @pytest.mark.parametrize(
         "input_lines,expected_lines",
         [
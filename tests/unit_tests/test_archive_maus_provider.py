@@ -0,0 +1,74 @@
+"""
+Tests the maus provider that reads from zip and tar archives
+"""
+
+import gzip
+import json
+import lzma
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest  # type:ignore[import]
+
+from maus.archive_maus_provider import ArchiveMausProvider
+from maus.edifact import EdifactFormat, EdifactFormatVersion
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuchSchema
+
+
+class MyArchiveMausProvider(ArchiveMausProvider):
+    """
+    An archive based maus provider, just for this test.
+    """
+
+    def to_path(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Path:
+        return Path(f"{edifact_format_version}/{edifact_format}/{pruefidentifikator}_maus.json")
+
+
+def _add_to_tar(tar_file: tarfile.TarFile, member_name: str, content: bytes, tmp_path: Path) -> None:
+    member_path = tmp_path / "member"
+    member_path.write_bytes(content)
+    tar_file.add(member_path, arcname=member_name)
+
+
+class TestArchiveMausProvider:
+    """
+    Tests the ArchiveMausProvider
+    """
+
+    @pytest.mark.datafiles("./ahbs/FV2204/IFTSTA/21035_maus.json")
+    @pytest.mark.datafiles("./ahbs/FV2204/REQOTE/35001_maus.json")
+    @pytest.mark.parametrize("archive_type", ["zip", "tar"])
+    def test_archive_maus_provider(self, datafiles, tmp_path: Path, archive_type: str):
+        iftsta_content = (datafiles / "21035_maus.json").read_bytes()
+        reqote_content = (datafiles / "35001_maus.json").read_bytes()
+        archive_path = tmp_path / f"maus.{archive_type}"
+        if archive_type == "zip":
+            with zipfile.ZipFile(archive_path, "w") as zip_file:
+                zip_file.writestr("FV2210/IFTSTA/21035_maus.json", iftsta_content, compress_type=zipfile.ZIP_DEFLATED)
+                zip_file.writestr("FV2210/REQOTE/35001_maus.json.gz", gzip.compress(reqote_content))
+                zip_file.writestr("FV2210/README.md", "not a maus")
+        else:
+            with tarfile.open(archive_path, "w") as tar_file:
+                _add_to_tar(tar_file, "FV2210/IFTSTA/21035_maus.json", iftsta_content, tmp_path)
+                _add_to_tar(tar_file, "FV2210/REQOTE/35001_maus.json.xz", lzma.compress(reqote_content), tmp_path)
+        with MyArchiveMausProvider(archive_path) as provider:
+            assert provider.get_available_maus() == [
+                (EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035"),
+                (EdifactFormat.REQOTE, EdifactFormatVersion.FV2210, "35001"),
+            ]
+            iftsta = provider.get_maus(EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035")
+            assert iftsta == DeepAnwendungshandbuchSchema().load(json.loads(iftsta_content))
+            reqote = provider.get_maus(EdifactFormat.REQOTE, EdifactFormatVersion.FV2210, "35001")
+            assert reqote == DeepAnwendungshandbuchSchema().load(json.loads(reqote_content))
+            assert provider.get_maus(EdifactFormat.REQOTE, EdifactFormatVersion.FV2210, "35002") is None
+            assert provider.get_maus(EdifactFormat.IFTSTA, EdifactFormatVersion.FV2304, "21035") is None
+
+    def test_compressed_tar_files_are_rejected(self, tmp_path: Path):
+        archive_path = tmp_path / "maus.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tar_file:
+            _add_to_tar(tar_file, "FV2210/IFTSTA/21035_maus.json", b"{}", tmp_path)
+        with pytest.raises(tarfile.ReadError):
+            MyArchiveMausProvider(archive_path)
@@ -0,0 +1,108 @@
+"""
+Tests the asynchronous maus providers
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+import pytest  # type:ignore[import]
+
+from maus.async_maus_provider import AsyncFileBasedMausProvider, AsyncMausProvider, SyncMausProviderAdapter
+from maus.edifact import EdifactFormat, EdifactFormatVersion
+from maus.maus_provider import MausProvider
+from maus.models.anwendungshandbuch import AhbMetaInformation, DeepAnwendungshandbuch, DeepAnwendungshandbuchSchema
+
+
+class MyAsyncMausProvider(AsyncFileBasedMausProvider):
+    """
+    An async maus provider, just for this test.
+    """
+
+    def to_path(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Path:
+        return Path(f"{edifact_format_version}/{edifact_format}/{pruefidentifikator}_maus.json")
+
+
+class BlockingMausProvider(MausProvider):
+    """
+    A synchronous maus provider that blocks until it is released and counts its calls
+    """
+
+    def __init__(self):
+        self.released = threading.Event()
+        self.calls: List[str] = []
+
+    def get_maus(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[DeepAnwendungshandbuch]:
+        self.calls.append(pruefidentifikator)
+        self.released.wait(timeout=5)
+        return DeepAnwendungshandbuch(meta=AhbMetaInformation(pruefidentifikator=pruefidentifikator), lines=[])
+
+
+@pytest.fixture
+def maus_root_dir(tmp_path: Path) -> Path:
+    (tmp_path / "FV2104" / "UTILMD").mkdir(parents=True)
+    example_maus = DeepAnwendungshandbuch(
+        meta=AhbMetaInformation(pruefidentifikator="11001", maus_version="0.2.3"), lines=[]
+    )
+    with open(tmp_path / "FV2104/UTILMD/11001_maus.json", "w+", encoding="utf-8") as maus_test_outfile:
+        json.dump(DeepAnwendungshandbuchSchema().dump(example_maus), maus_test_outfile)
+    return tmp_path
+
+
+class TestAsyncMausProvider:
+    """
+    Tests the async file based maus provider and the adapter for synchronous maus providers
+    """
+
+    async def test_async_file_based_maus_provider(self, maus_root_dir: Path):
+        provider: AsyncMausProvider = MyAsyncMausProvider(base_path=maus_root_dir)
+        actual = await provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert actual is not None
+        assert actual.meta.maus_version == "0.2.3"
+        assert await provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11002") is None
+
+    async def test_async_file_based_maus_provider_with_process_pool(self, maus_root_dir: Path):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            provider = MyAsyncMausProvider(base_path=maus_root_dir, executor=executor)
+            actual = await provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert actual is not None
+        assert actual.meta.pruefidentifikator == "11001"
+
+    async def test_concurrent_requests_are_coalesced(self):
+        sync_provider = BlockingMausProvider()
+        provider = SyncMausProviderAdapter(sync_provider)
+        requests = [
+            asyncio.ensure_future(provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001"))
+            for _ in range(5)
+        ]
+        other_request = asyncio.ensure_future(
+            provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11002")
+        )
+        await asyncio.sleep(0.05)  # the event loop is not blocked while the provider is loading
+        assert not any(request.done() for request in requests)
+        sync_provider.released.set()
+        results = await asyncio.gather(*requests)
+        assert all(result is results[0] for result in results)
+        assert (await other_request).meta.pruefidentifikator == "11002"  # type:ignore[union-attr]
+        assert sorted(sync_provider.calls) == ["11001", "11002"]
+        # once the load is done, the next request loads again (caching is the job of the CachingMausProvider)
+        await provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert len(sync_provider.calls) == 3
+
+    async def test_cancelling_one_request_does_not_cancel_the_others(self):
+        sync_provider = BlockingMausProvider()
+        provider = SyncMausProviderAdapter(sync_provider)
+        cancelled = asyncio.ensure_future(provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001"))
+        other = asyncio.ensure_future(provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001"))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        sync_provider.released.set()
+        assert (await other) is not None
+        assert sync_provider.calls == ["11001"]
@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+
+import attrs
+import pytest  # type:ignore[import]
+
+from maus.binary_maus import (
+    BinaryNodeKind,
+    MausBinaryReader,
+    dump_maus_binary,
+    dumps_maus_binary,
+    load_maus_binary,
+    loads_maus_binary,
+)
+from maus.models.anwendungshandbuch import AhbMetaInformation, DeepAnwendungshandbuch, DeepAnwendungshandbuchSchema
+from maus.models.edifact_components import DataElementFreeText, Segment, SegmentGroup
+
+
+class TestBinaryMaus:
+    """
+    Tests the binary (de)serialization of MAUS s
+    """
+
+    @pytest.mark.datafiles("./ahbs/FV2204/IFTSTA/21035_maus.json")
+    @pytest.mark.datafiles("./ahbs/FV2204/REQOTE/35001_maus.json")
+    @pytest.mark.parametrize("maus_file_name", ["21035_maus.json", "35001_maus.json"])
+    def test_binary_roundtrip_is_json_equivalent(self, datafiles, maus_file_name: str):
+        with open(datafiles / maus_file_name, "r", encoding="utf-8") as maus_file:
+            original_json = json.load(maus_file)
+        maus = DeepAnwendungshandbuchSchema().load(original_json)
+        binary_path = Path(datafiles / "maus.bin")
+        dump_maus_binary(maus, binary_path)
+        assert binary_path.stat().st_size < len(json.dumps(original_json))
+        actual = load_maus_binary(binary_path)
+        assert actual == maus
+        assert DeepAnwendungshandbuchSchema().dump(actual) == DeepAnwendungshandbuchSchema().dump(maus)
+
+    def test_roundtrip_keeps_none_and_empty_lists_apart(self):
+        maus = DeepAnwendungshandbuch(
+            meta=AhbMetaInformation(pruefidentifikator="11042", description="Anmeldung MSB"),
+            lines=[
+                SegmentGroup(discriminator="root", ahb_expression="Muss", segments=None, segment_groups=[]),
+                SegmentGroup(
+                    discriminator="SG2",
+                    ahb_expression="Muss",
+                    segments=[
+                        Segment(
+                            discriminator="NAD",
+                            ahb_expression="Muss",
+                            segment_id="00003",
+                            data_elements=[
+                                DataElementFreeText(
+                                    discriminator=None,
+                                    ahb_expression="X",
+                                    data_element_id="3039",
+                                    entered_input="",
+                                    value_type=None,
+                                )
+                            ],
+                        )
+                    ],
+                    segment_groups=None,
+                ),
+            ],
+        )
+        assert loads_maus_binary(dumps_maus_binary(maus)) == maus
+
+    def test_roundtrip_keeps_the_ahb_line_index(self):
+        maus = DeepAnwendungshandbuch(
+            meta=AhbMetaInformation(pruefidentifikator="11042"),
+            lines=[
+                SegmentGroup(
+                    discriminator="SG4",
+                    ahb_expression="Muss",
+                    ahb_line_index=0,
+                    segments=[
+                        Segment(discriminator="IDE", ahb_expression="Muss", ahb_line_index=1, data_elements=[]),
+                        Segment(discriminator="STS", ahb_expression="Kann", data_elements=[]),
+                    ],
+                    segment_groups=[
+                        SegmentGroup(discriminator="SG5", ahb_expression="Muss", ahb_line_index=70000, segments=[])
+                    ],
+                ),
+            ],
+        )
+        binary_maus = dumps_maus_binary(maus)
+        actual = loads_maus_binary(binary_maus)
+        assert actual == maus
+        assert [sg.ahb_line_index for sg in actual.find_segment_groups(lambda _: True)] == [70000, 0]
+        assert [segment.ahb_line_index for segment in actual.find_segments()] == [1, None]
+        assert MausBinaryReader(binary_maus).lines[0].ahb_line_index == 0
+
+    def test_unsupported_nodes_are_rejected(self):
+        with attrs.validators.disabled():
+            maus = DeepAnwendungshandbuch(
+                meta=AhbMetaInformation(pruefidentifikator="11042"),
+                lines=["not a segment group"],  # type:ignore[list-item]
+            )
+        with pytest.raises(TypeError):
+            dumps_maus_binary(maus)
+
+    @pytest.mark.datafiles("./ahbs/FV2204/IFTSTA/21035_maus.json")
+    def test_navigation_without_building_the_object_graph(self, datafiles):
+        with open(datafiles / "21035_maus.json", "r", encoding="utf-8") as maus_file:
+            maus: DeepAnwendungshandbuch = DeepAnwendungshandbuchSchema().load(json.load(maus_file))
+        binary_path = Path(datafiles / "21035.maus.bin")
+        dump_maus_binary(maus, binary_path)
+        with MausBinaryReader.open(binary_path) as reader:
+            assert reader.meta == maus.meta
+            assert [line.discriminator for line in reader.lines] == [line.discriminator for line in maus.lines]
+            value_pool = maus.get_all_value_pools()[0]
+            node = reader.find_by_discriminator(value_pool.discriminator)  # type:ignore[arg-type]
+            assert node is not None
+            assert node.kind == BinaryNodeKind.DATA_ELEMENT_VALUE_POOL
+            assert [child.to_object() for child in node.children] == value_pool.value_pool
+            assert node.to_object() == value_pool
+            assert len(list(reader.iter_nodes(BinaryNodeKind.SEGMENT))) == len(maus.find_segments())
+
+    def test_invalid_data_are_rejected(self):
+        with pytest.raises(ValueError):
+            MausBinaryReader(b"\x00" * 100)
@@ -0,0 +1,97 @@
+"""
+Tests the format version wide condition catalog
+"""
+
+import json
+from pathlib import Path
+
+import pytest  # type:ignore[import]
+
+from maus.edifact import EdifactFormatVersion
+from maus.reader.condition_catalog import (
+    ConditionCatalog,
+    ConditionCatalogSchema,
+    build_condition_catalog,
+    read_condition_texts,
+)
+from maus.reader.flat_ahb_reader import FlatAhbCsvReader
+
+
+class TestConditionCatalog:
+    """
+    Tests the ConditionCatalog
+    """
+
+    @pytest.mark.datafiles("./ahbs/FV2204/UTILMD/11042.csv")
+    @pytest.mark.datafiles("./ahbs/FV2204/IFTSTA/21035.csv")
+    @pytest.mark.datafiles("./ahbs/FV2204/REQOTE/35001.csv")
+    def test_build_condition_catalog(self, datafiles):
+        csv_paths = [Path(datafiles / file_name) for file_name in ["35001.csv", "11042.csv", "21035.csv"]]
+        catalog = build_condition_catalog(csv_paths, format_version=EdifactFormatVersion.FV2210)
+        condition_texts_by_pruefi = {path.stem: FlatAhbCsvReader(path).extract_condition_texts() for path in csv_paths}
+        for pruefidentifikator, condition_texts in condition_texts_by_pruefi.items():
+            references, actual_condition_texts = read_condition_texts(datafiles / f"{pruefidentifikator}.csv")
+            assert actual_condition_texts == condition_texts
+            assert list(references.keys()) == [pruefidentifikator]
+            # only the conditions that are referenced in the expressions are attributed to the pruefidentifikator
+            expected = {key: text for key, text in condition_texts.items() if key in references[pruefidentifikator]}
+            assert expected.items() <= catalog.get_condition_texts(pruefidentifikator).items()
+        all_keys = set().union(*condition_texts_by_pruefi.values())
+        assert len(catalog) == len(all_keys)  # every condition is stored only once
+        # the 'Bedingung' column of 11042.csv also contains the conditions of other pruefis of the UTILMD AHB
+        assert len(catalog.get_condition_texts("11042")) < len(condition_texts_by_pruefi["11042"])
+        assert catalog.get_pruefidentifikators("101") == []
+        assert catalog.get_text("101") is not None
+        # 35001 references [50] whose text is only contained in 11042.csv
+        assert "50" not in condition_texts_by_pruefi["35001"]
+        assert "35001" in catalog.get_pruefidentifikators("50")
+        assert "931" in catalog
+        assert catalog.get_text("931") == "Format: ZZZ = +00"
+        assert catalog["931"].text == "Format: ZZZ = +00"
+        assert catalog.get_pruefidentifikators("931") == ["11042", "21035", "35001"]
+        assert catalog["494"].deviating_texts  # the wording differs between the AHBs
+        assert catalog.get_text("99999") is None
+        assert catalog.get_pruefidentifikators("99999") == []
+
+        serialized = json.dumps(ConditionCatalogSchema().dump(catalog))
+        deserialized = ConditionCatalogSchema().load(json.loads(serialized))
+        assert deserialized == catalog
+        assert deserialized.format_version == EdifactFormatVersion.FV2210
+        assert build_condition_catalog(reversed(csv_paths), format_version=EdifactFormatVersion.FV2210) == catalog
+
+    def test_add_condition_texts(self):
+        catalog = ConditionCatalog()
+        references = {"11042": {"1", "2"}, "11043": {"1", "2"}}
+        catalog.add_condition_texts({"1": "Wenn Strom", "2": "Wenn Gas"}, references)
+        catalog.add_condition_texts({"1": "Wenn Strom", "2": "Wenn Gas."}, {"11001": {"1", "2"}})
+        assert len(catalog) == 2
+        assert catalog.get_pruefidentifikators("1") == ["11001", "11042", "11043"]
+        assert catalog["2"].text == "Wenn Gas"
+        assert catalog["2"].deviating_texts == {"11001": "Wenn Gas."}
+        assert catalog.get_text("2") == "Wenn Gas"
+        assert catalog.get_text("2", "11001") == "Wenn Gas."
+        assert catalog.get_condition_texts("11001") == {"1": "Wenn Strom", "2": "Wenn Gas."}
+        assert catalog.get_condition_texts("11042") == {"1": "Wenn Strom", "2": "Wenn Gas"}
+
+    def test_conditions_are_attributed_to_the_referencing_pruefis_only(self, tmp_path: Path):
+        csv_path = tmp_path / "11042_11043.csv"
+        csv_path.write_text(
+            "\n".join(
+                [
+                    ",Segment Gruppe,Segment,Datenelement,Codes und Qualifier,Beschreibung,11042,11043,Bedingung",
+                    "0,SG4,IDE,,,,Muss [1],X [2] U [3],[1] Wenn Strom [2] Wenn Gas",
+                    "1,SG4,IDE,7402,,Vorgangsnummer,X [931],,[3] Wenn Tag [931] Format: ZZZ = +00",
+                ]
+            ),
+            encoding="utf-8",
+        )
+        references, condition_texts = read_condition_texts(csv_path)
+        assert references == {"11042": {"1", "931"}, "11043": {"2", "3"}}
+        assert condition_texts == {"1": "Wenn Strom", "2": "Wenn Gas", "3": "Wenn Tag", "931": "Format: ZZZ = +00"}
+        catalog = build_condition_catalog([csv_path])
+        assert catalog.get_pruefidentifikators("1") == ["11042"]
+        assert catalog.get_pruefidentifikators("2") == ["11043"]
+        assert catalog.get_pruefidentifikators("3") == ["11043"]
+        assert catalog.get_pruefidentifikators("931") == ["11042"]
+        assert catalog.get_condition_texts("11042") == {"1": "Wenn Strom", "931": "Format: ZZZ = +00"}
+        assert catalog.get_condition_texts("11043") == {"2": "Wenn Gas", "3": "Wenn Tag"}
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest  # type:ignore[import]
+
+from maus.content_hash import build_content_hash_tree, diff_content, have_equal_content
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuch, DeepAnwendungshandbuchSchema
+from maus.models.edifact_components import DataElementValuePool, Segment, SegmentGroup
+
+
+def _load_maus(maus_path: Path) -> DeepAnwendungshandbuch:
+    with open(maus_path, "r", encoding="utf-8") as maus_file:
+        return DeepAnwendungshandbuchSchema().load(json.load(maus_file))
+
+
+class TestContentHash:
+    """
+    Tests the content (merkle) hashing of MAUS s
+    """
+
+    @pytest.mark.datafiles("./ahbs/FV2204/IFTSTA/21035_maus.json")
+    def test_equal_content_ignores_line_index_without_modifying(self, datafiles):
+        maus_x = _load_maus(datafiles / "21035_maus.json")
+        maus_y = _load_maus(datafiles / "21035_maus.json")
+        maus_y.lines[0].ahb_line_index = 17
+        assert maus_x != maus_y
+        assert have_equal_content(maus_x, maus_y)
+        assert diff_content(maus_x, maus_y) == []
+        assert maus_y.lines[0].ahb_line_index == 17  # the comparison did not reset the index
+        assert build_content_hash_tree(maus_x).hexdigest() == build_content_hash_tree(maus_y).hexdigest()
+
+    @pytest.mark.datafiles("./ahbs/FV2204/IFTSTA/21035_maus.json")
+    def test_diff_only_reports_changed_subtrees(self, datafiles):
+        maus_x = _load_maus(datafiles / "21035_maus.json")
+        maus_y = _load_maus(datafiles / "21035_maus.json")
+        value_pool = maus_y.get_all_value_pools()[3]
+        value_pool.value_pool[0].meaning = "something else"
+        assert not have_equal_content(maus_x, maus_y)
+        differences = diff_content(maus_x, maus_y)
+        assert len(differences) == 1
+        assert differences[0].right is value_pool.value_pool[0]
+        assert differences[0].path[0] == "DeepAnwendungshandbuch"
+        assert value_pool.discriminator in differences[0].path
+        reference_snapshot = build_content_hash_tree(maus_x)  # built once, reused for every comparison
+        assert diff_content(reference_snapshot, maus_y) == differences
+        assert not have_equal_content(reference_snapshot, maus_y)
+        value_pool.value_pool[0].meaning = maus_x.get_all_value_pools()[3].value_pool[0].meaning
+        assert have_equal_content(reference_snapshot, maus_y)
+        assert have_equal_content(maus_y, reference_snapshot)
+
+    def test_none_and_empty_children_differ(self):
+        segment_group_x = SegmentGroup(discriminator="SG1", ahb_expression="X", segments=None)
+        segment_group_y = SegmentGroup(discriminator="SG1", ahb_expression="X", segments=[])
+        assert not have_equal_content(segment_group_x, segment_group_y)
+        differences = diff_content(segment_group_x, segment_group_y)
+        assert [d.path for d in differences] == [["SG1"]]
+
+    def test_diff_of_different_number_of_children(self):
+        segment_x = Segment(discriminator="NAD", ahb_expression="X", data_elements=[])
+        segment_y = Segment(
+            discriminator="NAD",
+            ahb_expression="X",
+            data_elements=[
+                DataElementValuePool(discriminator="foo", data_element_id="3035", value_pool=[], entered_input=None)
+            ],
+        )
+        differences = diff_content(segment_x, segment_y)
+        assert len(differences) == 1
+        assert differences[0].left is segment_x
@@ -506,3 +506,44 @@ class TestEdifactComponents:
             entered_input="asd",
         )
         assert data_element.has_value_pool_which_is_subset_of(candidate) == expected
+
+    def test_value_pool_qualifier_index(self):
+        data_element = DataElementValuePool(
+            value_pool=[
+                ValuePoolEntry(qualifier="E01", meaning="Einzug", ahb_expression="X"),
+                ValuePoolEntry(qualifier="E03", meaning="Wechsel", ahb_expression="X"),
+            ],
+            discriminator="foo",
+            data_element_id="0022",
+            entered_input=None,
+        )
+        assert data_element.get_value_pool_entry("E01") is data_element.value_pool[0]
+        assert data_element.is_allowed_qualifier("E03")
+        assert not data_element.is_allowed_qualifier("Z33")
+        assert not data_element.is_allowed_qualifier(None)
+        data_element.value_pool.append(ValuePoolEntry(qualifier="Z33", meaning="Auszug", ahb_expression="X"))
+        assert data_element.is_allowed_qualifier("Z33")  # the length changed, so the index is rebuilt
+        data_element.replace_value_pool({"E01": "EINZUG"})
+        assert data_element.is_allowed_qualifier("EINZUG")
+        assert not data_element.is_allowed_qualifier("E01")
+        data_element.value_pool = [ValuePoolEntry(qualifier="E02", meaning="Neuanlage", ahb_expression="X")]
+        assert data_element.is_allowed_qualifier("E02")
+        assert not data_element.is_allowed_qualifier("EINZUG")
+        data_element.value_pool[0].qualifier = "E05"
+        data_element.invalidate_qualifier_index()
+        assert data_element.is_allowed_qualifier("E05")
+
+    def test_qualifier_index_is_ignored_in_comparison(self):
+        def create_data_element() -> DataElementValuePool:
+            return DataElementValuePool(
+                value_pool=[ValuePoolEntry(qualifier="E01", meaning="Einzug", ahb_expression="X")],
+                discriminator="foo",
+                data_element_id="0022",
+                entered_input=None,
+            )
+
+        data_element_x = create_data_element()
+        data_element_y = create_data_element()
+        assert data_element_x.is_allowed_qualifier("E01")
+        assert data_element_x == data_element_y
+        assert "_qualifier_index" not in DataElementValuePoolSchema().dump(data_element_x)
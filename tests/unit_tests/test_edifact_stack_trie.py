@@ -0,0 +1,135 @@
+import json
+from typing import List
+
+import pytest  # type:ignore[import]
+
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuchSchema
+from maus.models.edifact_components import EdifactStack, EdifactStackLevel, parse_json_path
+from maus.models.edifact_stack_trie import EdifactStackTrie
+
+_vorgang = '$["Dokument"][0]["Nachricht"][0]["Vorgang"][0]'
+
+
+def _create_trie() -> EdifactStackTrie[str]:
+    trie: EdifactStackTrie[str] = EdifactStackTrie()
+    trie.add('$["Dokument"][0]["Nachricht"][0]', "Nachricht")
+    trie.add(_vorgang + '["Referenz"]', "Referenz")
+    trie.add(_vorgang + '["Meldepunkt"][0]["ID"]', "Meldepunkt ID")
+    trie.add(_vorgang + '["Meldepunkt"][1]["ID"]', "2nd Meldepunkt ID")
+    trie.add(_vorgang + '["Referenz"]', "Referenz again")
+    trie.add('$["Dokument"][0]["Nachricht"][0]["Absender"][0]["ID"]', "Absender ID")
+    return trie
+
+
+class TestEdifactStackTrie:
+    """
+    Tests the prefix tree over EdifactStacks
+    """
+
+    def test_get_and_contains(self):
+        trie = _create_trie()
+        assert len(trie) == 5
+        assert trie.get(_vorgang + '["Referenz"]') == ["Referenz", "Referenz again"]
+        assert trie.get(_vorgang) == []
+        assert _vorgang + '["Referenz"]' in trie
+        assert _vorgang not in trie  # only a prefix, no stack of its own
+        assert '$["Foo"]' not in trie
+        stack = EdifactStack(
+            levels=[
+                EdifactStackLevel(name="Dokument", is_groupable=True, index=0),
+                EdifactStackLevel(name="Nachricht", is_groupable=True),  # no index is treated as 0
+            ]
+        )
+        assert trie.get(stack) == ["Nachricht"]
+
+    def test_iter_subtree(self):
+        trie = _create_trie()
+        assert [value for _, value in trie.iter_subtree(_vorgang)] == [
+            "Referenz",
+            "Referenz again",
+            "Meldepunkt ID",
+            "2nd Meldepunkt ID",
+        ]
+        assert [path for path, _ in trie.iter_subtree(_vorgang + '["Meldepunkt"][1]')] == [
+            _vorgang + '["Meldepunkt"][1]["ID"]'
+        ]
+        assert len(list(trie.iter_subtree("$"))) == 6
+        assert not any(trie.iter_subtree('$["Foo"][0]'))
+
+    @pytest.mark.parametrize(
+        "stack, expected_longest_prefix, expected_parent",
+        [
+            pytest.param(_vorgang + '["Referenz"]', _vorgang + '["Referenz"]', '$["Dokument"][0]["Nachricht"][0]'),
+            pytest.param(
+                _vorgang + '["Foo"][0]["Bar"]',
+                '$["Dokument"][0]["Nachricht"][0]',
+                '$["Dokument"][0]["Nachricht"][0]',
+                id="unknown",
+            ),
+            pytest.param('$["Dokument"][0]["Nachricht"][0]', '$["Dokument"][0]["Nachricht"][0]', None),
+            pytest.param('$["Dokument"][1]', None, None, id="no prefix"),
+            pytest.param("$", None, None, id="root"),
+        ],
+    )
+    def test_longest_prefix_and_parent(self, stack: str, expected_longest_prefix, expected_parent):
+        trie = _create_trie()
+        assert trie.find_longest_prefix(stack) == expected_longest_prefix
+        assert trie.find_parent(stack) == expected_parent
+
+    @pytest.mark.datafiles("./ahbs/FV2204/IFTSTA/21035_maus.json")
+    def test_trie_from_maus_is_consistent_with_is_sub_stack_of(self, datafiles):
+        with open(datafiles / "21035_maus.json", "r", encoding="utf-8") as maus_file:
+            maus = DeepAnwendungshandbuchSchema().load(json.load(maus_file))
+        trie = EdifactStackTrie.from_maus(maus)
+        discriminators = [
+            data_element.discriminator
+            for data_element in maus.iter_data_elements()
+            if data_element.discriminator is not None and data_element.discriminator.startswith("$")
+        ]
+        assert len(trie) == len(set(discriminators))
+        parent = EdifactStack.from_json_path('$["Dokument"][0]["Nachricht"][0]["MP-ID Absender"][0]')
+        expected = [
+            discriminator
+            for discriminator in discriminators
+            if EdifactStack.from_json_path(discriminator).is_sub_stack_of(parent)
+        ]
+        actual = [data_element.discriminator for _, data_element in trie.iter_subtree(parent)]
+        assert expected
+        assert sorted(actual) == sorted(expected)
+
+    def test_parse_json_path_is_cached(self):
+        json_path = '$["Dokument"][0]["Nachricht"]'
+        assert parse_json_path(json_path) == (("Dokument", True, 0), ("Nachricht", False, None))
+        assert parse_json_path(json_path) is parse_json_path(json_path)
+        stack = EdifactStack.from_json_path(json_path)
+        assert stack.to_json_path() == json_path
+        assert stack.to_level_keys() == parse_json_path(json_path)
+        stack.levels[0].index = 1  # modifying the stack must not modify the cached result
+        assert EdifactStack.from_json_path(json_path).levels[0].index == 0
+
+    @pytest.mark.parametrize(
+        "levels",
+        [
+            pytest.param(
+                [EdifactStackLevel(name="Dokument", is_groupable=False, index=2)], id="non-groupable with index"
+            ),
+            pytest.param([EdifactStackLevel(name="Dokument", is_groupable=True)], id="groupable without index"),
+            pytest.param([EdifactStackLevel(name="Dokument", is_groupable=False)], id="non-groupable without index"),
+            pytest.param(
+                [
+                    EdifactStackLevel(name="Dokument", is_groupable=True, index=1),
+                    EdifactStackLevel(name="Nachricht", is_groupable=False, index=0),
+                    EdifactStackLevel(name="Vorgang", is_groupable=False),
+                ],
+                id="mixed",
+            ),
+        ],
+    )
+    def test_level_keys_match_the_parsed_json_path(self, levels: List[EdifactStackLevel]):
+        stack = EdifactStack(levels=levels)
+        json_path = stack.to_json_path()
+        assert stack.to_level_keys() == parse_json_path(json_path)
+        assert EdifactStack.from_json_path(json_path).to_level_keys() == stack.to_level_keys()
+        trie: EdifactStackTrie[str] = EdifactStackTrie()
+        trie.add(stack, "foo")
+        assert trie.get(json_path) == ["foo"]
@@ -0,0 +1,102 @@
+"""
+Tests the batch conversion of AHB CSV directories
+"""
+
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest  # type:ignore[import]
+
+from maus.models.anwendungshandbuch import FlatAnwendungshandbuchSchema
+from maus.reader.flat_ahb_batch_conversion import (
+    MANIFEST_FILE_NAME,
+    BatchConversionManifestSchema,
+    convert_csv_directory,
+)
+
+
+class TestFlatAhbBatchConversion:
+    """
+    Tests convert_csv_directory
+    """
+
+    @pytest.mark.datafiles("./ahbs/FV2204/UTILMD/11042.csv")
+    @pytest.mark.parametrize("use_process_pool", [True, False])
+    def test_convert_csv_directory(self, datafiles, tmp_path: Path, use_process_pool: bool):
+        input_directory = tmp_path / "csv"
+        output_directory = tmp_path / "json"
+        (input_directory / "FV2204" / "UTILMD").mkdir(parents=True)
+        shutil.copy(datafiles / "11042.csv", input_directory / "FV2204" / "UTILMD" / "11042.csv")
+        (input_directory / "broken.csv").write_text("foo,bar\n1,2\n", encoding="utf-8")
+
+        def convert():
+            if use_process_pool:
+                return convert_csv_directory(input_directory, output_directory)
+            with ThreadPoolExecutor() as executor:
+                return convert_csv_directory(input_directory, output_directory, executor=executor)
+
+        manifest = convert()
+        assert [result.csv_path for result in manifest.results] == ["FV2204/UTILMD/11042.csv", "broken.csv"]
+        result_11042, broken_result = manifest.results
+        assert result_11042.json_path == "FV2204/UTILMD/11042.json"
+        assert result_11042.pruefidentifikator == "11042"
+        assert result_11042.bedingungen["931"] == "Format: ZZZ = +00"
+        assert result_11042.cached is False
+        assert broken_result.json_path is None
+        assert broken_result.error is not None and "ValueError" in broken_result.error
+        with open(output_directory / "FV2204/UTILMD/11042.json", "r", encoding="utf-8") as json_file:
+            flat_ahb = FlatAnwendungshandbuchSchema().load(json.load(json_file))
+        assert flat_ahb.meta.pruefidentifikator == "11042"
+        with open(output_directory / MANIFEST_FILE_NAME, "r", encoding="utf-8") as manifest_file:
+            assert BatchConversionManifestSchema().load(json.load(manifest_file)) == manifest
+
+        (output_directory / "FV2204/UTILMD/11042.json").unlink()
+        second_manifest = convert()
+        assert second_manifest.results[0].cached is True
+        assert second_manifest.results[0].bedingungen == result_11042.bedingungen
+        assert second_manifest.results[1].cached is False  # errors are not cached
+        with open(output_directory / "FV2204/UTILMD/11042.json", "r", encoding="utf-8") as json_file:
+            assert FlatAnwendungshandbuchSchema().load(json.load(json_file)) == flat_ahb
+
+        with open(input_directory / "FV2204" / "UTILMD" / "11042.csv", "a", encoding="utf-8") as csv_file:
+            csv_file.write("\n")
+        third_manifest = convert()
+        assert third_manifest.results[0].cached is False
+        assert third_manifest.results[0].content_hash != result_11042.content_hash
+
+    @pytest.mark.datafiles("./ahbs/FV2204/IFTSTA/21035.csv")
+    def test_cache_key_contains_the_reader_options(self, datafiles, tmp_path: Path):
+        input_directory = tmp_path / "csv"
+        input_directory.mkdir()
+        shutil.copy(datafiles / "21035.csv", input_directory / "21035.csv")
+        cache_directory = tmp_path / "cache"
+        with ThreadPoolExecutor() as executor:
+            manifest = convert_csv_directory(input_directory, tmp_path / "json", cache_directory, executor)
+            assert manifest.results[0].cached is False
+            # a different delimiter must not return the cached result of the comma separated file
+            semicolon_manifest = convert_csv_directory(
+                input_directory, tmp_path / "json_semicolon", cache_directory, executor, delimiter=";"
+            )
+            assert semicolon_manifest.results[0].cached is False
+            assert semicolon_manifest.results[0].error is not None
+            assert (
+                convert_csv_directory(input_directory, tmp_path / "json", cache_directory, executor).results[0].cached
+            )
+
+    @pytest.mark.datafiles("./ahbs/FV2204/IFTSTA/21035.csv")
+    def test_incomplete_cache_entries_are_ignored(self, datafiles, tmp_path: Path):
+        input_directory = tmp_path / "csv"
+        input_directory.mkdir()
+        shutil.copy(datafiles / "21035.csv", input_directory / "21035.csv")
+        cache_directory = tmp_path / "cache"
+        with ThreadPoolExecutor() as executor:
+            convert_csv_directory(input_directory, tmp_path / "json", cache_directory, executor)
+            for cached_json_path in cache_directory.glob("*.json"):
+                if not cached_json_path.name.endswith(".result.json"):
+                    cached_json_path.unlink()
+            manifest = convert_csv_directory(input_directory, tmp_path / "json", cache_directory, executor)
+        assert manifest.results[0].cached is False
+        assert manifest.results[0].error is None
+        assert (tmp_path / "json" / "21035.json").exists()
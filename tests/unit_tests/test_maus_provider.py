@@ -2,13 +2,27 @@
 Test the maus provider as a concept and the file based maus provider as an implementation.
 """
 
+import bz2
+import gzip
 import json
+import lzma
+import os
+import threading
 from pathlib import Path
+from typing import List, Optional
 
 import pytest  # type:ignore[import]
 
 from maus.edifact import EdifactFormat, EdifactFormatVersion
-from maus.maus_provider import FileBasedMausProvider, MausProvider
+from maus.maus_provider import (
+    CachingMausProvider,
+    FileBasedMausProvider,
+    MausProvider,
+    MausProviderEvent,
+    MausProviderEventKind,
+    estimate_memory_size,
+)
+from maus.metrics import Histogram, MausMetricsRegistry
 from maus.models.anwendungshandbuch import AhbMetaInformation, DeepAnwendungshandbuch, DeepAnwendungshandbuchSchema
 
 
@@ -23,6 +37,36 @@ class MyFooBarMausProvider(FileBasedMausProvider):
         return Path(f"{edifact_format_version}/{edifact_format}/{pruefidentifikator}_maus.json")
 
 
+class CountingMausProvider(MausProvider):
+    """
+    A maus provider that creates MAUS s in memory and counts how often it has been called
+    """
+
+    def __init__(self, available_pruefis: Optional[List[str]] = None, wait_for: Optional[threading.Event] = None):
+        self.available_pruefis = available_pruefis or ["11001", "11002", "11003"]
+        self.wait_for = wait_for
+        self.calls: List[str] = []
+
+    def get_maus(
+        self, edifact_format: EdifactFormat, edifact_format_version: EdifactFormatVersion, pruefidentifikator: str
+    ) -> Optional[DeepAnwendungshandbuch]:
+        self.calls.append(pruefidentifikator)
+        if self.wait_for is not None:
+            self.wait_for.wait(timeout=5)
+        if pruefidentifikator not in self.available_pruefis:
+            return None
+        return DeepAnwendungshandbuch(meta=AhbMetaInformation(pruefidentifikator=pruefidentifikator), lines=[])
+
+
+def _write_maus(maus_root_dir, pruefidentifikator: str, maus_version: str) -> None:
+    (maus_root_dir / "FV2104" / "UTILMD").mkdir(parents=True, exist_ok=True)
+    example_maus = DeepAnwendungshandbuch(
+        meta=AhbMetaInformation(pruefidentifikator=pruefidentifikator, maus_version=maus_version), lines=[]
+    )
+    with open(maus_root_dir / f"FV2104/UTILMD/{pruefidentifikator}_maus.json", "w+") as maus_test_outfile:
+        json.dump(DeepAnwendungshandbuchSchema().dump(example_maus), maus_test_outfile)
+
+
 class TestMausProvider:
     """
     Test the file based maus provider
@@ -61,3 +105,256 @@ class TestMausProvider:
         )
         assert actual is not None  # because the file was found
         assert actual == example_maus  # is equivalent to the original because it was read from the file
+
+    def test_caching_maus_provider_caches_hits_and_misses(self):
+        counting_provider = CountingMausProvider()
+        provider = CachingMausProvider(counting_provider)
+        for _ in range(3):
+            assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001") is not None
+            assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "99999") is None
+        assert counting_provider.calls == ["11001", "99999"]
+        assert len(provider) == 2
+        first = provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001") is first
+        provider.invalidate(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert counting_provider.calls == ["11001", "99999", "11001"]
+        provider.clear()
+        assert len(provider) == 0
+
+    def test_caching_maus_provider_lru_eviction(self):
+        counting_provider = CountingMausProvider()
+        provider = CachingMausProvider(counting_provider, max_entries=2)
+        for pruefi in ["11001", "11002", "11001", "11003", "11001", "11002"]:
+            provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, pruefi)
+        # 11002 is evicted when 11003 is added, because 11001 has been used more recently
+        assert counting_provider.calls == ["11001", "11002", "11003", "11002"]
+        assert len(provider) == 2
+
+    def test_caching_maus_provider_memory_budget(self):
+        counting_provider = CountingMausProvider()
+        maus_size = estimate_memory_size(
+            counting_provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        )
+        counting_provider.calls.clear()
+        provider = CachingMausProvider(counting_provider, max_entries=None, max_memory_bytes=2 * maus_size)
+        for pruefi in ["11001", "11002", "11003"]:
+            provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, pruefi)
+        assert len(provider) == 2
+        assert provider.total_size <= 2 * maus_size
+
+    def test_caching_maus_provider_time_to_live(self):
+        now = [0.0]
+        counting_provider = CountingMausProvider()
+        provider = CachingMausProvider(counting_provider, time_to_live_seconds=10, clock=lambda: now[0])
+        provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        now[0] = 9
+        provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert len(counting_provider.calls) == 1
+        now[0] = 11
+        provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert len(counting_provider.calls) == 2
+
+    def test_caching_maus_provider_invalidates_changed_files(self, tmp_path: Path):
+        provider = CachingMausProvider(MyFooBarMausProvider(base_path=tmp_path), file_check_interval_seconds=0)
+        assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001") is None
+        _write_maus(tmp_path, "11001", "0.1.0")
+        actual = provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert actual is not None and actual.meta.maus_version == "0.1.0"
+        assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001") is actual
+        _write_maus(tmp_path, "11001", "0.2.0.0")  # different size
+        maus_path = tmp_path / "FV2104/UTILMD/11001_maus.json"
+        os.utime(maus_path, ns=(os.stat(maus_path).st_atime_ns, os.stat(maus_path).st_mtime_ns + 1_000_000))
+        actual = provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert actual is not None and actual.meta.maus_version == "0.2.0.0"
+
+    @pytest.mark.parametrize("file_check_interval_seconds", [10, None])
+    def test_caching_maus_provider_checks_files_at_most_once_per_interval(
+        self, tmp_path: Path, file_check_interval_seconds: Optional[float]
+    ):
+        now = [0.0]
+        provider = CachingMausProvider(
+            MyFooBarMausProvider(base_path=tmp_path),
+            clock=lambda: now[0],
+            file_check_interval_seconds=file_check_interval_seconds,
+        )
+        _write_maus(tmp_path, "11001", "0.1.0")
+        cached = provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert cached is not None
+        _write_maus(tmp_path, "11001", "0.2.0.0")  # different size
+        now[0] = 9
+        assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001") is cached
+        now[0] = 10
+        actual = provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        if file_check_interval_seconds is None:
+            assert actual is cached  # the file is never checked
+        else:
+            assert actual is not None and actual.meta.maus_version == "0.2.0.0"
+
+    def test_caching_maus_provider_prevents_stampedes(self):
+        release_loading = threading.Event()
+        counting_provider = CountingMausProvider(wait_for=release_loading)
+        provider = CachingMausProvider(counting_provider)
+        results: List[Optional[DeepAnwendungshandbuch]] = []
+
+        def get_maus():
+            results.append(provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001"))
+
+        threads = [threading.Thread(target=get_maus) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        release_loading.set()
+        for thread in threads:
+            thread.join()
+        assert counting_provider.calls == ["11001"]
+        assert len(results) == 8
+        assert all(result is results[0] for result in results)
+
+    def test_get_available_maus(self, tmp_path: Path):
+        _write_maus(tmp_path, "11001", "0.1.0")
+        _write_maus(tmp_path, "11002", "0.1.0")
+        (tmp_path / "FV2104" / "UTILMD" / "11003_something_else.json").write_text("{}")
+        (tmp_path / "FV2104" / "UTILMD" / "README.md").write_text("no maus")
+        provider = MyFooBarMausProvider(base_path=tmp_path)
+        expected = [
+            (EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001"),
+            (EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11002"),
+        ]
+        assert provider.get_available_maus() == expected
+        assert provider.get_available_maus(EdifactFormatVersion.FV2104) == expected
+        assert provider.get_available_maus(EdifactFormatVersion.FV2110) == []
+
+    def test_preload(self, tmp_path: Path):
+        for pruefi in ["11001", "11002", "11003"]:
+            _write_maus(tmp_path, pruefi, "0.1.0")
+        file_based_provider = MyFooBarMausProvider(base_path=tmp_path)
+        provider = CachingMausProvider(file_based_provider)
+        report = provider.preload(
+            EdifactFormatVersion.FV2104, formats=[EdifactFormat.UTILMD], pruefis={"11001", "11003"}
+        )
+        expected_keys = [
+            (EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001"),
+            (EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11003"),
+        ]
+        assert list(report.load_times.keys()) == expected_keys
+        assert all(load_time > 0 for load_time in report.load_times.values())
+        assert report.total_memory_bytes == sum(report.memory_sizes.values()) > 0
+        assert report.errors == {}
+        assert len(provider) == 2
+        # the preloaded MAUS s are served from the cache
+        file_based_provider.get_maus = None  # type:ignore[assignment,method-assign]
+        assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11003") is not None
+
+    def test_preload_reports_errors(self, tmp_path: Path):
+        _write_maus(tmp_path, "11001", "0.1.0")
+        (tmp_path / "FV2104/UTILMD/11002_maus.json").write_text("this is no json")
+        provider = CachingMausProvider(MyFooBarMausProvider(base_path=tmp_path))
+        report = provider.preload(EdifactFormatVersion.FV2104)
+        assert list(report.load_times.keys()) == [(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")]
+        assert list(report.errors.keys()) == [(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11002")]
+        with pytest.raises(TypeError, match="FileBasedMausProvider.*CountingMausProvider"):
+            CachingMausProvider(CountingMausProvider()).preload(EdifactFormatVersion.FV2104)
+
+    @pytest.mark.parametrize("max_memory_bytes", [None, 1_000_000])
+    def test_preload_accounts_the_same_size_as_get_maus(self, tmp_path: Path, max_memory_bytes: Optional[int]):
+        # pylint:disable=protected-access
+        _write_maus(tmp_path, "11001", "0.1.0")
+        preloading_provider = CachingMausProvider(
+            MyFooBarMausProvider(base_path=tmp_path), max_memory_bytes=max_memory_bytes
+        )
+        report = preloading_provider.preload(EdifactFormatVersion.FV2104)
+        loading_provider = CachingMausProvider(
+            MyFooBarMausProvider(base_path=tmp_path), max_memory_bytes=max_memory_bytes
+        )
+        loading_provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert preloading_provider._total_size == loading_provider._total_size
+        assert report.total_memory_bytes > 0
+
+    def test_directory_index(self, tmp_path: Path, monkeypatch):
+        _write_maus(tmp_path, "11001", "0.1.0")
+        provider = MyFooBarMausProvider(base_path=tmp_path, use_directory_index=True)
+        assert provider.get_available_maus() == [(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")]
+        assert provider.get_available_maus(EdifactFormatVersion.FV2110) == []
+        assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001") is not None
+
+        def fail_if_called(*args, **kwargs):
+            raise AssertionError("misses must not touch the file system")
+
+        with monkeypatch.context() as patch:
+            patch.setattr("maus.maus_provider.load_maus_file", fail_if_called)
+            assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11002") is None
+            assert provider.get_full_path(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11002") is None
+        _write_maus(tmp_path, "11002", "0.1.0")
+        assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11002") is None  # not yet indexed
+        provider.refresh_directory_index()
+        assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11002") is not None
+        assert len(provider.get_available_maus()) == 2
+
+    @pytest.mark.parametrize("use_directory_index", [False, True])
+    @pytest.mark.parametrize(
+        "compression_suffix, compress", [(".gz", gzip.compress), (".bz2", bz2.compress), (".xz", lzma.compress)]
+    )
+    def test_compressed_maus_files(self, tmp_path: Path, use_directory_index: bool, compression_suffix: str, compress):
+        _write_maus(tmp_path, "11001", "0.1.0")
+        plain_path = tmp_path / "FV2104/UTILMD/11001_maus.json"
+        compressed_path = plain_path.with_name(plain_path.name + compression_suffix)
+        compressed_path.write_bytes(compress(plain_path.read_bytes()))
+        plain_path.unlink()
+        provider = MyFooBarMausProvider(base_path=tmp_path, use_directory_index=use_directory_index)
+        assert provider.get_available_maus() == [(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")]
+        assert provider.get_full_path(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001") == compressed_path
+        actual = provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert actual is not None and actual.meta.maus_version == "0.1.0"
+        assert provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11002") is None
+        _write_maus(tmp_path, "11001", "0.2.0")  # the plain file takes precedence
+        provider.refresh_directory_index()
+        actual = provider.get_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        assert actual is not None and actual.meta.maus_version == "0.2.0"
+
+    def test_metrics(self, tmp_path: Path):
+        _write_maus(tmp_path, "11001", "0.1.0")
+        _write_maus(tmp_path, "11002", "0.1.0")
+        metrics = MausMetricsRegistry(measure_object_sizes=True)
+        events: List[MausProviderEvent] = []
+        metrics.add_listener(events.append)
+        file_based_provider = MyFooBarMausProvider(base_path=tmp_path, metrics_callback=metrics)
+        provider = CachingMausProvider(file_based_provider, max_entries=1, metrics_callback=metrics)
+        key_11001 = (EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11001")
+        key_11002 = (EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11002")
+        key_11003 = (EdifactFormat.UTILMD, EdifactFormatVersion.FV2104, "11003")
+        for key in [key_11001, key_11001, key_11002, key_11003]:
+            provider.get_maus(*key)
+        assert [event.kind for event in events] == [
+            MausProviderEventKind.LOADED,
+            MausProviderEventKind.CACHE_MISS,
+            MausProviderEventKind.CACHE_HIT,
+            MausProviderEventKind.LOADED,
+            MausProviderEventKind.EVICTED,  # max_entries=1
+            MausProviderEventKind.CACHE_MISS,
+            MausProviderEventKind.NOT_FOUND,
+            MausProviderEventKind.EVICTED,
+            MausProviderEventKind.CACHE_MISS,
+        ]
+        assert metrics.cache_hits == {key_11001: 1}
+        assert metrics.cache_misses == {key_11001: 1, key_11002: 1, key_11003: 1}
+        assert metrics.loads == {key_11001: 1, key_11002: 1}
+        assert metrics.not_found == {key_11003: 1}
+        assert metrics.evictions == {"max_entries": 2}
+        assert metrics.object_sizes.keys() == {key_11001, key_11002}
+        assert all(size > 0 for size in metrics.object_sizes.values())
+        assert metrics.latencies["json_parse"].count == 2
+        assert metrics.latencies["load"].count == 2
+        assert metrics.latencies["cache_miss"].count == 3
+        snapshot = metrics.snapshot()
+        metrics.reset()
+        assert not metrics.cache_hits and metrics.latencies["load"].count == 0
+        assert snapshot["cache_hits"] == {key_11001: 1}
+
+    def test_histogram(self):
+        histogram = Histogram(bucket_bounds=(1, 2))
+        assert histogram.mean is None
+        for value in [0.5, 1, 1.5, 3]:
+            histogram.observe(value)
+        assert histogram.bucket_counts == [2, 1, 1]
+        assert histogram.count == 4
+        assert histogram.mean == 1.5
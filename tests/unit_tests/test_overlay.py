@@ -0,0 +1,102 @@
+import copy
+
+from maus.models.anwendungshandbuch import AhbMetaInformation, DeepAhbInputReplacement, DeepAnwendungshandbuch
+from maus.models.edifact_components import (
+    DataElementFreeText,
+    DataElementValuePool,
+    Segment,
+    SegmentGroup,
+    ValuePoolEntry,
+)
+from maus.models.overlay import DeepAnwendungshandbuchOverlay, OverlaidDataElement
+
+_shared_maus = DeepAnwendungshandbuch(
+    meta=AhbMetaInformation(pruefidentifikator="11042"),
+    lines=[
+        SegmentGroup(
+            discriminator="SG4",
+            ahb_expression="Muss",
+            segments=[
+                Segment(
+                    discriminator="IDE",
+                    ahb_expression="Muss",
+                    data_elements=[
+                        DataElementValuePool(
+                            discriminator="SG4->IDE->7495",
+                            data_element_id="7495",
+                            value_pool=[ValuePoolEntry(qualifier="24", meaning="Vorgang", ahb_expression="X")],
+                            entered_input=None,
+                        ),
+                        DataElementFreeText(
+                            discriminator="SG4->IDE->7402",
+                            data_element_id="7402",
+                            ahb_expression="X",
+                            entered_input="original",
+                        ),
+                    ],
+                )
+            ],
+            segment_groups=[],
+        )
+    ],
+)
+
+
+class TestOverlay:
+    """
+    Tests the overlay of entered inputs on a shared MAUS
+    """
+
+    def test_overlays_do_not_modify_the_shared_maus(self):
+        shared_maus = copy.deepcopy(_shared_maus)
+        overlay_a = DeepAnwendungshandbuchOverlay(shared_maus)
+        overlay_b = DeepAnwendungshandbuchOverlay(shared_maus, {"SG4->IDE->7402": "from b"})
+        overlay_a.set_entered_input("SG4->IDE->7495", "24")
+        assert [de.entered_input for de in overlay_a.iter_data_elements()] == ["24", "original"]
+        assert [de.entered_input for de in overlay_b.iter_data_elements()] == [None, "from b"]
+        assert shared_maus == _shared_maus
+        value_pools = overlay_a.get_all_value_pools()
+        assert len(value_pools) == 1
+        assert value_pools[0].discriminator == "SG4->IDE->7495"
+        assert value_pools[0].value_pool == shared_maus.get_all_value_pools()[0].value_pool
+        assert [ft.entered_input for ft in overlay_b.get_all_free_texts()] == ["from b"]
+
+    def test_value_pools_with_invalid_entered_input_carry_the_overlaid_input(self):
+        shared_maus = copy.deepcopy(_shared_maus)
+        overlay = DeepAnwendungshandbuchOverlay(shared_maus, {"SG4->IDE->7495": "MOUSE"})
+        invalid_value_pools = overlay.get_value_pools_with_invalid_entered_input()
+        assert len(invalid_value_pools) == 1
+        assert isinstance(invalid_value_pools[0], OverlaidDataElement)
+        assert invalid_value_pools[0].discriminator == "SG4->IDE->7495"
+        assert invalid_value_pools[0].entered_input == "MOUSE"
+        assert shared_maus.get_all_value_pools()[0].entered_input is None
+        overlay.set_entered_input("SG4->IDE->7495", "24")
+        assert overlay.get_value_pools_with_invalid_entered_input() == []
+
+    def test_traversal_api_is_the_same(self):
+        overlay = DeepAnwendungshandbuchOverlay(_shared_maus)
+        assert overlay.find_segment_groups(lambda _: True) == _shared_maus.find_segment_groups(lambda _: True)
+        assert overlay.find_segments() == _shared_maus.find_segments()
+        no_group = lambda sg: sg.discriminator == "SG99"  # pylint:disable=unnecessary-lambda-assignment
+        assert list(overlay.iter_segments(no_group)) == _shared_maus.find_segments(no_group)
+        assert overlay.get_all_expressions() == _shared_maus.get_all_expressions()
+        assert overlay.meta == _shared_maus.meta
+
+    def test_replace_inputs_based_on_discriminator_is_equivalent_to_in_place_replacement(self):
+        def replacement_func(discriminator: str) -> DeepAhbInputReplacement:
+            if discriminator == "SG4->IDE->7495":
+                return DeepAhbInputReplacement(replacement_found=True, input_replacement="24")
+            if discriminator == "SG4->IDE->7402":
+                return DeepAhbInputReplacement(replacement_found=True, input_replacement=None)
+            return DeepAhbInputReplacement(replacement_found=False, input_replacement=None)
+
+        shared_maus = copy.deepcopy(_shared_maus)
+        overlay = DeepAnwendungshandbuchOverlay(shared_maus)
+        overlay.replace_inputs_based_on_discriminator(replacement_func)
+        assert overlay.entered_inputs == {"SG4->IDE->7495": "24", "SG4->IDE->7402": None}
+        assert shared_maus == _shared_maus
+
+        expected = copy.deepcopy(_shared_maus)
+        expected.replace_inputs_based_on_discriminator(replacement_func)
+        assert overlay.to_deep_ahb() == expected
+        assert shared_maus == _shared_maus
@@ -254,3 +254,123 @@ class TestSearchingInModels:
     def test_get_all_expressions(self, deep_ahb: DeepAnwendungshandbuch, expected_result: List[str]):
         actual = deep_ahb.get_all_expressions()
         assert actual == expected_result
+
+    def test_iterators_visit_every_node_exactly_once(self):
+        # the two SG2 are equal (in the attrs sense) but are still two distinct nodes in the tree
+        deep_ahb = DeepAnwendungshandbuch(
+            meta=AhbMetaInformation(pruefidentifikator="11111"),
+            lines=[
+                SegmentGroup(
+                    discriminator="SG1",
+                    ahb_expression="Foo",
+                    segments=[
+                        Segment(
+                            discriminator="UNH",
+                            ahb_expression="Muss",
+                            data_elements=[
+                                DataElementFreeText(
+                                    discriminator="a", ahb_expression="X", entered_input=None, data_element_id="0062"
+                                )
+                            ],
+                        )
+                    ],
+                    segment_groups=[
+                        SegmentGroup(
+                            discriminator="SG2",
+                            ahb_expression="Bar",
+                            segments=[
+                                Segment(
+                                    discriminator="NAD",
+                                    ahb_expression="Muss",
+                                    data_elements=[
+                                        DataElementValuePool(
+                                            discriminator="b",
+                                            value_pool=[
+                                                ValuePoolEntry(qualifier="MS", meaning="Absender", ahb_expression="X")
+                                            ],
+                                            entered_input=None,
+                                            data_element_id="3035",
+                                        )
+                                    ],
+                                )
+                            ],
+                        ),
+                        SegmentGroup(discriminator="SG2", ahb_expression="Bar", segments=[]),
+                    ],
+                ),
+            ],
+        )
+        # the order is the same as before the iterators were introduced: sub groups before the root line
+        assert [sg.discriminator for sg in deep_ahb.iter_segment_groups()] == ["SG2", "SG2", "SG1"]
+        assert [seg.discriminator for seg in deep_ahb.iter_segments()] == ["NAD", "UNH"]
+        assert [de.discriminator for de in deep_ahb.iter_data_elements()] == ["b", "a"]
+        assert len(deep_ahb.find_segment_groups(lambda sg: sg.discriminator == "SG2")) == 2
+        assert [seg.discriminator for seg in deep_ahb.find_segments()] == ["NAD", "UNH"]
+        assert [vp.discriminator for vp in deep_ahb.get_all_value_pools()] == ["b"]
+
+    def test_get_all_value_pools_skips_duplicate_discriminators(self):
+        def create_value_pool(qualifier: str) -> DataElementValuePool:
+            return DataElementValuePool(
+                discriminator="b",
+                value_pool=[ValuePoolEntry(qualifier=qualifier, meaning="Foo", ahb_expression="X")],
+                entered_input=None,
+                data_element_id="3035",
+            )
+
+        deep_ahb = DeepAnwendungshandbuch(
+            meta=AhbMetaInformation(pruefidentifikator="11111"),
+            lines=[
+                SegmentGroup(
+                    discriminator="SG1",
+                    ahb_expression="Foo",
+                    segments=[
+                        Segment(discriminator="NAD", ahb_expression="Muss", data_elements=[create_value_pool("MS")]),
+                        Segment(discriminator="NAD", ahb_expression="Muss", data_elements=[create_value_pool("MR")]),
+                    ],
+                )
+            ],
+        )
+        actual = deep_ahb.get_all_value_pools()
+        assert len(actual) == 1
+        assert actual[0].value_pool[0].qualifier == "MS"
+
+    def test_find_segments_only_returns_segments_of_matching_groups(self):
+        deep_ahb = DeepAnwendungshandbuch(
+            meta=AhbMetaInformation(pruefidentifikator="11111"),
+            lines=[
+                SegmentGroup(
+                    discriminator="SG1",
+                    ahb_expression="Foo",
+                    segments=[Segment(discriminator="UNH", ahb_expression="Muss", data_elements=[])],
+                    segment_groups=[
+                        SegmentGroup(
+                            discriminator="SG2",
+                            ahb_expression="Bar",
+                            segments=[Segment(discriminator="NAD", ahb_expression="Muss", data_elements=[])],
+                            segment_groups=[
+                                SegmentGroup(
+                                    discriminator="SG4",
+                                    ahb_expression="Bar",
+                                    segments=[Segment(discriminator="CTA", ahb_expression="Muss", data_elements=[])],
+                                )
+                            ],
+                        ),
+                        SegmentGroup(
+                            discriminator="SG3",
+                            ahb_expression="Baz",
+                            segments=[Segment(discriminator="LOC", ahb_expression="Muss", data_elements=[])],
+                        ),
+                    ],
+                ),
+            ],
+        )
+        # segments in the root lines are always considered, those in sub groups of matching groups, too
+        # the segments of the matching sub groups come first, those of the root lines (if they don't match) last
+        actual = deep_ahb.find_segments(lambda sg: sg.discriminator == "SG2")
+        assert [seg.discriminator for seg in actual] == ["NAD", "CTA", "UNH"]
+        actual = deep_ahb.find_segments(lambda sg: sg.discriminator == "SG3")
+        assert [seg.discriminator for seg in actual] == ["LOC", "UNH"]
+        actual = deep_ahb.find_segments(lambda sg: sg.discriminator == "SG1")
+        assert [seg.discriminator for seg in actual] == ["UNH", "NAD", "CTA", "LOC"]
+        actual = deep_ahb.find_segments(lambda sg: sg.discriminator == "SG2", lambda seg: seg.discriminator != "UNH")
+        assert [seg.discriminator for seg in actual] == ["NAD", "CTA"]
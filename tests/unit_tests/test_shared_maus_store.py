@@ -0,0 +1,58 @@
+"""
+Tests the store that shares MAUS s between multiple processes
+"""
+
+import json
+
+import pytest  # type:ignore[import]
+
+from maus.edifact import EdifactFormat, EdifactFormatVersion
+from maus.models.anwendungshandbuch import DeepAnwendungshandbuchSchema
+from maus.shared_maus_store import SharedMausStore, SharedMausStoreProvider
+
+
+class TestSharedMausStore:
+    """
+    Tests the SharedMausStore and the SharedMausStoreProvider
+    """
+
+    @pytest.mark.datafiles("./ahbs/FV2204/IFTSTA/21035_maus.json")
+    @pytest.mark.datafiles("./ahbs/FV2204/REQOTE/35001_maus.json")
+    @pytest.mark.parametrize("use_shared_memory", [False, True])
+    def test_shared_maus_store(self, datafiles, use_shared_memory: bool):
+        with open(datafiles / "21035_maus.json", "r", encoding="utf-8") as maus_file:
+            iftsta = DeepAnwendungshandbuchSchema().load(json.load(maus_file))
+        with open(datafiles / "35001_maus.json", "r", encoding="utf-8") as maus_file:
+            reqote = DeepAnwendungshandbuchSchema().load(json.load(maus_file))
+        iftsta_key = (EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035")
+        reqote_key = (EdifactFormat.REQOTE, EdifactFormatVersion.FV2210, "35001")
+        store = SharedMausStore.build({iftsta_key: iftsta, reqote_key: reqote}, use_shared_memory=use_shared_memory)
+        try:
+            assert len(store) == 2
+            assert store.keys() == [iftsta_key, reqote_key]
+            assert iftsta_key in store
+            assert (store.name is not None) == use_shared_memory
+            provider = SharedMausStoreProvider(store)
+            assert provider.get_maus(*iftsta_key) == iftsta
+            assert provider.get_maus(*iftsta_key) is not provider.get_maus(*iftsta_key)  # nothing is kept
+            assert provider.get_maus(*reqote_key) == reqote
+            reader = provider.get_reader(*iftsta_key)
+            assert reader is not None and reader.to_deep_ahb() == iftsta
+            del reader  # the shared memory segment cannot be closed while a reader references it
+            assert provider.get_reader(EdifactFormat.REQOTE, EdifactFormatVersion.FV2210, "35002") is None
+            caching_provider = SharedMausStoreProvider(store, cache_deserialized_maus=True)
+            assert caching_provider.get_maus(*iftsta_key) == iftsta
+            assert caching_provider.get_maus(*iftsta_key) is caching_provider.get_maus(*iftsta_key)
+            assert provider.get_maus(EdifactFormat.REQOTE, EdifactFormatVersion.FV2210, "35002") is None
+            if use_shared_memory:
+                assert store.name is not None
+                attached_store = SharedMausStore.attach(store.name)
+                assert SharedMausStoreProvider(attached_store).get_maus(*reqote_key) == reqote
+                attached_store.close()
+        finally:
+            store.close()
+            store.unlink()
+
+    def test_invalid_data_are_rejected(self):
+        with pytest.raises(ValueError):
+            SharedMausStore(b"NOTASTORE\x00\x00\x00\x00", None)
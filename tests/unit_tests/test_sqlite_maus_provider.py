@@ -0,0 +1,91 @@
+"""
+Tests the SQLite based maus provider
+"""
+
+import json
+from pathlib import Path
+
+import pytest  # type:ignore[import]
+
+from maus.edifact import EdifactFormat, EdifactFormatVersion
+from maus.models.anwendungshandbuch import AhbMetaInformation, DeepAnwendungshandbuch, DeepAnwendungshandbuchSchema
+from maus.models.edifact_components import Segment, SegmentGroup
+from maus.sqlite_maus_provider import SqliteMausProvider
+
+
+class TestSqliteMausProvider:
+    """
+    Tests the SqliteMausProvider
+    """
+
+    @pytest.mark.datafiles("./ahbs/FV2204/IFTSTA/21035_maus.json")
+    @pytest.mark.datafiles("./ahbs/FV2204/REQOTE/35001_maus.json")
+    def test_sqlite_maus_provider(self, datafiles, tmp_path: Path):
+        with open(datafiles / "21035_maus.json", "r", encoding="utf-8") as maus_file:
+            iftsta = DeepAnwendungshandbuchSchema().load(json.load(maus_file))
+        with open(datafiles / "35001_maus.json", "r", encoding="utf-8") as maus_file:
+            reqote = DeepAnwendungshandbuchSchema().load(json.load(maus_file))
+        database_path = tmp_path / "maus.sqlite"
+        with SqliteMausProvider(database_path) as provider:
+            provider.store_maus(EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035", iftsta)
+            provider.store_maus(EdifactFormat.REQOTE, EdifactFormatVersion.FV2210, "35001", reqote)
+            provider.store_maus(EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035", iftsta)  # replaces
+        with SqliteMausProvider(database_path) as provider:
+            assert provider.get_available_maus() == [
+                (EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035"),
+                (EdifactFormat.REQOTE, EdifactFormatVersion.FV2210, "35001"),
+            ]
+            assert provider.get_available_maus(EdifactFormatVersion.FV2304) == []
+            assert provider.get_maus(EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035") == iftsta
+            assert provider.get_maus(EdifactFormat.REQOTE, EdifactFormatVersion.FV2210, "35001") == reqote
+            assert provider.get_maus(EdifactFormat.REQOTE, EdifactFormatVersion.FV2210, "35002") is None
+
+            assert provider.find_maus_using_discriminator("SG2") == [
+                (EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035")
+            ]
+            data_element_discriminator = iftsta.lines[0].segments[0].data_elements[0].discriminator
+            assert data_element_discriminator is not None
+            assert (EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035") in (
+                provider.find_maus_using_discriminator(data_element_discriminator)
+            )
+            assert provider.find_maus_using_discriminator("SG2", EdifactFormatVersion.FV2304) == []
+            assert provider.find_maus_using_discriminator("does not exist") == []
+
+            assert provider.get_segment_groups(
+                EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035", "SG2"
+            ) == iftsta.find_segment_groups(lambda segment_group: segment_group.discriminator == "SG2")
+            assert provider.get_segment_groups(EdifactFormat.IFTSTA, EdifactFormatVersion.FV2210, "21035", "SG99") == []
+            assert provider.get_segment_groups(EdifactFormat.IFTSTA, EdifactFormatVersion.FV2304, "21035", "SG2") == []
+
+    def test_nested_segment_groups_with_the_same_discriminator(self):
+        maus = DeepAnwendungshandbuch(
+            meta=AhbMetaInformation(pruefidentifikator="11042"),
+            lines=[
+                SegmentGroup(
+                    discriminator="SG4",
+                    ahb_expression="Muss",
+                    segments=[
+                        Segment(discriminator="IDE", ahb_expression="Muss", section_name="Vorgang", data_elements=[])
+                    ],
+                    segment_groups=[
+                        SegmentGroup(
+                            discriminator="SG4",
+                            ahb_expression="Kann",
+                            segments=[
+                                Segment(
+                                    discriminator="STS", ahb_expression="Kann", section_name="Status", data_elements=[]
+                                )
+                            ],
+                        ),
+                        SegmentGroup(discriminator="SG5", ahb_expression="Muss", segments=[]),
+                    ],
+                ),
+                SegmentGroup(discriminator="SG4", ahb_expression="Soll", segments=[]),
+            ],
+        )
+        with SqliteMausProvider(":memory:") as provider:
+            provider.store_maus(EdifactFormat.UTILMD, EdifactFormatVersion.FV2210, "11042", maus)
+            actual = provider.get_segment_groups(EdifactFormat.UTILMD, EdifactFormatVersion.FV2210, "11042", "SG4")
+        expected = maus.find_segment_groups(lambda sg: sg.discriminator == "SG4")
+        assert [segment_group.ahb_expression for segment_group in expected] == ["Kann", "Muss", "Soll"]
+        assert actual == expected
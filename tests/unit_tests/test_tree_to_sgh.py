@@ -1,8 +1,16 @@
 from pathlib import Path
+from typing import List, Optional
 
 import pytest  # type:ignore[import]
+from lark import Tree
+from lark.exceptions import UnexpectedInput
 
-from maus.reader.tree_to_sgh import check_file_can_be_parsed_as_tree, check_youngest_tree_is_parseable, read_tree
+from maus.reader.tree_to_sgh import (
+    check_file_can_be_parsed_as_tree,
+    check_youngest_tree_is_parseable,
+    get_tree_parser,
+    read_tree,
+)
 
 
 class TestTreeToSgh:
@@ -15,6 +23,44 @@ class TestTreeToSgh:
     def test_read_tree(self, datafiles, filename: str):
         tree = read_tree(Path(datafiles / Path(filename)))
         assert tree is not None
+        assert read_tree(Path(datafiles / Path(filename)), parser_type="earley") == tree
+
+    @pytest.mark.parametrize(
+        "tree_str, is_valid",
+        [
+            pytest.param("/:UNB[M;M;M*Man4]\nUNH:BGM[M;M;C*Can3+C*Can35;R*Ran3{E01.E02}]", True),
+            pytest.param("  /:UNB[M;M;M*Man4]\nSG1:RFF[M;M;M*Man3*Can70;M*Man3{AAV}*Ran70],SG2[M;C]\n\n", True),
+            pytest.param("/:UNB[M;M;(NAD#1#0=MR)C*Man3+R*Man35|M*Man3]", True),
+            pytest.param("", False),
+            pytest.param("/:", False),
+            pytest.param("UNB[M;M;M*Man4]", False),
+            pytest.param("/:UNB[M;M;M*Man4]\nSG1:RFF[M;M;M*Xan3]", False),
+            pytest.param("/:UNB[M;M;M*Man4]\nSG1:rff[M;M;M*Man3]", False),
+        ],
+    )
+    def test_lalr_and_earley_parser_accept_the_same_trees(self, tree_str: str, is_valid: bool):
+        results: List[Optional[Tree]] = []
+        for parser_type in ["lalr", "earley"]:
+            try:
+                results.append(get_tree_parser(parser_type).parse(tree_str))  # type:ignore[arg-type]
+            except UnexpectedInput:
+                results.append(None)
+        assert results[0] == results[1]
+        assert (results[0] is not None) == is_valid
+
+    def test_get_tree_parser_is_cached(self):
+        assert get_tree_parser("lalr") is get_tree_parser("lalr")
+        assert get_tree_parser("earley") is not get_tree_parser("lalr")
+        with pytest.raises(ValueError):
+            get_tree_parser("foo")  # type:ignore[arg-type]
+
+    def test_lalr_parser_cache_is_opt_in(self, tmp_path: Path):
+        cache_path = tmp_path / "tree_parser.lark_cache"
+        tree_str = "/:UNB[M;M;M*Man4]\nUNH:BGM[M;M;C*Can3+C*Can35;R*Ran3{E01.E02}]"
+        assert get_tree_parser("lalr", cache_path).parse(tree_str) == get_tree_parser("lalr").parse(tree_str)
+        assert cache_path.exists()
+        with pytest.raises(ValueError):
+            get_tree_parser("earley", cache_path)
 
     @pytest.mark.datafiles("./migs/FV2210/segment_group_hierarchies/UTILTS1.1a.tree")
     @pytest.mark.parametrize("filename", ["UTILTS1.1a.tree"])